@@ -0,0 +1,139 @@
+from typing import Dict, Optional, Tuple
+
+from app.backend_common.caches.base import Base
+from app.backend_common.utils.redis_wrapper.registry import cache_registry
+
+# Populate the snapshot hash only if no write happened since the caller read the version.
+# KEYS: snapshot hash, version key. ARGV: expected version, ttl, field1, value1, field2, value2, ...
+_POPULATE_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Apply a single chat write to the snapshot (if one is cached) and bump the session version.
+# KEYS: snapshot hash, version key. ARGV: chat id, serialized chat ('' to delete), snapshot ttl, version ttl
+_WRITE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    if ARGV[2] == '' then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+    else
+        redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    end
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+local version = redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return version
+"""
+
+# Drop the snapshot and bump the session version, so that no tier serves a copy taken before now.
+# KEYS: snapshot hash, version key. ARGV: version ttl
+_INVALIDATE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+local version = redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return version
+"""
+
+
+class AgentChatsSnapshotCache(Base):
+    """
+    Redis tier of the per-session agent chats snapshot.
+
+    Each session has a hash of serialized chats keyed by chat id, plus a version counter that is
+    bumped on every write. Both are updated atomically by the write script, so a reader always
+    sees a hash that matches the version it is read with.
+    """
+
+    _key_prefix = "agent_chats_snapshot"
+    _expire_in_sec = 3600  # 1 hour
+
+    # The version must outlive every cached copy of the snapshot, so that it never restarts
+    # from a value an older copy was stored with
+    VERSION_EXPIRE_IN_SEC = 86400 * 2  # 2 days
+
+    # Sentinel field marking a populated snapshot, so that sessions without chats are cached too
+    POPULATED_FIELD = "__populated__"
+
+    @classmethod
+    def _snapshot_key(cls, session_id: int) -> str:
+        return cls.prefixed_key(f"chats:{session_id}")
+
+    @classmethod
+    def _version_key(cls, session_id: int) -> str:
+        return cls.prefixed_key(f"version:{session_id}")
+
+    @classmethod
+    async def get_version(cls, session_id: int) -> int:
+        version = await cache_registry[cls._host]._redis.get(cls._version_key(session_id))
+        return int(version or 0)
+
+    @classmethod
+    async def get_snapshot(cls, session_id: int) -> Tuple[int, Optional[Dict[str, str]]]:
+        """
+        Read the session version and its cached snapshot atomically.
+
+        Returns:
+            Tuple[int, Optional[Dict[str, str]]]: The version and serialized chats by chat id,
+            or None if no snapshot is cached.
+        """
+        pipeline = cache_registry[cls._host]._redis.pipeline(transaction=True)
+        pipeline.get(cls._version_key(session_id))
+        pipeline.hgetall(cls._snapshot_key(session_id))
+        version, snapshot = await pipeline.execute()
+
+        if not snapshot:
+            return int(version or 0), None
+        snapshot.pop(cls.POPULATED_FIELD, None)
+        return int(version or 0), snapshot
+
+    @classmethod
+    async def populate(cls, session_id: int, expected_version: int, chats: Dict[int, str]) -> bool:
+        """Cache a freshly loaded snapshot, unless the session was written to since `expected_version` was read."""
+        args = [str(expected_version), str(cls._expire_in_sec), cls.POPULATED_FIELD, "1"]
+        for chat_id, serialized_chat in chats.items():
+            args.extend([str(chat_id), serialized_chat])
+        result = await cls.eval(_POPULATE_SCRIPT, 2, cls._snapshot_key(session_id), cls._version_key(session_id), *args)
+        return bool(result)
+
+    @classmethod
+    async def record_write(cls, session_id: int, chat_id: int, serialized_chat: Optional[str]) -> int:
+        """
+        Apply a created/updated (or, with `serialized_chat=None`, deleted) chat and bump the session version.
+
+        Returns:
+            int: The new session version
+        """
+        result = await cls.eval(
+            _WRITE_SCRIPT,
+            2,
+            cls._snapshot_key(session_id),
+            cls._version_key(session_id),
+            str(chat_id),
+            serialized_chat or "",
+            str(cls._expire_in_sec),
+            str(cls.VERSION_EXPIRE_IN_SEC),
+        )
+        return int(result)
+
+    @classmethod
+    async def invalidate(cls, session_id: int) -> None:
+        """
+        Drop the cached snapshot of a session and bump its version, so that every worker reloads it.
+
+        The version is bumped rather than deleted, as a restarted version could match a stale local copy.
+        """
+        await cls.eval(
+            _INVALIDATE_SCRIPT,
+            2,
+            cls._snapshot_key(session_id),
+            cls._version_key(session_id),
+            str(cls.VERSION_EXPIRE_IN_SEC),
+        )
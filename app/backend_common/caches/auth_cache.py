@@ -0,0 +1,8 @@
+from app.backend_common.caches.base import Base
+
+
+class AuthCache(Base):
+    """Redis tier of the authentication result cache, keyed by a hash of the auth token"""
+
+    _key_prefix = "auth"
+    _expire_in_sec = 300  # 5 minutes
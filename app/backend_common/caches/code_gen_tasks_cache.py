@@ -41,6 +41,13 @@ class CodeGenTasksCache(Base):
         data = await cls._get_session_data(session_id)
         data["cancelled"] = True
         await cls.set_session_data(session_id, data)
+        # notify workers subscribed to cancellations; the stored flag remains the source of truth
+        await cls.publish(cls.cancellation_channel(), session_id)
+
+    @classmethod
+    def cancellation_channel(cls) -> str:
+        """Pub/sub channel on which cancelled session ids are published"""
+        return cls.prefixed_key("cancellations")
 
     @classmethod
     async def get_session_query_id(cls, session_id: int) -> Optional[int]:
@@ -0,0 +1,8 @@
+from app.backend_common.caches.base import Base
+
+
+class IdeReviewDiffContextCache(Base):
+    """Token counts of the diff of an IDE review (see `IdeReviewCache`), shared across workers."""
+
+    _key_prefix = "extension_review_diff_context"
+    _expire_in_sec = 86400  # 1 day, same as the diff it is derived from
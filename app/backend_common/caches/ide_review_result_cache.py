@@ -0,0 +1,8 @@
+from app.backend_common.caches.base import Base
+
+
+class IdeReviewResultCache(Base):
+    """Comments of commenter agents per diff hash, one hash field per agent configuration."""
+
+    _key_prefix = "extension_review_result"
+    _expire_in_sec = 86400  # 1 day
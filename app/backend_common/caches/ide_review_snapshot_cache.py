@@ -0,0 +1,8 @@
+from app.backend_common.caches.base import Base
+
+
+class IdeReviewSnapshotCache(Base):
+    """Hunk level snapshot of the full diff of an IDE review, the base of incremental re-reviews."""
+
+    _key_prefix = "extension_review_snapshot"
+    _expire_in_sec = 604800  # 1 week
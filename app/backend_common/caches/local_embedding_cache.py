@@ -0,0 +1,75 @@
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class LocalEmbeddingCache:
+    """
+    Bounded, in-process LRU cache of float32 embedding vectors, meant as a worker-local tier in front of Redis.
+
+    Vectors live in the fixed size slots of a memory-mapped `(max_size, dimensions)` float32 file, so that a large
+    cache is paged in and out by the OS instead of living on the heap. The file is created on the first write, with
+    the dimensions of that vector; vectors of other dimensions are not cached. It is an anonymous temporary file,
+    private to the worker and removed by the OS once the worker exits, so nothing is left behind on restart.
+
+    Example:
+        ```python
+        cache = LocalEmbeddingCache(max_size=10000)
+        cache.set_many({"key": np.ones(1536, dtype=np.float32)})
+        cache.get_many(["key", "missing"])  # [array([1., ...]), None]
+        ```
+    """
+
+    def __init__(self, max_size: int, directory: Optional[str] = None) -> None:
+        """
+        Args:
+            max_size (int): Maximum number of vectors; least recently used vectors are evicted first.
+            directory (Optional[str]): Directory of the memory-mapped file, the temporary directory by default.
+        """
+        self.max_size = max_size
+        self.directory = directory or None
+        self._vectors: Optional[np.memmap] = None
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+
+    def _open(self, dimensions: int) -> np.memmap:
+        if self._vectors is None:
+            # unnamed, or unlinked as soon as created, the file lives only as long as its mapping
+            with tempfile.TemporaryFile(dir=self.directory) as file:
+                self._vectors = np.memmap(file, dtype=np.float32, mode="w+", shape=(self.max_size, dimensions))
+        return self._vectors
+
+    def get_many(self, keys: List[str]) -> List[Optional[NDArray[np.float32]]]:
+        """Return a copy of the vector of each key, or None for keys that are not cached."""
+        vectors: List[Optional[NDArray[np.float32]]] = []
+        for key in keys:
+            slot = self._slots.get(key)
+            if slot is None:
+                vectors.append(None)
+                continue
+            self._slots.move_to_end(key)
+            vectors.append(np.array(self._vectors[slot]))
+        return vectors
+
+    def set_many(self, vectors: Dict[str, NDArray[np.floating]]) -> None:
+        for key, vector in vectors.items():
+            stored_vectors = self._open(len(vector))
+            if len(vector) != stored_vectors.shape[1]:
+                continue
+            slot = self._slots.get(key)
+            if slot is None:
+                if len(self._slots) < self.max_size:
+                    slot = len(self._slots)
+                else:
+                    _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+            self._slots.move_to_end(key)
+            stored_vectors[slot] = vector
+
+    def clear(self) -> None:
+        self._slots.clear()
+
+    def __len__(self) -> int:
+        return len(self._slots)
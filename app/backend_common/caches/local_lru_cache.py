@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LocalLRUCache(Generic[K, V]):
+    """
+    Bounded, in-process LRU cache with per-entry expiry.
+
+    Meant as a worker-local tier in front of Redis or Postgres. It is not shared across workers,
+    so anything cached here must either be safe to serve slightly stale for up to its TTL, or be
+    validated against a shared version before use.
+
+    Example:
+        ```python
+        cache: LocalLRUCache[int, str] = LocalLRUCache(max_size=1024, ttl=60)
+        cache.set(1, "one")
+        cache.get(1)  # "one"
+        ```
+    """
+
+    def __init__(self, max_size: int, ttl: Optional[float] = None) -> None:
+        """
+        Args:
+            max_size (int): Maximum number of entries; least recently used entries are evicted first.
+            ttl (Optional[float]): Default time to live of an entry in seconds. None means no expiry.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[K, Tuple[Optional[float], V]]" = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value, or None if the key is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """Cache a value, optionally overriding the default TTL for this entry."""
+        ttl = ttl if ttl is not None else self.ttl
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> Optional[V]:
+        """Remove a key and return its value, if it was cached and not expired."""
+        value = self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -91,3 +91,15 @@ class InputTokenLimitExceededError(Exception):
         self.current_tokens = current_tokens
         self.max_tokens = max_tokens
         self.detail = detail
+
+
+class S3ObjectTooLargeError(ValueError):
+    """
+    Raised when an S3 object is larger than the memory budget of the read.
+    """
+
+    def __init__(self, object_name: str, size: int, max_bytes: int) -> None:
+        super().__init__(f"S3 object {object_name} of {size} bytes exceeds the limit of {max_bytes} bytes")
+        self.object_name = object_name
+        self.size = size
+        self.max_bytes = max_bytes
@@ -1,3 +1,6 @@
+from datetime import datetime, timezone
+from typing import List, Set
+
 import pytz
 
 from app.backend_common.models.dao.postgres.analytics_events import AnalyticsEvents
@@ -32,3 +35,24 @@ class AnalyticsEventsRepository:
     async def event_id_exists(cls, event_id: str) -> bool:
         count = await DB.count_by_filters(model_name=AnalyticsEvents, filters={"event_id": event_id})
         return count > 0
+
+    @classmethod
+    async def save_analytics_events(cls, analytics_events_data: List[AnalyticsEventsData]) -> None:
+        """Store many analytics events with a single insert."""
+        if not analytics_events_data:
+            return
+        now = datetime.now().replace(tzinfo=timezone.utc)
+        analytics_events = []
+        for analytics_event_data in analytics_events_data:
+            analytics_event_data.timestamp = analytics_event_data.timestamp.replace(tzinfo=pytz.UTC)
+            payload = analytics_event_data.model_dump(mode="json")
+            analytics_events.append(AnalyticsEvents(**payload, created_at=now, updated_at=now))
+        await DB.bulk_create(AnalyticsEvents, analytics_events)
+
+    @classmethod
+    async def get_existing_event_ids(cls, event_ids: List[str]) -> Set[str]:
+        """Return the given event ids that are already stored, with a single query."""
+        if not event_ids:
+            return set()
+        existing_event_ids = await AnalyticsEvents.filter(event_id__in=event_ids).values_list("event_id", flat=True)
+        return {str(event_id) for event_id in existing_event_ids}
@@ -35,6 +35,24 @@ class MessageSessionsRepository:
             )
             raise ex
 
+    @classmethod
+    async def get_by_ids(cls, session_ids: List[int]) -> List[MessageSessionDTO]:
+        if not session_ids:
+            return []
+        try:
+            message_sessions = await DB.by_filters(
+                model_name=MessageSession,
+                where_clause={"id__in": session_ids},
+                fetch_one=False,
+            )
+            return [MessageSessionDTO(**message_session) for message_session in message_sessions]
+
+        except Exception as ex:
+            logger.error(
+                f"error occurred while fetching message_sessions from db for session_ids : {session_ids}, ex: {ex}"
+            )
+            raise ex
+
     @classmethod
     async def create_message_session(cls, message_session_data: MessageSessionData) -> MessageSessionDTO:
         try:
@@ -1,8 +1,9 @@
-from typing import Any, ClassVar, Dict, Optional
+from typing import Any, AsyncIterable, AsyncIterator, ClassVar, Dict, List, Optional, Tuple
 
 from deputydev_core.utils.config_manager import ConfigManager  # type: ignore
 from types_aiobotocore_s3.client import S3Client
 
+from app.backend_common.exception.exception import S3ObjectTooLargeError
 from app.backend_common.service_clients.aws.aws_client_manager import AWSClientManager
 from app.backend_common.service_clients.aws.dataclasses.aws_client_manager import AWSConnectionParams  # noqa: ERA001
 
@@ -10,6 +11,12 @@ from app.backend_common.service_clients.aws.dataclasses.aws_client_manager impor
 class AWSS3ServiceClient:
     _client_managers: ClassVar[Dict[str, AWSClientManager]] = {}
 
+    # bytes read from the body of an object at a time when streaming it
+    STREAM_CHUNK_SIZE = 1024 * 1024
+
+    # size of the parts of a multipart upload, S3 requires at least 5 MiB for all but the last part
+    MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
     # constructor
     def __init__(self, bucket_name: str, region_name: str) -> None:
         self.region_name = region_name
@@ -74,12 +81,102 @@ class AWSS3ServiceClient:
         )
         return response
 
-    async def get_object(self, object_name: str) -> bytes:
+    async def get_object(self, object_name: str, max_bytes: Optional[int] = None) -> bytes:
+        """
+        Read a whole object. With `max_bytes`, objects larger than it are rejected before their body is read.
+        """
         s3_client: S3Client = await self.aws_client_manager.get_client()  # type: ignore
         response = await s3_client.get_object(Bucket=self.bucket_name, Key=object_name)
         async with response["Body"] as stream:  # type: ignore
+            if max_bytes is not None and response["ContentLength"] > max_bytes:
+                raise S3ObjectTooLargeError(object_name, response["ContentLength"], max_bytes)
             return await stream.read()  # type: ignore
 
+    async def get_object_range(self, object_name: str, start: int, end: int) -> bytes:
+        """
+        Read the bytes from `start` to `end` of an object, both inclusive as in an HTTP Range header
+        """
+        s3_client: S3Client = await self.aws_client_manager.get_client()  # type: ignore
+        response = await s3_client.get_object(Bucket=self.bucket_name, Key=object_name, Range=f"bytes={start}-{end}")
+        async with response["Body"] as stream:  # type: ignore
+            return await stream.read()  # type: ignore
+
+    async def iter_object(
+        self,
+        object_name: str,
+        chunk_size: Optional[int] = None,
+        byte_range: Optional[Tuple[int, int]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an object, or the inclusive `byte_range` of it, in chunks of at most `chunk_size` bytes, so that
+        only one chunk is held in memory at a time
+        """
+        s3_client: S3Client = await self.aws_client_manager.get_client()  # type: ignore
+        params: Dict[str, Any] = {"Bucket": self.bucket_name, "Key": object_name}
+        if byte_range:
+            params["Range"] = f"bytes={byte_range[0]}-{byte_range[1]}"
+        response = await s3_client.get_object(**params)
+        async with response["Body"] as stream:  # type: ignore
+            async for chunk in stream.iter_chunks(chunk_size or self.STREAM_CHUNK_SIZE):  # type: ignore
+                yield chunk
+
+    async def put_object(self, object_name: str, body: bytes, content_type: Optional[str] = None) -> None:
+        """
+        Upload bytes to S3 as an object
+        """
+        s3_client: S3Client = await self.aws_client_manager.get_client()  # type: ignore
+        params: Dict[str, Any] = {"Bucket": self.bucket_name, "Key": object_name, "Body": body}
+        if content_type:
+            params["ContentType"] = content_type
+        await s3_client.put_object(**params)
+
+    async def upload_stream(
+        self, object_name: str, chunks: AsyncIterable[bytes], content_type: Optional[str] = None
+    ) -> None:
+        """
+        Upload an object from a stream of chunks, holding at most one part of `MULTIPART_PART_SIZE` bytes in
+        memory. Streams that fit in a single part are uploaded with a plain PUT, larger ones with a multipart
+        upload, which is aborted if any part fails.
+        """
+        s3_client: S3Client = await self.aws_client_manager.get_client()  # type: ignore
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        parts: List[Dict[str, Any]] = []
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.MULTIPART_PART_SIZE:
+                    if upload_id is None:
+                        params: Dict[str, Any] = {"Bucket": self.bucket_name, "Key": object_name}
+                        if content_type:
+                            params["ContentType"] = content_type
+                        upload_id = (await s3_client.create_multipart_upload(**params))["UploadId"]
+                    part = bytes(buffer[: self.MULTIPART_PART_SIZE])
+                    del buffer[: self.MULTIPART_PART_SIZE]
+                    parts.append(await self._upload_part(s3_client, object_name, upload_id, len(parts) + 1, part))
+
+            if upload_id is None:
+                await self.put_object(object_name, bytes(buffer), content_type=content_type)
+                return
+
+            if buffer:
+                parts.append(await self._upload_part(s3_client, object_name, upload_id, len(parts) + 1, bytes(buffer)))
+            await s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name, Key=object_name, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except BaseException:
+            if upload_id is not None:
+                await s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=object_name, UploadId=upload_id)
+            raise
+
+    async def _upload_part(
+        self, s3_client: S3Client, object_name: str, upload_id: str, part_number: int, body: bytes
+    ) -> Dict[str, Any]:
+        response = await s3_client.upload_part(
+            Bucket=self.bucket_name, Key=object_name, UploadId=upload_id, PartNumber=part_number, Body=body
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
     async def delete_object(self, object_name: str) -> None:
         """
         Delete an object from S3
@@ -1,5 +1,7 @@
-from typing import Optional
+import asyncio
+from typing import ClassVar, Dict, Optional
 
+from aiobotocore.config import AioConfig  # type: ignore
 from aiobotocore.session import AioSession
 from deputydev_core.utils.app_logger import AppLogger
 from deputydev_core.utils.config_manager import ConfigManager
@@ -11,8 +13,22 @@ class SocketClosedError(Exception):
 
 
 class AWSAPIGatewayServiceClient:
+    """
+    Posts messages to websocket connections through the API Gateway management API.
+
+    The underlying aiobotocore client (and its HTTP connection pool) is created once per endpoint
+    and shared by every instance in the process, so `init_client` is cheap after the first call and
+    `close` only detaches the instance. Shared clients are closed by `close_all` on server shutdown.
+    """
+
     API_GATEWAY_MANAGEMENT_API_NAME = "apigatewaymanagementapi"
 
+    # Size of the HTTP connection pool of each shared client
+    MAX_POOL_CONNECTIONS = 64
+
+    _clients: ClassVar[Dict[str, ApiGatewayManagementApiClient]] = {}
+    _clients_lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+
     def __init__(self, host: Optional[str] = None) -> None:
         self.host: str = host or ConfigManager.configs["AWS_API_GATEWAY"]["HOST"]
         self._client: ApiGatewayManagementApiClient | None = None
@@ -20,12 +36,30 @@ class AWSAPIGatewayServiceClient:
     async def init_client(self, endpoint: str) -> None:
         if self._client is not None:
             return
-        session = AioSession()
-        self._client = await session.create_client(
-            service_name=self.API_GATEWAY_MANAGEMENT_API_NAME,
-            region_name=ConfigManager.configs["AWS_API_GATEWAY"]["AWS_REGION"],
-            endpoint_url=ConfigManager.configs["AWS_API_GATEWAY"]["HOST"] + endpoint,
-        ).__aenter__()
+        self._client = await self._get_shared_client(self.host + endpoint)
+
+    @classmethod
+    async def _get_shared_client(cls, endpoint_url: str) -> ApiGatewayManagementApiClient:
+        client = cls._clients.get(endpoint_url)
+        if client is not None:
+            return client
+
+        async with cls._clients_lock:
+            if endpoint_url not in cls._clients:
+                gateway_config = ConfigManager.configs["AWS_API_GATEWAY"]
+                cls._clients[endpoint_url] = await (
+                    AioSession()
+                    .create_client(
+                        service_name=cls.API_GATEWAY_MANAGEMENT_API_NAME,
+                        region_name=gateway_config["AWS_REGION"],
+                        endpoint_url=endpoint_url,
+                        config=AioConfig(
+                            max_pool_connections=gateway_config.get("MAX_POOL_CONNECTIONS", cls.MAX_POOL_CONNECTIONS)
+                        ),
+                    )
+                    .__aenter__()
+                )
+            return cls._clients[endpoint_url]
 
     async def post_to_connection(self, connection_id: str, message: str) -> None:
         if self._client is None:
@@ -41,6 +75,15 @@ class AWSAPIGatewayServiceClient:
             raise SocketClosedError(f"Connection with connection_id: {connection_id} is closed")
 
     async def close(self) -> None:
-        if self._client:
-            await self._client.__aexit__(None, None, None)
-            self._client = None
+        # the client is shared with other instances, it is only closed on shutdown by `close_all`
+        self._client = None
+
+    @classmethod
+    async def close_all(cls) -> None:
+        async with cls._clients_lock:
+            clients, cls._clients = cls._clients, {}
+            for endpoint_url, client in clients.items():
+                try:
+                    await client.__aexit__(None, None, None)
+                except Exception as _ex:  # noqa: BLE001
+                    AppLogger.log_error(f"Error occurred while closing API Gateway client for {endpoint_url} ex: {_ex}")
@@ -1,23 +1,25 @@
 from typing import Any, Dict, Optional
 
 import aiohttp
+from deputydev_core.clients.http.base_http_session_manager import SessionManager
 from deputydev_core.utils.config_manager import ConfigManager
 
 from app.backend_common.service_clients.deputydev_auth.endpoints import AuthEndpoint
 
 
 class DeputyDevAuthClient:
+    SESSION_MANAGER = SessionManager()
+
     def __init__(
         self,
         timeout: int = ConfigManager.configs["DEPUTYDEV_AUTH"]["TIMEOUT"],
     ) -> None:
         """
         Simple aiohttp-based HTTP client for DeputyDev Auth service.
-        Each request uses its own aiohttp.ClientSession unless you
-        explicitly manage one externally.
+        All instances share one pooled aiohttp.ClientSession, so that connections
+        to the auth service are kept alive across requests.
         """
         self.timeout = aiohttp.ClientTimeout(total=timeout)
-        self.connector = aiohttp.TCPConnector()
 
     def get_auth_base_url(self) -> str:
         return ConfigManager.configs["DEPUTYDEV_AUTH"]["HOST"]
@@ -30,10 +32,12 @@ class DeputyDevAuthClient:
         params: Optional[Dict[str, str]] = None,
         json: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        async with aiohttp.ClientSession(connector=self.connector, timeout=self.timeout) as session:
-            async with session.request(method=method, url=url, headers=headers, params=params, json=json) as resp:
-                resp.raise_for_status()
-                return await resp.json()
+        session = await self.SESSION_MANAGER.get_session()
+        async with session.request(
+            method=method, url=url, headers=headers, params=params, json=json, timeout=self.timeout
+        ) as resp:
+            resp.raise_for_status()
+            return await resp.json()
 
     async def get_auth_data(self, headers: Dict[str, str], params: Dict[str, str]) -> Dict[str, Any]:
         path = f"{self.get_auth_base_url()}{AuthEndpoint.GET_AUTH_DATA.value}"
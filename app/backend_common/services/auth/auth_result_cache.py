@@ -0,0 +1,106 @@
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+from deputydev_core.utils.app_logger import AppLogger
+from deputydev_core.utils.config_manager import ConfigManager
+
+from app.backend_common.caches.auth_cache import AuthCache
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+
+
+class AuthResultCache:
+    """
+    Two tier cache of auth service responses, keyed by a SHA-256 hash of the Authorization header.
+
+    L1 is a per-worker LRU, L2 is `AuthCache` in Redis (optional, `DEPUTYDEV_AUTH.CACHE.REDIS_ENABLED`).
+    An entry never outlives the `exp` claim of its token. Responses that rotate the session token are
+    never cached, as replaying them would hand out a refresh token twice.
+
+    `revoke` removes a token from Redis and from the local tier of the calling worker; other workers
+    may keep serving it from their local tier for at most `LOCAL_TTL` seconds.
+    """
+
+    MAX_LOCAL_ENTRIES = 10000
+
+    # Upper bound (in seconds) on how long a revoked token can still be accepted by another worker
+    LOCAL_TTL = 30
+
+    # Tokens are treated as expired this many seconds before their exp claim
+    EXPIRY_LEEWAY = 5
+
+    _local: LocalLRUCache[str, Dict[str, Any]] = LocalLRUCache(max_size=MAX_LOCAL_ENTRIES, ttl=LOCAL_TTL)
+
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return ConfigManager.configs["DEPUTYDEV_AUTH"].get("CACHE", {})
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._config().get("ENABLED", True)
+
+    @classmethod
+    def _is_redis_enabled(cls) -> bool:
+        return cls._config().get("REDIS_ENABLED", True)
+
+    @staticmethod
+    def cache_key(authorization_header: str) -> str:
+        return hashlib.sha256(authorization_header.encode()).hexdigest()
+
+    @classmethod
+    async def get(cls, authorization_header: str) -> Optional[Dict[str, Any]]:
+        """Return the cached auth response for the header, if any tier holds a live one."""
+        key = cls.cache_key(authorization_header)
+        cached = cls._local.get(key)
+        if cached is None and cls._is_redis_enabled():
+            try:
+                cached = await AuthCache.get(key)
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(f"Failed to read auth cache: {ex}")
+
+        if not cached or cached["expires_at"] <= time.time():
+            return None
+
+        cls._local.set(key, cached, ttl=min(cls.LOCAL_TTL, cached["expires_at"] - time.time()))
+        return cached["auth_response"]
+
+    @classmethod
+    async def set(cls, authorization_header: str, auth_response: Dict[str, Any]) -> None:
+        """Cache an auth response until its token expires, or for the configured TTL, whichever comes first."""
+        if auth_response["auth_data"].get("session_refresh_token"):
+            return
+
+        ttl = cls._config().get("TTL", AuthCache._expire_in_sec)
+        token_expires_at = cls._get_token_expiry(authorization_header)
+        if token_expires_at is not None:
+            ttl = min(ttl, token_expires_at - cls.EXPIRY_LEEWAY - time.time())
+        if ttl <= 0:
+            return
+
+        key = cls.cache_key(authorization_header)
+        cached = {"auth_response": auth_response, "expires_at": time.time() + ttl}
+        cls._local.set(key, cached, ttl=min(cls.LOCAL_TTL, ttl))
+        if cls._is_redis_enabled():
+            try:
+                await AuthCache.set(key, cached, expire=max(1, int(ttl)))
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(f"Failed to write auth cache: {ex}")
+
+    @classmethod
+    async def revoke(cls, authorization_header: str) -> None:
+        """Stop serving the cached auth response of the header."""
+        key = cls.cache_key(authorization_header)
+        cls._local.pop(key)
+        if cls._is_redis_enabled():
+            await AuthCache.delete([key])
+
+    @staticmethod
+    def _get_token_expiry(authorization_header: str) -> Optional[float]:
+        """Read the exp claim of a JWT bearer token, without verifying it; the auth service already has."""
+        token = authorization_header.removeprefix("Bearer ").strip()
+        try:
+            expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except jwt.PyJWTError:
+            return None
+        return float(expires_at) if expires_at is not None else None
@@ -20,6 +20,9 @@ class ChatFileUpload:
         region_name=ConfigManager.configs["AWS_S3"]["AWS_REGION"],
     )
 
+    # upload limit of the presigned URLs, also the most bytes read back from an uploaded file
+    MAX_FILE_SIZE = 10485760  # 10 MB limit
+
     @classmethod
     def _get_s3_key(cls, file_name: str, folder: str = "image") -> str:
         """
@@ -55,7 +58,7 @@ class ChatFileUpload:
                 expiry=600,
                 s3_key=s3_key,
                 min_bytes=0,
-                max_bytes=10485760,  # 10 MB limit
+                max_bytes=cls.MAX_FILE_SIZE,
             ),
             cls.s3_client.create_presigned_get_url(s3_key=s3_key, expiry=600),
         )
@@ -88,7 +91,7 @@ class ChatFileUpload:
         """
         Get file data by S3 key
         """
-        file_data = await cls.s3_client.get_object(object_name=s3_key)
+        file_data = await cls.s3_client.get_object(object_name=s3_key, max_bytes=cls.MAX_FILE_SIZE)
         return file_data
 
     @classmethod
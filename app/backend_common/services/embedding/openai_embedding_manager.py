@@ -1,5 +1,6 @@
 import asyncio
-from typing import List, Tuple
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 from deputydev_core.services.embedding.base_embedding_manager import (
@@ -10,13 +11,30 @@ from deputydev_core.utils.app_logger import AppLogger
 from numpy.typing import NDArray
 from sanic.log import logger
 
+from app.backend_common.caches.common import CommonCache
+from app.backend_common.caches.local_embedding_cache import LocalEmbeddingCache
 from app.backend_common.services.openai.openai_llm_service import OpenAILLMService
+from app.backend_common.services.openai.openai_service import OpenAIManager
+from app.backend_common.utils.app_utils import hash_sha256
 from app.backend_common.utils.sanic_wrapper import CONFIG
 
 config = CONFIG.config
 
 
 class OpenAIEmbeddingManager(BaseEmbeddingManager):
+    """
+    Embeds texts cache first: the cached embeddings of all texts are looked up at once, in a worker-local
+    memory-mapped tier and then in Redis, before only the misses are batched and sent to OpenAI.
+    """
+
+    MAX_PARALLEL_TASKS = 30
+
+    MAX_BATCH_ATTEMPTS = 6
+
+    INITIAL_BACKOFF_SEC = 0.2
+
+    _local_cache: Optional[LocalEmbeddingCache] = None
+
     @classmethod
     def create_optimized_batches(cls, texts: List[str], max_tokens: int, model: str) -> List[List[str]]:
         tiktoken_client = TikToken()
@@ -28,6 +46,11 @@ class OpenAIEmbeddingManager(BaseEmbeddingManager):
             text_token_count = tiktoken_client.count(text, model=model)
 
             if text_token_count > max_tokens:  # Single text exceeds max tokens
+                # close the current batch first, so that batches keep the order of the texts
+                if current_batch:
+                    batches.append(current_batch)
+                    current_batch = []
+                    currrent_batch_token_count = 0
                 truncated_text = tiktoken_client.truncate_string(text=text, max_tokens=max_tokens, model=model)
                 batches.append([truncated_text])
                 logger.warn(f"Text with token count {text_token_count} exceeds the max token limit of {max_tokens}.")
@@ -47,78 +70,169 @@ class OpenAIEmbeddingManager(BaseEmbeddingManager):
         return batches
 
     @classmethod
-    async def embed_text_array(cls, texts: List[str], store_embeddings: bool = True) -> Tuple[NDArray[np.float64], int]:  # noqa: C901
+    async def embed_text_array(cls, texts: List[str], store_embeddings: bool = True) -> Tuple[NDArray[np.float64], int]:
         """
         Embeds a list of texts using OpenAI's embedding model.
 
         Args:
             texts (tuple[str]): A tuple of texts to embed.
-            store_embeddings (bool): If true we will store embeddings in Redis
+            store_embeddings (bool): If true embeddings are looked up in and stored to the caches, otherwise each
+                text is split by tokens and embedded per chunk
 
         Returns:
             list[np.ndarray]: List of embeddings for each text.
         """
-        embeddings = []
-        input_tokens = 0
         texts = [text if text else " " for text in texts]
-
         AppLogger.log_debug(f"Embedding {len(texts)} texts using OpenAI's embedding model")
+
+        if not store_embeddings:
+            batches = cls.create_optimized_batches(
+                texts, max_tokens=config["EMBEDDING"]["TOKEN_LIMIT"], model=config["EMBEDDING"]["MODEL"]
+            )
+            return await cls._embed_batches(batches, lambda batch: OpenAILLMService().get_embeddings(batch, False))
+
+        cache_keys = cls._get_cache_keys(texts)
+        embeddings = await cls._get_cached_embeddings(cache_keys)
+
+        # texts repeated in the input are embedded once
+        missed_indexes: Dict[str, List[int]] = {}
+        for index, (cache_key, embedding) in enumerate(zip(cache_keys, embeddings)):
+            if embedding is None:
+                missed_indexes.setdefault(cache_key, []).append(index)
+        AppLogger.log_debug(f"Found {len(texts) - len(missed_indexes)} of {len(texts)} embeddings in cache")
+        if not missed_indexes:
+            return embeddings, 0
+
+        missed_texts = [texts[indexes[0]] for indexes in missed_indexes.values()]
         batches = cls.create_optimized_batches(
-            texts, max_tokens=config["EMBEDDING"]["TOKEN_LIMIT"], model=config["EMBEDDING"]["MODEL"]
+            missed_texts, max_tokens=config["EMBEDDING"]["TOKEN_LIMIT"], model=config["EMBEDDING"]["MODEL"]
         )
-        AppLogger.log_debug(f"Created Optimized {len(batches)} batches for embedding using {len(texts)} texts")
+        AppLogger.log_debug(f"Created Optimized {len(batches)} batches for embedding using {len(missed_texts)} texts")
+        new_embeddings, input_tokens = await cls._embed_batches(batches, cls._embed_batch)
 
-        max_parallel_tasks = 30
-        parallel_batches = []
-        exponential_backoff = 0.2
-        for batch in batches:
-            if not batch:
-                continue
-            if len(parallel_batches) >= max_parallel_tasks:
-                AppLogger.log_debug(f"Starting embedding for {len(parallel_batches)} in parallel")
-                parallel_tasks = [
-                    OpenAILLMService().get_embeddings(batch, store_embeddings) for batch in parallel_batches
-                ]
-                AppLogger.log_debug(f"Starting embedding for {len(parallel_batches)} in parallel")
-                batch_result = await asyncio.gather(*parallel_tasks, return_exceptions=True)
-                AppLogger.log_debug(f"Batch of {len(parallel_batches)} completed for embedding")
-                failed_batches = []
-                for _data, data_batch in zip(batch_result, parallel_batches):
-                    if isinstance(_data, Exception):
-                        AppLogger.log_debug(_data)
-                        AppLogger.log_debug(f"Failed embedding batch: {_data}")
-                        failed_batches.append(data_batch)
-                    else:
-                        embeddings.extend(_data[0])
-                        input_tokens += _data[1]
-
-                parallel_batches = []
-                if failed_batches:
-                    await asyncio.sleep(exponential_backoff)
-                    exponential_backoff *= 2
-                    parallel_batches += failed_batches
-                # store current batch
-                parallel_batches += [batch]
-            else:
-                parallel_batches.append(batch)
-
-        while len(parallel_batches) > 0:
-            parallel_tasks = [OpenAILLMService().get_embeddings(batch, store_embeddings) for batch in parallel_batches]
-            batch_result = await asyncio.gather(*parallel_tasks, return_exceptions=True)
-            AppLogger.log_debug(f"Batch of {len(parallel_batches)} completed for embedding")
-            failed_batches = []
-            for _data, data_batch in zip(batch_result, parallel_batches):
-                if isinstance(_data, Exception):
-                    AppLogger.log_debug(f"Failed embedding batch: {_data}")
-                    failed_batches.append(data_batch)
-                else:
-                    embeddings.extend(_data[0])
-                    input_tokens += _data[1]
-
-            parallel_batches = []
-            if failed_batches:
+        for indexes, embedding in zip(missed_indexes.values(), new_embeddings):
+            for index in indexes:
+                embeddings[index] = embedding
+        await cls._store_embeddings(dict(zip(missed_indexes, new_embeddings)))
+        return embeddings, input_tokens
+
+    @classmethod
+    async def _embed_batch(cls, batch: List[str]) -> Tuple[NDArray[np.float64], int]:
+        return await OpenAIManager().create_embeddings(batch=batch)
+
+    @classmethod
+    async def _embed_batches(
+        cls, batches: List[List[str]], embed: Callable[[List[str]], Awaitable[Tuple[Any, int]]]
+    ) -> Tuple[List[NDArray[np.float64]], int]:
+        """
+        Embed batches through a sliding window of `MAX_PARALLEL_TASKS` workers, each taking the next batch as soon
+        as its last one is done, so that a slow batch holds up only its own worker.
+
+        Results are stored by batch index, so the embeddings are in the order of the batches whatever the order in
+        which batches complete or are retried.
+
+        Returns:
+            The embeddings of all batches in the order of the batches, and the input tokens used.
+        """
+        results: List[Optional[Tuple[Any, int]]] = [None] * len(batches)
+        pending = deque(index for index, batch in enumerate(batches) if batch)
+
+        async def worker() -> None:
+            while pending:
+                index = pending.popleft()
+                results[index] = await cls._embed_batch_with_retry(batches[index], embed)
+
+        AppLogger.log_debug(f"Starting embedding of {len(pending)} batches, {cls.MAX_PARALLEL_TASKS} in parallel")
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(min(cls.MAX_PARALLEL_TASKS, len(pending))):
+                    task_group.create_task(worker())
+        except ExceptionGroup as e:
+            # a batch failed all its attempts and the other workers are cancelled, surface its error as is
+            raise e.exceptions[0] from None
+        AppLogger.log_debug(f"Completed embedding of {len(batches)} batches")
+
+        embeddings = [embedding for result in results if result is not None for embedding in result[0]]
+        input_tokens = sum(result[1] for result in results if result is not None)
+        return embeddings, input_tokens
+
+    @classmethod
+    async def _embed_batch_with_retry(
+        cls, batch: List[str], embed: Callable[[List[str]], Awaitable[Tuple[Any, int]]]
+    ) -> Tuple[Any, int]:
+        exponential_backoff = cls.INITIAL_BACKOFF_SEC
+        for attempt in range(1, cls.MAX_BATCH_ATTEMPTS + 1):
+            try:
+                return await embed(batch)
+            except Exception as e:  # noqa: BLE001
+                if attempt == cls.MAX_BATCH_ATTEMPTS:
+                    raise
+                AppLogger.log_debug(f"Failed embedding batch, attempt {attempt}: {e}")
                 await asyncio.sleep(exponential_backoff)
                 exponential_backoff *= 2
-                parallel_batches += failed_batches
 
-        return embeddings, input_tokens
+    @classmethod
+    def _get_cache_keys(cls, texts: List[str]) -> List[str]:
+        key = OpenAIManager().get_cache_prefix()
+        return [f"{key}:{hash_sha256(text)}" if key else hash_sha256(text) for text in texts]
+
+    @classmethod
+    def _get_local_cache(cls) -> Optional[LocalEmbeddingCache]:
+        local_cache_config = config["EMBEDDING"].get("LOCAL_CACHE", {})
+        if not local_cache_config.get("ENABLED", False):
+            return None
+        if cls._local_cache is None:
+            cls._local_cache = LocalEmbeddingCache(
+                max_size=local_cache_config["MAX_SIZE"], directory=local_cache_config.get("DIRECTORY") or None
+            )
+        return cls._local_cache
+
+    @classmethod
+    async def _get_cached_embeddings(cls, cache_keys: List[str]) -> List[Optional[NDArray[np.float32]]]:
+        """
+        Look the embeddings up in the local tier, then the rest in Redis with a single MGET, and refresh the TTL of
+        all hits with a single pipeline.
+        """
+        local_cache = cls._get_local_cache()
+        embeddings = local_cache.get_many(cache_keys) if local_cache is not None else [None] * len(cache_keys)
+        try:
+            redis_keys = list(dict.fromkeys(key for key, embedding in zip(cache_keys, embeddings) if embedding is None))
+            redis_embeddings = {}
+            if redis_keys:
+                cache_values = await CommonCache.mget(redis_keys) or []
+                redis_embeddings = {
+                    key: np.frombuffer(cache_value, dtype=np.float32)
+                    for key, cache_value in zip(redis_keys, cache_values)
+                    if cache_value
+                }
+            for index, cache_key in enumerate(cache_keys):
+                if embeddings[index] is None:
+                    embeddings[index] = redis_embeddings.get(cache_key)
+            if local_cache is not None and redis_embeddings:
+                local_cache.set_many(redis_embeddings)
+
+            hit_keys = list(
+                dict.fromkeys(key for key, embedding in zip(cache_keys, embeddings) if embedding is not None)
+            )
+            if hit_keys:
+                await CommonCache.expire_many(hit_keys, CommonCache._expire_in_sec)
+        except Exception as e:  # noqa: BLE001
+            logger.exception(e)
+        return embeddings
+
+    @classmethod
+    async def _store_embeddings(cls, embeddings: Dict[str, NDArray[np.float64]]) -> None:
+        local_cache = cls._get_local_cache()
+        if local_cache is not None:
+            local_cache.set_many(embeddings)
+        items = list(embeddings.items())
+        chunk_size = CommonCache._mset_with_expire_max_keys_limit
+        try:
+            await asyncio.gather(
+                *(
+                    CommonCache.mset_with_expire(dict(items[start : start + chunk_size]))
+                    for start in range(0, len(items), chunk_size)
+                )
+            )
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to store embeddings in cache, returning without storing")
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import os
+import threading
+from typing import List
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
 from app.backend_common.utils.sanic_wrapper import CONFIG
 
 
@@ -18,6 +23,11 @@ class EncryptionService:
     This class provides methods to encrypt and decrypt strings using the
     AES-256 algorithm with a password-derived key.
 
+    Data is encrypted into the versioned `v2:` envelope, base64(key salt + record salt + IV + ciphertext). The
+    PBKDF2 key of the key salt, which is the same for all the records encrypted by a worker, is derived once and
+    cached; each record is encrypted with its own key, derived from it and the random record salt with HKDF.
+    Data in the legacy unversioned envelope, base64(salt + IV + ciphertext), is still decrypted.
+
     Attributes:
         password (bytes): The encryption password used to derive the key.
         salt (bytes): A cryptographic salt used during key derivation.
@@ -29,9 +39,20 @@ class EncryptionService:
     KEY_LENGTH = 32
     ITERATIONS = 100000
 
+    VERSION_PREFIX = "v2:"
+    RECORD_KEY_INFO = b"deputydev-encryption-v2"
+
+    # PBKDF2 keys of the salts seen by the worker, the key salt of every other worker and legacy records
+    DERIVED_KEY_CACHE_SIZE = 1024
+
     PASSWORD_STR: str = CONFIG.config["ENCRYPTION_PASSWORD"]
     PASSWORD: bytes = PASSWORD_STR.encode()
 
+    KEY_SALT: bytes = os.urandom(SALT_LENGTH)
+
+    _derived_keys: LocalLRUCache[bytes, bytes] = LocalLRUCache(max_size=DERIVED_KEY_CACHE_SIZE)
+    _derived_keys_lock = threading.Lock()
+
     @classmethod
     def encrypt(cls, plaintext: str) -> str:
         """
@@ -42,15 +63,15 @@ class EncryptionService:
             plaintext (str): The plaintext string to encrypt.
 
         Returns:
-            str: Base64-encoded encrypted data (salt + IV + ciphertext).
+            str: Versioned Base64-encoded encrypted data (key salt + record salt + IV + ciphertext).
         """
         padded_data = cls.__pad(plaintext=plaintext)
 
-        # Generate random salt
-        salt = os.urandom(cls.SALT_LENGTH)
+        # Generate random record salt
+        record_salt = os.urandom(cls.SALT_LENGTH)
 
-        # derive AES-256 key from password and salt
-        key = cls.__derive_key(salt=salt)
+        # derive the AES-256 key of the record from the cached key of the key salt
+        key = cls.__derive_record_key(key_salt=cls.KEY_SALT, record_salt=record_salt)
 
         # Generate a random 16-byte initialization vector (IV)
         iv = os.urandom(cls.IV_LENGTH)
@@ -61,7 +82,7 @@ class EncryptionService:
         # Encrypt the padded data
         ciphertext = encryptor.update(padded_data) + encryptor.finalize()
 
-        encoded_data = cls.__encode(salt, iv, ciphertext)
+        encoded_data = cls.VERSION_PREFIX + cls.__encode(cls.KEY_SALT + record_salt, iv, ciphertext)
 
         return encoded_data
 
@@ -72,16 +93,21 @@ class EncryptionService:
 
         Args:
             password (str): The password used for key derivation.
-            encrypted_data (str): Base64-encoded encrypted data (salt + IV + ciphertext).
+            encrypted_data (str): Base64-encoded encrypted data, in the versioned or the legacy envelope.
 
         Returns:
             str: The original plaintext.
         """
 
-        salt, iv, ciphertext = cls.__decode(encrypted_data)
-
-        # Derive the AES key using the same salt
-        key = cls.__derive_key(salt=salt)
+        if encrypted_data.startswith(cls.VERSION_PREFIX):
+            salts, iv, ciphertext = cls.__decode(
+                encrypted_data[len(cls.VERSION_PREFIX) :], salt_length=2 * cls.SALT_LENGTH
+            )
+            key = cls.__derive_record_key(key_salt=salts[: cls.SALT_LENGTH], record_salt=salts[cls.SALT_LENGTH :])
+        else:
+            salt, iv, ciphertext = cls.__decode(encrypted_data, salt_length=cls.SALT_LENGTH)
+            # Derive the AES key using the same salt
+            key = cls.__get_derived_key(salt=salt)
 
         cipher = cls._get_cipher(key=key, iv=iv)
         decryptor = cipher.decryptor()
@@ -93,6 +119,32 @@ class EncryptionService:
 
         return plaintext.decode()
 
+    @classmethod
+    async def encrypt_many(cls, plaintexts: List[str]) -> List[str]:
+        """
+        Encrypts the provided plaintexts in a worker thread, off the event loop.
+
+        Args:
+            plaintexts (List[str]): The plaintext strings to encrypt.
+
+        Returns:
+            List[str]: The encrypted data of each plaintext, in the same order.
+        """
+        return await asyncio.to_thread(lambda: [cls.encrypt(plaintext) for plaintext in plaintexts])
+
+    @classmethod
+    async def decrypt_many(cls, encrypted_data: List[str]) -> List[str]:
+        """
+        Decrypts the provided encrypted data in a worker thread, off the event loop.
+
+        Args:
+            encrypted_data (List[str]): Base64-encoded encrypted data, in the versioned or the legacy envelope.
+
+        Returns:
+            List[str]: The plaintext of each encrypted data, in the same order.
+        """
+        return await asyncio.to_thread(lambda: [cls.decrypt(data) for data in encrypted_data])
+
     @classmethod
     def _get_cipher(cls, key: bytes, iv: bytes) -> Cipher:
         """
@@ -107,6 +159,46 @@ class EncryptionService:
         """
         return Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
 
+    @classmethod
+    def __get_derived_key(cls, salt: bytes) -> bytes:
+        """
+        Returns the PBKDF2 key of the salt, deriving it only if it is not cached yet.
+
+        Args:
+            salt (bytes): The cryptographic salt.
+
+        Returns:
+            bytes: A 32-byte (256-bit) AES key.
+        """
+        with cls._derived_keys_lock:
+            key = cls._derived_keys.get(salt)
+        if key is None:
+            key = cls.__derive_key(salt=salt)
+            with cls._derived_keys_lock:
+                cls._derived_keys.set(salt, key)
+        return key
+
+    @classmethod
+    def __derive_record_key(cls, key_salt: bytes, record_salt: bytes) -> bytes:
+        """
+        Derives the 256-bit AES key of a record from the cached PBKDF2 key of the key salt and the record salt.
+
+        Args:
+            key_salt (bytes): The salt of the PBKDF2 key.
+            record_salt (bytes): The random salt of the record.
+
+        Returns:
+            bytes: A 32-byte (256-bit) AES key.
+        """
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=cls.KEY_LENGTH,
+            salt=record_salt,
+            info=cls.RECORD_KEY_INFO,
+            backend=default_backend(),
+        )
+        return hkdf.derive(cls.__get_derived_key(salt=key_salt))
+
     @classmethod
     def __derive_key(cls, salt: bytes) -> bytes:
         """
@@ -175,20 +267,22 @@ class EncryptionService:
         return base64.b64encode(encrypted_data).decode("utf-8")
 
     @classmethod
-    def __decode(cls, encoded_data: str) -> tuple[bytes, bytes, bytes]:
+    def __decode(cls, encoded_data: str, salt_length: int) -> tuple[bytes, bytes, bytes]:
         """
         Decodes the Base64-encoded encrypted data back to binary format and extracts the salt, IV, and ciphertext.
 
         Args:
             encoded_data (str): The Base64-encoded encrypted data.
+            salt_length (int): The length of the salt, 16 bytes for the legacy envelope, 32 for the key and
+                record salts of the versioned envelope.
 
         Returns:
             tuple[bytes, bytes, bytes]: The salt, IV, and ciphertext.
         """
         decoded_cipher_bytes = base64.b64decode(encoded_data)
 
-        salt = decoded_cipher_bytes[: cls.SALT_LENGTH]  # First 16 bytes for salt
-        iv = decoded_cipher_bytes[cls.SALT_LENGTH : cls.SALT_LENGTH + cls.IV_LENGTH]  # Next 16 bytes for IV
-        ciphertext = decoded_cipher_bytes[cls.SALT_LENGTH + cls.IV_LENGTH :]  # Remaining bytes for ciphertext
+        salt = decoded_cipher_bytes[:salt_length]  # First bytes for salt
+        iv = decoded_cipher_bytes[salt_length : salt_length + cls.IV_LENGTH]  # Next 16 bytes for IV
+        ciphertext = decoded_cipher_bytes[salt_length + cls.IV_LENGTH :]  # Remaining bytes for ciphertext
 
         return salt, iv, ciphertext
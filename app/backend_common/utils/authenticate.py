@@ -7,6 +7,7 @@ from deputydev_core.utils.context_value import ContextValue
 from sanic.server.websockets.impl import WebsocketImplProtocol
 
 from app.backend_common.service_clients.deputydev_auth.deputydev_auth import DeputyDevAuthClient
+from app.backend_common.services.auth.auth_result_cache import AuthResultCache
 from app.backend_common.utils.dataclasses.main import AuthData, ClientData
 from app.backend_common.utils.sanic_wrapper import Request
 from app.backend_common.utils.sanic_wrapper.exceptions import BadRequestException
@@ -15,7 +16,8 @@ from deputydev_core.utils.app_logger import AppLogger
 
 async def get_auth_data(request: Request) -> Tuple[AuthData, Dict[str, Any]]:  # noqa: C901
     """
-    Get the auth data by calling the auth service API using aiohttp
+    Get the auth data by calling the auth service API using aiohttp,
+    serving repeated verifications of the same token from AuthResultCache
     """
     use_grace_period: bool = False
     enable_grace_period: bool = False
@@ -39,8 +41,15 @@ async def get_auth_data(request: Request) -> Tuple[AuthData, Dict[str, Any]]:  #
         "enable_grace_period": str(enable_grace_period).lower(),
     }
 
+    # grace period checks accept expired tokens, so only plain verifications are cached
+    use_cache = AuthResultCache.is_enabled() and not use_grace_period and not enable_grace_period
+
     try:
-        auth_response = await DeputyDevAuthClient().get_auth_data(headers=headers, params=params)
+        auth_response = await AuthResultCache.get(authorization_header) if use_cache else None
+        if auth_response is None:
+            auth_response = await DeputyDevAuthClient().get_auth_data(headers=headers, params=params)
+            if use_cache:
+                await AuthResultCache.set(authorization_header, auth_response)
         auth_data: AuthData = AuthData(**auth_response["auth_data"])
         return auth_data, auth_response["response_headers"]
     except Exception as ex:
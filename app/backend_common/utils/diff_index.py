@@ -0,0 +1,298 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# line numbering only honours hunk headers carrying both line counts, see `DiffIndex.line_numbered_diff`
+_NUMBERED_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+),\d+ \+(\d+),\d+ @@")
+_HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+@dataclass(frozen=True, slots=True)
+class DiffLine:
+    """A content line of a hunk. `old_line` is None for added lines, `new_line` for removed ones."""
+
+    kind: str  # "+", "-", " " or "\\" (no newline marker)
+    text: str
+    offset: int
+    old_line: Optional[int]
+    new_line: Optional[int]
+
+
+@dataclass(slots=True)
+class DiffHunk:
+    """A hunk of a file diff; `start` and `end` delimit it (header included) in the diff text."""
+
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    start: int
+    end: int = -1
+    added: int = 0
+    removed: int = 0
+
+
+@dataclass(slots=True)
+class FileDiff:
+    """The diff of a single file; `start` and `end` delimit it (headers included) in the diff text."""
+
+    path: str
+    old_path: str
+    new_path: str
+    start: int
+    end: int = -1
+    hunks: List[DiffHunk] = field(default_factory=list)
+    added: int = 0
+    removed: int = 0
+
+    @property
+    def loc(self) -> int:
+        return self.added + self.removed
+
+    @property
+    def is_new(self) -> bool:
+        return self.old_path == "/dev/null"
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.new_path == "/dev/null"
+
+
+def _strip_path_prefix(path: str) -> str:
+    path = path.split("\t", 1)[0].strip()
+    if path.startswith(("a/", "b/")):
+        return path[2:]
+    return path
+
+
+def _split_diff_git_paths(paths: str) -> Tuple[str, str]:
+    """Split the `a/<old> b/<new>` part of a `diff --git` line into the old and new path."""
+    paths = paths.strip()
+    separator = paths.rfind(" b/") if paths.startswith("a/") else -1
+    if separator == -1:
+        old_path, _, new_path = paths.partition(" ")
+    else:
+        old_path, new_path = paths[:separator], paths[separator + 1 :]
+    return _strip_path_prefix(old_path.strip('"')), _strip_path_prefix(new_path.strip('"'))
+
+
+class DiffIndex:
+    """
+    Index of a unified diff, built in a single linear pass.
+
+    The diff is parsed once into files, hunks (with their offsets in the diff text) and line
+    counts, and the line-numbered rendering used in review prompts is produced by the same pass,
+    so callers needing several of these should share one index instead of re-parsing the diff.
+
+    Example:
+        ```python
+        index = DiffIndex(pr_diff)
+        prompt_diff = index.line_numbered_diff
+        for file_diff in index.files:
+            print(file_diff.path, file_diff.loc, index.get_file_diff(file_diff.path))
+        ```
+    """
+
+    def __init__(self, diff: str) -> None:
+        self.diff = diff
+        self.files: List[FileDiff] = []
+        self.added = 0
+        self.removed = 0
+        self._files_by_path: Dict[str, FileDiff] = {}
+        self._line_numbered: List[str] = []
+        self._parse()
+
+    @property
+    def loc(self) -> int:
+        """Lines added plus lines removed, diff metadata lines excluded."""
+        return self.added + self.removed
+
+    @property
+    def line_numbered_diff(self) -> str:
+        """The diff with `<+new_line>` / `<-old_line>` prefixed to the content lines, as `append_line_numbers`."""
+        if not self._line_numbered:
+            return self.diff
+        return "\n".join(self._line_numbered)
+
+    @property
+    def file_paths(self) -> List[str]:
+        return [file_diff.path for file_diff in self.files]
+
+    def get_file(self, path: str) -> Optional[FileDiff]:
+        return self._files_by_path.get(path)
+
+    def get_file_diff(self, path: str) -> Optional[str]:
+        """Return the section of the diff of a single file, or None if the file is not part of the diff."""
+        file_diff = self._files_by_path.get(path)
+        if file_diff is None:
+            return None
+        return self.diff[file_diff.start : file_diff.end]
+
+    def iter_hunk_lines(self, hunk: DiffHunk) -> Iterator[DiffLine]:
+        """Yield the content lines of a hunk with their old and new line numbers."""
+        header_end = self.diff.find("\n", hunk.start, hunk.end)
+        if header_end == -1:
+            return
+        offset = header_end + 1
+        old_line, new_line = hunk.old_start, hunk.new_start
+        for text in self.diff[offset : hunk.end].split("\n"):
+            if offset >= hunk.end:
+                break
+            kind = text[:1] or " "
+            if kind == "+":
+                yield DiffLine(kind, text[1:], offset, None, new_line)
+                new_line += 1
+            elif kind == "-":
+                yield DiffLine(kind, text[1:], offset, old_line, None)
+                old_line += 1
+            elif kind == "\\":
+                yield DiffLine(kind, text, offset, None, None)
+            else:
+                yield DiffLine(" ", text[1:], offset, old_line, new_line)
+                old_line += 1
+                new_line += 1
+            offset += len(text) + 1
+
+    def _parse(self) -> None:  # noqa: C901
+        numbered = self._line_numbered
+        numbering_started = False
+        old_line_no = new_line_no = 0
+
+        current_file: Optional[FileDiff] = None
+        current_hunk: Optional[DiffHunk] = None
+        hunk_old_left = hunk_new_left = 0
+        # set while the current file was opened by a `diff --git` line and has not had its ---/+++ headers yet
+        awaiting_headers = False
+        previous_minus_header: Optional[str] = None
+        previous_offset = 0
+
+        offset = 0
+        for line in self.diff.split("\n"):
+            first = line[:1]
+
+            # structure: files and hunks, with their extent in the diff text
+            if current_hunk is not None and (hunk_old_left > 0 or hunk_new_left > 0):
+                if first == "+":
+                    hunk_new_left -= 1
+                    current_hunk.added += 1
+                    current_file.added += 1
+                elif first == "-":
+                    hunk_old_left -= 1
+                    current_hunk.removed += 1
+                    current_file.removed += 1
+                elif first != "\\":
+                    hunk_old_left -= 1
+                    hunk_new_left -= 1
+                if hunk_old_left <= 0 and hunk_new_left <= 0:
+                    current_hunk.end = min(offset + len(line) + 1, len(self.diff))
+            elif first == "\\" and current_hunk is not None and current_hunk.end == offset:
+                # "\ No newline at end of file" right after the last line of the hunk
+                current_hunk.end = min(offset + len(line) + 1, len(self.diff))
+            elif first == "@" and current_file is not None and line.startswith("@@ "):
+                hunk_match = _HUNK_HEADER_RE.match(line)
+                if hunk_match:
+                    if current_hunk is not None and current_hunk.end == -1:
+                        current_hunk.end = offset
+                    old_count = int(hunk_match.group(2)) if hunk_match.group(2) is not None else 1
+                    new_count = int(hunk_match.group(4)) if hunk_match.group(4) is not None else 1
+                    current_hunk = DiffHunk(
+                        old_start=int(hunk_match.group(1)),
+                        old_count=old_count,
+                        new_start=int(hunk_match.group(3)),
+                        new_count=new_count,
+                        start=offset,
+                    )
+                    current_file.hunks.append(current_hunk)
+                    hunk_old_left, hunk_new_left = old_count, new_count
+            elif first == "d" and line.startswith("diff --git "):
+                # every `diff --git` line starts a file, including binary and rename only sections without headers
+                old_path, new_path = _split_diff_git_paths(line[len("diff --git ") :])
+                current_file = self._start_file(current_file, current_hunk, old_path, new_path, offset)
+                current_hunk = None
+                awaiting_headers = True
+            elif first == "n" and awaiting_headers and line.startswith("new file mode"):
+                current_file.old_path = "/dev/null"
+            elif first == "d" and awaiting_headers and line.startswith("deleted file mode"):
+                current_file.new_path = "/dev/null"
+            elif first == "+" and previous_minus_header is not None and line.startswith("+++ "):
+                old_path = _strip_path_prefix(previous_minus_header)
+                new_path = _strip_path_prefix(line[4:])
+                if awaiting_headers:
+                    # the headers of the file opened by the `diff --git` line
+                    current_file.old_path, current_file.new_path = old_path, new_path
+                    self._set_path(current_file, old_path if new_path == "/dev/null" else new_path)
+                else:
+                    current_file = self._start_file(current_file, current_hunk, old_path, new_path, previous_offset)
+                    current_hunk = None
+                awaiting_headers = False
+
+            previous_minus_header = line[4:] if first == "-" and line.startswith("--- ") else None
+            previous_offset = offset
+
+            # line counts and numbering, with the exact semantics of the former regex based helpers
+            if first == "+":
+                if line.startswith("+++"):
+                    if line.startswith("+++ b/") and len(line) > 6:
+                        numbering_started = True
+                        numbered.append(line)
+                else:
+                    self.added += 1
+                    if numbering_started:
+                        numbered.append(f"<+{new_line_no}> {line}")
+                    new_line_no += 1
+            elif first == "-":
+                if not line.startswith("---"):
+                    self.removed += 1
+                    if numbering_started:
+                        numbered.append(f"<-{old_line_no}> {line}")
+                    old_line_no += 1
+            elif first == "@" and line.startswith("@@"):
+                numbered_hunk_match = _NUMBERED_HUNK_HEADER_RE.match(line)
+                if numbered_hunk_match:
+                    old_line_no = int(numbered_hunk_match.group(1))
+                    new_line_no = int(numbered_hunk_match.group(2))
+                    numbered.append(line)
+            else:
+                if numbering_started:
+                    numbered.append(f"<+{new_line_no}> {line}")
+                new_line_no += 1
+                old_line_no += 1
+
+            offset += len(line) + 1
+
+        diff_end = len(self.diff)
+        if current_hunk is not None and current_hunk.end == -1:
+            current_hunk.end = diff_end
+        if current_file is not None:
+            current_file.end = diff_end
+
+    def _start_file(
+        self,
+        current_file: Optional[FileDiff],
+        current_hunk: Optional[DiffHunk],
+        old_path: str,
+        new_path: str,
+        start: int,
+    ) -> FileDiff:
+        """Close the current file and hunk at `start` and register the file starting there."""
+        if current_hunk is not None and current_hunk.end == -1:
+            current_hunk.end = start
+        if current_file is not None:
+            current_file.end = start
+        file_diff = FileDiff(
+            path=old_path if new_path == "/dev/null" else new_path,
+            old_path=old_path,
+            new_path=new_path,
+            start=start,
+        )
+        self.files.append(file_diff)
+        self._files_by_path.setdefault(file_diff.path, file_diff)
+        return file_diff
+
+    def _set_path(self, file_diff: FileDiff, path: str) -> None:
+        if path == file_diff.path:
+            return
+        if self._files_by_path.get(file_diff.path) is file_diff:
+            del self._files_by_path[file_diff.path]
+        file_diff.path = path
+        self._files_by_path.setdefault(path, file_diff)
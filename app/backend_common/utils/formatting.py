@@ -6,6 +6,7 @@ from app.backend_common.constants.constants import (
     PR_SUMMARY_COMMIT_TEXT,
     PR_SUMMARY_TEXT,
 )
+from app.backend_common.utils.diff_index import DiffIndex
 
 
 def format_code_blocks(comment: str) -> str:
@@ -111,58 +112,11 @@ def format_summary_with_metadata(summary: str, loc: int, commit_id: str) -> str:
     return formatted_summary
 
 
-def append_line_numbers(pr_diff: str) -> str:  # noqa: C901
+def append_line_numbers(pr_diff: str) -> str:
     """Append line numbers to PR diff
     Args:
         pr_diff (str): pr diff returned from git diff
     Returns:
         str: pr_diff with line number
     """
-
-    result = []
-    current_file = None
-    original_line_number = 0
-    new_line_number = 0
-
-    lines = pr_diff.split("\n")
-    for line in lines:
-        # Match the start of a new file diff
-        file_match = re.match(r"^\+\+\+ b/(.+)$", line)
-        if file_match:
-            current_file = file_match.group(1)
-            result.append(line)
-            continue
-
-        # Match the line number info
-        line_info_match = re.match(r"^@@ -(\d+),\d+ \+(\d+),\d+ @@", line)
-        if line_info_match:
-            original_line_number = int(line_info_match.group(1))
-            new_line_number = int(line_info_match.group(2))
-            result.append(line)
-            continue
-
-        # Handle added lines
-        if line.startswith("+") and not line.startswith("+++"):
-            if current_file:
-                result.append(f"<+{new_line_number}> {line}")
-            new_line_number += 1
-            continue
-
-        # Handle removed lines
-        if line.startswith("-") and not line.startswith("---"):
-            if current_file:
-                result.append(f"<-{original_line_number}> {line}")
-            original_line_number += 1
-            continue
-
-        # Handle unchanged lines
-        if not line.startswith("-") and not line.startswith("+") and not line.startswith("@@"):
-            if current_file:
-                result.append(f"<+{new_line_number}> {line}")
-            new_line_number += 1
-            original_line_number += 1
-
-    if not result:
-        return pr_diff
-
-    return "\n".join(result)
+    return DiffIndex(pr_diff).line_numbered_diff
@@ -2,6 +2,9 @@ from typing import Any
 
 from sanic import Sanic
 
+from app.backend_common.service_clients.aws_api_gateway.aws_api_gateway_service_client import (
+    AWSAPIGatewayServiceClient,
+)
 from app.backend_common.utils.redis_wrapper.registry import cache_registry
 from app.backend_common.utils.sanic_wrapper.constants import ListenerEventTypes
 from app.backend_common.utils.tortoise_wrapper import TortoiseWrapper
@@ -11,6 +14,7 @@ from app.main.blueprints.one_dev.services.kafka.analytics_events.analytics_event
 from app.main.blueprints.one_dev.services.kafka.error_analytics_events.error_analytics_event_subscriber import (
     ErrorAnalyticsEventSubscriber,
 )
+from app.main.blueprints.one_dev.utils.cancellation_subscriber import CancellationSubscriber
 
 
 async def initialize_kafka_subscriber(_app: Sanic, loop: Any) -> None:
@@ -37,6 +41,14 @@ async def close_weaviate_server(_app: Sanic, loop: Any) -> None:
         _app.ctx.weaviate_client.sync_client.close()
 
 
+async def stop_cancellation_subscriber(_app: Sanic, loop: Any) -> None:
+    await CancellationSubscriber.stop()
+
+
+async def close_api_gateway_clients(_app: Sanic, loop: Any) -> None:
+    await AWSAPIGatewayServiceClient.close_all()
+
+
 async def setup_caches(app: Sanic) -> None:
     cache_config = app.config["REDIS_CACHE_HOSTS"]
     cache_registry.from_config(cache_config)
@@ -53,6 +65,8 @@ async def teardown_tortoise(app: Sanic) -> None:
 # Initializing listeners with background task only if it the background worker flag is enabled.
 listeners = [
     (close_weaviate_server, ListenerEventTypes.BEFORE_SERVER_STOP.value),
+    (stop_cancellation_subscriber, ListenerEventTypes.BEFORE_SERVER_STOP.value),
+    (close_api_gateway_clients, ListenerEventTypes.AFTER_SERVER_STOP.value),
     (setup_caches, ListenerEventTypes.BEFORE_SERVER_START.value),
     (initialize_kafka_subscriber, ListenerEventTypes.AFTER_SERVER_START.value),
     (setup_tortoise, ListenerEventTypes.BEFORE_SERVER_START.value),
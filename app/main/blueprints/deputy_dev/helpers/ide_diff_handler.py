@@ -1,6 +1,7 @@
 import re
 
 from app.backend_common.utils.app_utils import get_token_count
+from app.backend_common.utils.diff_index import DiffIndex
 
 
 class IdeDiffHandler:
@@ -13,16 +14,7 @@ class IdeDiffHandler:
         Calculate total lines added and removed in the PR diff.
         Ignores diff metadata lines.
         """
-        added = 0
-        removed = 0
-        for line in self.pr_diff.splitlines():
-            if line.startswith("+++") or line.startswith("---"):
-                continue
-            if line.startswith("+") and not line.startswith("+++"):
-                added += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                removed += 1
-        return added + removed
+        return DiffIndex(self.pr_diff).loc
 
     def get_diff_token_count(self) -> int:
         """
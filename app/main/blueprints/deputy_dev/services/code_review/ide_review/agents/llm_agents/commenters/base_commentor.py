@@ -66,6 +66,8 @@ from app.main.blueprints.deputy_dev.services.repository.review_agent_chats.repos
 class BaseCommenterAgent(BaseCodeReviewAgent):
     is_dual_pass: bool
     prompt_features: List[PromptFeatures]
+    # part of the key of cached review results, bump it when the prompts of the agent change
+    prompt_version: int = 1
 
     def __init__(
         self,
@@ -89,6 +91,8 @@ class BaseCommenterAgent(BaseCodeReviewAgent):
         self.tool_request_manager = ToolRequestManager(context_service=self.context_service)
         self.review_agent_chats: List[ReviewAgentChatDTO] = []
         self.prompt_vars = {}
+        # comments saved by the final response of the run, None until then
+        self.saved_comments: Optional[List[IdeReviewsCommentDTO]] = None
 
     def agent_relevant_chunk(self, relevant_chunks: Dict[str, Any]) -> str:
         relevant_chunks_index = relevant_chunks["relevant_chunks_mapping"][self.agent_id]
@@ -601,3 +605,4 @@ class BaseCommenterAgent(BaseCodeReviewAgent):
 
         if comments_to_insert:
             await IdeCommentRepository.insert_comments(comments_to_insert)
+        self.saved_comments = comments_to_insert
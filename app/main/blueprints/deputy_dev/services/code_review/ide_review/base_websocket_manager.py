@@ -12,6 +12,9 @@ from app.backend_common.service_clients.aws_api_gateway.aws_api_gateway_service_
     AWSAPIGatewayServiceClient,
     SocketClosedError,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.connection_send_queue import (
+    ConnectionSendQueue,
+)
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.main import WebSocketMessage
 
 
@@ -43,6 +46,9 @@ class BaseWebSocketManager(ABC):
         """
         Push message to WebSocket connection.
 
+        Messages to AWS are queued on the `ConnectionSendQueue` of the connection and posted in the
+        background, in order; `cleanup` waits for them to be sent.
+
         Args:
             message: WebSocket message to send
             local_testing_stream_buffer: Buffer for local testing
@@ -61,9 +67,8 @@ class BaseWebSocketManager(ABC):
             else:
                 # AWS WebSocket
                 if self.aws_client:
-                    await self.aws_client.post_to_connection(
-                        connection_id=self.connection_id,
-                        message=json.dumps(message_data),
+                    await ConnectionSendQueue.send(
+                        self.connection_id, self.aws_client, message.type, json.dumps(message_data)
                     )
         except SocketClosedError:
             self.connection_id_gone = True
@@ -80,8 +85,9 @@ class BaseWebSocketManager(ABC):
         )
 
     async def cleanup(self) -> None:
-        """Clean up AWS client and other resources."""
+        """Send the messages still queued for the connection, then clean up AWS client and other resources."""
         if self.aws_client:
+            await ConnectionSendQueue.flush_connection(self.connection_id)
             await self.aws_client.close()
 
     @abstractmethod
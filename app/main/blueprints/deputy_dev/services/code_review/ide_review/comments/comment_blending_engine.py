@@ -17,6 +17,9 @@ from app.main.blueprints.deputy_dev.services.code_review.common.prompts.dataclas
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.agents.agent_factory import (
     AgentFactory,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.comments.comment_clusterer import (
+    CommentClusterer,
+)
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.comments.dataclasses.main import (
     LLMCommentData,
 )
@@ -241,7 +244,9 @@ class CommentBlendingEngine:
 
         single_comments, multi_comments = self.split_single_and_multi_comments()
 
-        processed_comments = single_comments
+        # near duplicate comments are blended locally, only divergent lines need the summarization agent
+        locally_blended_comments, multi_comments = CommentClusterer.blend(multi_comments)
+        processed_comments = single_comments + locally_blended_comments
 
         # If there are no multi-line comments, return just the single comments
         if not multi_comments:
@@ -0,0 +1,141 @@
+import re
+from typing import List, Tuple
+
+import mmh3
+from fuzzywuzzy import fuzz
+
+from app.main.blueprints.deputy_dev.services.code_review.common.comments.dataclasses.main import (
+    ParsedAggregatedCommentData,
+    ParsedCommentData,
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def simhash(text: str) -> int:
+    """64 bit SimHash of the word unigrams and bigrams of a text."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    weights = [0] * 64
+    for feature in features:
+        feature_hash = mmh3.hash64(feature, signed=False)[0]
+        for bit in range(64):
+            weights[bit] += 1 if feature_hash >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(first: int, second: int) -> int:
+    return (first ^ second).bit_count()
+
+
+class CommentClusterer:
+    """
+    Groups the comments made on one line into clusters of near duplicates, without any LLM call.
+
+    Two comments are duplicates when the SimHashes of their texts are close, which cheaply rules out
+    unrelated comments, and their fuzzy token set similarity confirms it. Each cluster is represented by
+    its most confident comment, so a line whose comments all fall in one cluster can be blended locally
+    and only lines with divergent clusters need the summarization agent.
+    """
+
+    MAX_SIMHASH_DISTANCE = 18
+
+    MIN_SIMILARITY = 85
+
+    @classmethod
+    def _comment_text(cls, line_comments: ParsedAggregatedCommentData, index: int) -> str:
+        title = line_comments.titles[index] if index < len(line_comments.titles) else ""
+        return f"{title or ''} {line_comments.comments[index]}".strip()
+
+    @classmethod
+    def cluster(cls, line_comments: ParsedAggregatedCommentData) -> List[List[int]]:
+        """
+        Cluster the comments of a line, as lists of indexes into its comment lists, each list starting with
+        the most confident comment of the cluster.
+        """
+        order = sorted(
+            range(len(line_comments.comments)), key=lambda index: line_comments.confidence_scores[index], reverse=True
+        )
+        texts = {index: cls._comment_text(line_comments, index) for index in order}
+        hashes = {index: simhash(text) for index, text in texts.items()}
+
+        clusters: List[List[int]] = []
+        for index in order:
+            for cluster in clusters:
+                representative = cluster[0]
+                if (
+                    hamming_distance(hashes[index], hashes[representative]) <= cls.MAX_SIMHASH_DISTANCE
+                    and fuzz.token_set_ratio(texts[index], texts[representative]) >= cls.MIN_SIMILARITY
+                ):
+                    cluster.append(index)
+                    break
+            else:
+                clusters.append([index])
+        return clusters
+
+    @classmethod
+    def merge_cluster(cls, line_comments: ParsedAggregatedCommentData, cluster: List[int]) -> ParsedCommentData:
+        """
+        Blend a cluster of duplicates into its representative, the way the summarization agent merges comments of
+        uniform meaning: a new comment under the bucket of the most relevant one.
+        """
+        representative = cluster[0]
+        return ParsedCommentData(
+            title=line_comments.titles[representative] if line_comments.titles else None,
+            file_path=line_comments.file_path,
+            line_number=line_comments.line_number,
+            line_hash=line_comments.line_hash,
+            tag=line_comments.tags[representative],
+            comment=line_comments.comments[representative],
+            buckets=[line_comments.buckets[representative]],
+            confidence_score=round(sum(line_comments.confidence_scores[index] for index in cluster) / len(cluster), 2),
+            corrective_code=line_comments.corrective_code[representative],
+            model=line_comments.model,
+            is_valid=line_comments.is_valid,
+            is_summarized=True,
+            rationale=line_comments.rationales[representative] or "",
+        )
+
+    @classmethod
+    def representatives(
+        cls, line_comments: ParsedAggregatedCommentData, clusters: List[List[int]]
+    ) -> ParsedAggregatedCommentData:
+        """The comments of a line reduced to the representative of each cluster."""
+        indexes = [cluster[0] for cluster in clusters]
+        return line_comments.model_copy(
+            update={
+                "titles": [line_comments.titles[index] for index in indexes] if line_comments.titles else [],
+                "comments": [line_comments.comments[index] for index in indexes],
+                "tags": [line_comments.tags[index] for index in indexes],
+                "comment_ids": [line_comments.comment_ids[index] for index in indexes]
+                if line_comments.comment_ids
+                else [],
+                "buckets": [line_comments.buckets[index] for index in indexes],
+                "corrective_code": [line_comments.corrective_code[index] for index in indexes],
+                "confidence_scores": [line_comments.confidence_scores[index] for index in indexes],
+                "rationales": [line_comments.rationales[index] for index in indexes],
+            }
+        )
+
+    @classmethod
+    def blend(
+        cls, multi_comments: List[ParsedAggregatedCommentData]
+    ) -> Tuple[List[ParsedCommentData], List[ParsedAggregatedCommentData]]:
+        """
+        Blend the lines whose comments are all near duplicates locally.
+
+        Returns:
+            The comments blended locally, and the lines left for the summarization agent with their duplicates
+            collapsed into one comment.
+        """
+        blended_comments: List[ParsedCommentData] = []
+        divergent_lines: List[ParsedAggregatedCommentData] = []
+        for line_comments in multi_comments:
+            clusters = cls.cluster(line_comments)
+            if len(clusters) == 1:
+                blended_comments.append(cls.merge_cluster(line_comments, clusters[0]))
+            elif len(clusters) < len(line_comments.comments):
+                divergent_lines.append(cls.representatives(line_comments, clusters))
+            else:
+                divergent_lines.append(line_comments)
+        return blended_comments, divergent_lines
@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+from typing import ClassVar, Deque, Dict, Optional, Tuple
+
+from deputydev_core.utils.app_logger import AppLogger
+
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.backend_common.service_clients.aws_api_gateway.aws_api_gateway_service_client import (
+    AWSAPIGatewayServiceClient,
+    SocketClosedError,
+)
+
+
+class ConnectionSendQueue:
+    """
+    Outbound queue of a websocket connection, shared by every manager of the connection in the process.
+
+    Messages are posted in the order they were pushed by a single sender task per connection, while
+    posts across connections are bounded by `MAX_CONCURRENT_POSTS`. A burst of pushes therefore costs
+    the pusher nothing but an append; a heartbeat queued behind another heartbeat is dropped, as it
+    carries no information. Once a post fails the connection is marked gone and everything queued for
+    it is discarded.
+
+    `flush` must be awaited before a manager is done with a connection, to know its messages were sent.
+    """
+
+    # Maximum number of posts in flight across all connections of the process
+    MAX_CONCURRENT_POSTS = 32
+
+    # Pushers wait for the queue to drain once this many messages are pending
+    MAX_PENDING_MESSAGES = 256
+
+    # Message types of which a pending message supersedes a newly pushed one
+    COALESCED_MESSAGE_TYPES = frozenset({"IN_PROGRESS"})
+
+    # How long (in seconds) a closed connection is remembered, so that later pushes are dropped
+    GONE_CONNECTION_TTL = 600
+
+    _queues: ClassVar[Dict[str, "ConnectionSendQueue"]] = {}
+    _gone_connections: ClassVar[LocalLRUCache[str, bool]] = LocalLRUCache(max_size=10000, ttl=GONE_CONNECTION_TTL)
+    _post_semaphore: ClassVar[Optional[asyncio.Semaphore]] = None
+
+    def __init__(self, connection_id: str, client: AWSAPIGatewayServiceClient) -> None:
+        self.connection_id = connection_id
+        self.client = client
+        self._pending: Deque[Tuple[str, str]] = deque()
+        self._sender_task: Optional[asyncio.Task[None]] = None
+
+    @classmethod
+    async def send(
+        cls, connection_id: str, client: AWSAPIGatewayServiceClient, message_type: str, message: str
+    ) -> None:
+        """
+        Queue a serialized message on the queue of the connection, creating the queue if needed.
+
+        Raises:
+            SocketClosedError: If the connection is known to be closed
+        """
+        if cls.is_gone(connection_id):
+            raise SocketClosedError(f"Connection with connection_id: {connection_id} is closed")
+
+        queue = cls._queues.get(connection_id)
+        if queue is None:
+            queue = cls._queues[connection_id] = cls(connection_id, client)
+        await queue.push(message_type, message)
+
+    @classmethod
+    async def flush_connection(cls, connection_id: str) -> None:
+        """Wait for the messages queued for the connection, if any, without creating a queue for it."""
+        queue = cls._queues.get(connection_id)
+        if queue is not None:
+            await queue.flush()
+
+    @classmethod
+    def is_gone(cls, connection_id: str) -> bool:
+        return cls._gone_connections.get(connection_id) is not None
+
+    @classmethod
+    def _get_post_semaphore(cls) -> asyncio.Semaphore:
+        if cls._post_semaphore is None:
+            cls._post_semaphore = asyncio.Semaphore(cls.MAX_CONCURRENT_POSTS)
+        return cls._post_semaphore
+
+    async def push(self, message_type: str, message: str) -> None:
+        """Queue a serialized message for the connection, dropping it if the connection is known to be closed."""
+        if self.is_gone(self.connection_id):
+            return
+
+        if len(self._pending) >= self.MAX_PENDING_MESSAGES:
+            await self.flush()
+            # a drained queue unregisters itself, register it again so later pushes keep following this one
+            self._queues.setdefault(self.connection_id, self)
+
+        if message_type in self.COALESCED_MESSAGE_TYPES and self._pending and self._pending[-1][0] == message_type:
+            return
+
+        self._pending.append((message_type, message))
+        if self._sender_task is None:
+            self._sender_task = asyncio.create_task(self._send_pending())
+
+    async def flush(self) -> None:
+        """Wait until every message queued so far has been posted, or dropped because the connection is gone."""
+        while self._sender_task is not None:
+            await asyncio.shield(self._sender_task)
+
+    async def _send_pending(self) -> None:
+        try:
+            while self._pending:
+                message_type, message = self._pending.popleft()
+                try:
+                    async with self._get_post_semaphore():
+                        await self.client.post_to_connection(connection_id=self.connection_id, message=message)
+                except SocketClosedError:
+                    raise
+                except Exception as ex:  # noqa: BLE001
+                    AppLogger.log_error(f"Error pushing {message_type} to WebSocket {self.connection_id}: {ex}")
+        except SocketClosedError:
+            AppLogger.log_error(
+                f"WebSocket connection {self.connection_id} closed, dropping {len(self._pending)} pending messages"
+            )
+            self._gone_connections.set(self.connection_id, True)
+            self._pending.clear()
+        finally:
+            self._sender_task = None
+            if not self._pending and self._queues.get(self.connection_id) is self:
+                del self._queues[self.connection_id]
@@ -1,10 +1,46 @@
-from app.backend_common.caches.ide_review_cache import IdeReviewCache
-from app.backend_common.utils.formatting import append_line_numbers
+import asyncio
+from typing import Optional
+
+from deputydev_core.utils.app_logger import AppLogger
+
+from app.backend_common.caches.ide_review_diff_context_cache import IdeReviewDiffContextCache
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context import (
+    ReviewDiffContext,
+)
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.diff_blob_store import DiffBlobStore
 
 
 class IdeReviewContextService:
-    def __init__(self, review_id: int) -> None:
+    """
+    Serves the diff of a review to its agents and tools.
+
+    The diff context is resolved at most once per instance, and looked up in a per-worker LRU before
+    it is built from the compressed diff in `DiffBlobStore`. Only its token counts are shared across
+    workers through `IdeReviewDiffContextCache`, so that Redis never holds the diff uncompressed. Pass
+    an already resolved `diff_context` to share it between the services of all agents of a review.
+    """
+
+    MAX_LOCAL_CONTEXTS = 32
+
+    LOCAL_TTL = 600
+
+    _local_contexts: LocalLRUCache[int, ReviewDiffContext] = LocalLRUCache(max_size=MAX_LOCAL_CONTEXTS, ttl=LOCAL_TTL)
+
+    def __init__(self, review_id: int, diff_context: Optional[ReviewDiffContext] = None) -> None:
         self.review_id = review_id
+        self._diff_context = diff_context
+
+    async def get_diff_context(self) -> ReviewDiffContext:
+        """
+        Return the diff context of the review.
+
+        Raises:
+            ValueError: If the diff of the review is not cached
+        """
+        if self._diff_context is None:
+            self._diff_context = await self._load_diff_context()
+        return self._diff_context
 
     async def get_pr_diff(self, append_line_no_info: bool = False) -> str:
         """
@@ -17,11 +53,38 @@ class IdeReviewContextService:
         Returns:
             str: The PR diff, optionally with line numbers.
         """
+        diff_context = await self.get_diff_context()
+        if append_line_no_info:
+            return diff_context.line_numbered_diff
+        return diff_context.raw_diff
+
+    async def _load_diff_context(self) -> ReviewDiffContext:
+        diff_context = self._local_contexts.get(self.review_id)
+        if diff_context is not None:
+            return diff_context
+
         cache_key = f"{self.review_id}"
-        pr_diff = await IdeReviewCache.get(cache_key)
+        try:
+            cached_context = await IdeReviewDiffContextCache.get(cache_key)
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to read diff context of review_id={self.review_id}: {ex}")
+            cached_context = None
+        token_counts = (
+            {field: cached_context[field] for field in ReviewDiffContext.TOKEN_COUNT_FIELDS}
+            if cached_context is not None
+            else {}
+        )
+
+        pr_diff = await DiffBlobStore.get(cache_key)
         if pr_diff is None:
             raise ValueError(f"PR diff not found in cache for review_id={self.review_id}")
+        # parsing and token counting of a large diff would otherwise stall the event loop
+        diff_context = await asyncio.to_thread(ReviewDiffContext.build, self.review_id, pr_diff, **token_counts)
+        if cached_context is None:
+            try:
+                await IdeReviewDiffContextCache.set(cache_key, diff_context.get_token_counts())
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(f"Failed to cache diff context of review_id={self.review_id}: {ex}")
 
-        if append_line_no_info:
-            return append_line_numbers(pr_diff)
-        return pr_diff
+        self._local_contexts.set(self.review_id, diff_context)
+        return diff_context
@@ -0,0 +1,74 @@
+import hashlib
+from functools import cached_property
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.backend_common.utils.app_utils import get_token_count
+from app.backend_common.utils.diff_index import DiffIndex
+
+
+class ReviewDiffContext(BaseModel):
+    """
+    Everything derived from the diff of a review, computed once and shared by all agents of the review.
+
+    Instances are immutable; `file_offsets` maps each file path to the `[start, end)` range of its
+    section in `raw_diff`.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    review_id: int
+    raw_diff: str
+    line_numbered_diff: str
+    file_offsets: Dict[str, Tuple[int, int]]
+    token_count: int
+    line_numbered_token_count: int
+
+    # fields too costly to derive again from the diff, cached on their own next to the compressed diff
+    TOKEN_COUNT_FIELDS: ClassVar[Tuple[str, ...]] = ("token_count", "line_numbered_token_count")
+
+    @classmethod
+    def build(
+        cls,
+        review_id: int,
+        raw_diff: str,
+        token_count: Optional[int] = None,
+        line_numbered_token_count: Optional[int] = None,
+    ) -> "ReviewDiffContext":
+        """Build the context of a diff, counting its tokens unless the counts are already known."""
+        diff_index = DiffIndex(raw_diff)
+        line_numbered_diff = diff_index.line_numbered_diff
+        return cls(
+            review_id=review_id,
+            raw_diff=raw_diff,
+            line_numbered_diff=line_numbered_diff,
+            file_offsets={file_diff.path: (file_diff.start, file_diff.end) for file_diff in diff_index.files},
+            token_count=token_count if token_count is not None else get_token_count(raw_diff),
+            line_numbered_token_count=(
+                line_numbered_token_count
+                if line_numbered_token_count is not None
+                else get_token_count(line_numbered_diff)
+            ),
+        )
+
+    def get_token_counts(self) -> Dict[str, int]:
+        return {field: getattr(self, field) for field in self.TOKEN_COUNT_FIELDS}
+
+    @computed_field
+    @cached_property
+    def diff_hash(self) -> str:
+        """SHA-256 of the diff with line endings and trailing newlines normalized, same for re-submitted diffs."""
+        normalized_diff = self.raw_diff.replace("\r\n", "\n").rstrip("\n")
+        return hashlib.sha256(normalized_diff.encode()).hexdigest()
+
+    @property
+    def file_paths(self) -> List[str]:
+        return list(self.file_offsets)
+
+    def get_file_diff(self, file_path: str) -> Optional[str]:
+        """Return the section of the raw diff of a single file, or None if the file is not part of the diff."""
+        offsets = self.file_offsets.get(file_path)
+        if offsets is None:
+            return None
+        return self.raw_diff[offsets[0] : offsets[1]]
@@ -0,0 +1,88 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+from typing import Any, Dict, Optional
+
+from deputydev_core.utils.config_manager import ConfigManager
+from pydantic import BaseModel
+
+from app.backend_common.caches.ide_review_cache import IdeReviewCache
+from app.backend_common.service_clients.aws.services.s3 import AWSS3ServiceClient
+
+
+class StoredDiff(BaseModel):
+    """
+    A gzip compressed diff, either inline as base64 in `data` or spilled to S3 under `s3_key`.
+    """
+
+    encoding: str = "gzip"
+    size: int
+    data: Optional[str] = None
+    s3_key: Optional[str] = None
+
+
+class DiffBlobStore:
+    """
+    Stores the diff of a review compressed, keeping small diffs in `IdeReviewCache` and spilling large ones to
+    S3, where they are keyed by their content so that a diff reviewed again is uploaded once.
+
+    Reads go through the same cache entry and transparently decompress the diff, wherever it lives. Entries
+    written before compression, holding the plain diff, are still served as is.
+    """
+
+    s3_client = AWSS3ServiceClient(
+        bucket_name=ConfigManager.configs["AWS_S3"]["AWS_BUCKET_NAME"],
+        region_name=ConfigManager.configs["AWS_S3"]["AWS_REGION"],
+    )
+
+    DEFAULT_MAX_INLINE_BYTES = 256 * 1024
+
+    DEFAULT_COMPRESSION_LEVEL = 6
+
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return ConfigManager.configs.get("CODE_REVIEW", {}).get("DIFF_STORAGE", {})
+
+    @classmethod
+    def _get_s3_key(cls, compressed_diff: bytes) -> str:
+        folder_path = cls._config().get("S3_FOLDER_PATH", "ide_review_diffs")
+        return f"{folder_path}/{hashlib.sha256(compressed_diff).hexdigest()}.diff.gz"
+
+    @classmethod
+    async def compress(cls, diff: str) -> StoredDiff:
+        """
+        Compress a diff, uploading it to S3 when it is too large to be kept in the cache.
+        """
+        encoded_diff = diff.encode()
+        compression_level = cls._config().get("COMPRESSION_LEVEL", cls.DEFAULT_COMPRESSION_LEVEL)
+        # compressing a multi MB diff would otherwise stall the event loop
+        compressed_diff = await asyncio.to_thread(gzip.compress, encoded_diff, compression_level, mtime=0)
+
+        if len(compressed_diff) <= cls._config().get("MAX_INLINE_BYTES", cls.DEFAULT_MAX_INLINE_BYTES):
+            return StoredDiff(size=len(encoded_diff), data=base64.b64encode(compressed_diff).decode())
+
+        s3_key = cls._get_s3_key(compressed_diff)
+        await cls.s3_client.put_object(s3_key, compressed_diff, content_type="application/gzip")
+        return StoredDiff(size=len(encoded_diff), s3_key=s3_key)
+
+    @classmethod
+    async def set(cls, key: str, value: StoredDiff) -> None:
+        await IdeReviewCache.set(key=key, value=value.model_dump(mode="json", exclude_none=True))
+
+    @classmethod
+    async def get(cls, key: str) -> Optional[str]:
+        """
+        Return the diff stored under `key`, decompressed, or None if there is none.
+        """
+        cached_diff = await IdeReviewCache.get(key)
+        if cached_diff is None or isinstance(cached_diff, str):
+            return cached_diff
+
+        stored_diff = StoredDiff.model_validate(cached_diff)
+        if stored_diff.s3_key:
+            compressed_diff = await cls.s3_client.get_object(stored_diff.s3_key)
+        else:
+            compressed_diff = base64.b64decode(stored_diff.data or "")
+        diff = await asyncio.to_thread(gzip.decompress, compressed_diff)
+        return diff.decode()
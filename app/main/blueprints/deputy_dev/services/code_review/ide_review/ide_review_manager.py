@@ -1,5 +1,5 @@
 import textwrap
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from deputydev_core.llm_handler.dataclasses.main import PromptCacheConfig
 from deputydev_core.utils.app_logger import AppLogger
@@ -18,11 +18,20 @@ from app.main.blueprints.deputy_dev.services.code_review.common.prompts.dataclas
     PromptFeatures,
 )
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.agents.agent_factory import AgentFactory
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.agents.llm_agents.commenters.base_commentor import (
+    BaseCommenterAgent,
+)
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service import (
     IdeReviewContextService,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context import (
+    ReviewDiffContext,
+)
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.main import AgentRequestItem
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.prompts.factory import PromptFeatureFactory
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.review_result_cache_service import (
+    ReviewResultCacheService,
+)
 from app.main.blueprints.deputy_dev.services.repository.extension_reviews.repository import ExtensionReviewsRepository
 from app.main.blueprints.deputy_dev.services.repository.ide_reviews_comments.repository import IdeCommentRepository
 from app.main.blueprints.deputy_dev.services.repository.review_agents_status.repository import (
@@ -38,7 +47,9 @@ class IdeReviewManager:
     """Manager for processing Pull Request reviews."""
 
     @classmethod
-    async def review_diff(cls, agent_request: AgentRequestItem) -> Optional[Dict[str, Any]]:
+    async def review_diff(
+        cls, agent_request: AgentRequestItem, diff_context: Optional[ReviewDiffContext] = None
+    ) -> Optional[Dict[str, Any]]:
         agent_id = agent_request.agent_id
         review_id = agent_request.review_id
         request_type = agent_request.type.value
@@ -46,7 +57,7 @@ class IdeReviewManager:
         user_agent_dto = await UserAgentRepository.db_get(filters={"id": agent_id}, fetch_one=True)
         agent_and_init_params = cls.get_agent_and_init_params_for_review(user_agent_dto)
 
-        context_service = IdeReviewContextService(review_id=review_id)
+        context_service = IdeReviewContextService(review_id=review_id, diff_context=diff_context)
 
         llm_handler = LLMServiceManager().create_llm_handler(
             prompt_factory=PromptFeatureFactory,
@@ -61,9 +72,16 @@ class IdeReviewManager:
             user_agent_dto=user_agent_dto,
         )
 
-        agent_result = await agent.run_agent(
-            session_id=extension_review_dto.session_id, payload=agent_request.model_dump(mode="python")
-        )
+        use_result_cache = ReviewResultCacheService.is_enabled()
+        agent_result = None
+        if use_result_cache and request_type == "query":
+            agent_result = await cls._get_cached_agent_result(agent, user_agent_dto, context_service)
+        if agent_result is None:
+            agent_result = await agent.run_agent(
+                session_id=extension_review_dto.session_id, payload=agent_request.model_dump(mode="python")
+            )
+            if use_result_cache and agent.saved_comments is not None:
+                await cls._cache_agent_result(agent, user_agent_dto, context_service)
 
         if request_type == "query":
             meta_info = {
@@ -87,6 +105,52 @@ class IdeReviewManager:
 
         return cls.format_agent_response(agent_result, agent_id)
 
+    @classmethod
+    async def _get_result_cache_key(
+        cls, agent: BaseCommenterAgent, user_agent_dto: UserAgentDTO, context_service: IdeReviewContextService
+    ) -> Optional[Tuple[str, str]]:
+        try:
+            diff_context = await context_service.get_diff_context()
+        except ValueError as ex:
+            AppLogger.log_warn(f"Review result cache skipped for review_id={context_service.review_id}: {ex}")
+            return None
+        return diff_context.diff_hash, ReviewResultCacheService.agent_fingerprint(agent, user_agent_dto)
+
+    @classmethod
+    async def _get_cached_agent_result(
+        cls, agent: BaseCommenterAgent, user_agent_dto: UserAgentDTO, context_service: IdeReviewContextService
+    ) -> Optional[AgentRunResult]:
+        """Save the cached comments of the agent for an unchanged diff to this review, without running the agent."""
+        cache_key = await cls._get_result_cache_key(agent, user_agent_dto, context_service)
+        if cache_key is None:
+            return None
+        comments = await ReviewResultCacheService.get_comments(*cache_key, review_id=context_service.review_id)
+        if comments is None:
+            return None
+
+        if comments:
+            await IdeCommentRepository.insert_comments(comments)
+        AppLogger.log_info(
+            f"Reused {len(comments)} cached comments of agent {agent.agent_id} for review_id={context_service.review_id}"
+        )
+        return AgentRunResult(
+            agent_result={"status": "success", "message": "Review completed successfully"},
+            prompt_tokens_exceeded=False,
+            agent_name=agent.agent_name,
+            agent_type=agent.agent_type,
+            model=agent.model,
+            tokens_data={},
+            display_name=agent.get_display_name(),
+        )
+
+    @classmethod
+    async def _cache_agent_result(
+        cls, agent: BaseCommenterAgent, user_agent_dto: UserAgentDTO, context_service: IdeReviewContextService
+    ) -> None:
+        cache_key = await cls._get_result_cache_key(agent, user_agent_dto, context_service)
+        if cache_key is not None:
+            await ReviewResultCacheService.set_comments(*cache_key, comments=agent.saved_comments)
+
     @classmethod
     def format_agent_response(cls, agent_result: AgentRunResult, agent_id: int) -> Optional[Dict[str, Any]]:
         """Format agent result for API response with single response block."""
@@ -1,11 +1,17 @@
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from deputydev_core.utils.app_logger import AppLogger
 
 from app.main.blueprints.deputy_dev.models.dto.user_agent_dto import UserAgentDTO
 from app.main.blueprints.deputy_dev.services.code_review.common.agents.dataclasses.main import AgentTypes
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.base_websocket_manager import BaseWebSocketManager
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service import (
+    IdeReviewContextService,
+)
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context import (
+    ReviewDiffContext,
+)
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.main import (
     AgentRequestItem,
     AgentTaskResult,
@@ -27,9 +33,18 @@ class MultiAgentWebSocketManager(BaseWebSocketManager):
         self.review_id = review_id
         self.is_local = is_local
         self.connection_id_gone = False
+        self.diff_context: Optional[ReviewDiffContext] = None
 
         super().__init__(connection_id, is_local)
 
+    async def load_diff_context(self) -> None:
+        """Resolve the diff context of the review once, to be shared by all agents of the request."""
+        try:
+            self.diff_context = await IdeReviewContextService(review_id=self.review_id).get_diff_context()
+        except Exception as e:  # noqa: BLE001
+            # agents resolve it on their own (and report the failure) if it can not be shared
+            AppLogger.log_error(f"Error loading diff context for review {self.review_id}: {e}")
+
     async def execute_agent_task(self, agent_request: AgentRequestItem) -> AgentTaskResult:
         """
         Execute a single agent task using ExtensionReviewManager.review_diff.
@@ -41,7 +56,7 @@ class MultiAgentWebSocketManager(BaseWebSocketManager):
             AgentTaskResult: Result of agent execution
         """
         try:
-            formatted_result = await IdeReviewManager.review_diff(agent_request)
+            formatted_result = await IdeReviewManager.review_diff(agent_request, diff_context=self.diff_context)
             return WebSocketMessage(**formatted_result)
 
         except Exception as e:  # noqa: BLE001
@@ -86,6 +101,7 @@ class MultiAgentWebSocketManager(BaseWebSocketManager):
         """
         async with self.progress_context(local_testing_stream_buffer):
             try:
+                await self.load_diff_context()
                 if len(agents) == 1:
                     await self.execute_and_stream_agent(agents[0], local_testing_stream_buffer)
                 else:
@@ -98,8 +114,7 @@ class MultiAgentWebSocketManager(BaseWebSocketManager):
                     local_testing_stream_buffer,
                 )
             finally:
-                if self.aws_client:
-                    await self.aws_client.close()
+                await self.cleanup()
 
     async def process_multiple_agents_with_cache_pattern(
         self, agents: List[AgentRequestItem], local_testing_stream_buffer: Dict[str, List[str]]
@@ -1,6 +1,7 @@
 from typing import Any, Dict, List
 
 from deputydev_core.llm_handler.dataclasses.main import PromptCacheConfig
+from tortoise.transactions import in_transaction
 
 from app.backend_common.services.llm.llm_service_manager import LLMServiceManager
 from app.main.blueprints.deputy_dev.models.dto.ide_reviews_comment_dto import IdeReviewsCommentDTO
@@ -30,7 +31,13 @@ class IdeReviewPostProcessor:
     async def post_process_pr(cls, data: Dict[str, Any], user_team_id: int) -> Dict[str, Any]:
         review_id = data.get("review_id")
         review = await ExtensionReviewsRepository.db_get(filters={"id": review_id}, fetch_one=True)
-        comments = await IdeCommentRepository.get_review_comments(review_id)
+        # comments carried forward by an incremental review were blended by the review they come from
+        carried_comment_ids = set(((review.meta_info or {}).get("incremental") or {}).get("carried_comment_ids", []))
+        comments = [
+            comment
+            for comment in await IdeCommentRepository.get_review_comments(review_id)
+            if comment.id not in carried_comment_ids
+        ]
         formatted_comments = cls.format_comments(comments)
         context_service = IdeReviewContextService(review_id=review_id)
         user_agents = await UserAgentRepository.db_get({"user_team_id": user_team_id})
@@ -49,7 +56,6 @@ class IdeReviewPostProcessor:
         filtered_comments, agent_results, review_title = await comment_blending_service.blend_comments()
         valid_comment_ids = set([comment.id for comment in filtered_comments if comment.id and comment.is_valid])
         invalid_comment_ids = [comment.id for comment in comments if comment.id not in valid_comment_ids]
-        await IdeCommentRepository.update_comments(invalid_comment_ids, {"is_valid": False})
         comments_to_insert = []
         for comment in filtered_comments:
             # blended comment
@@ -69,9 +75,12 @@ class IdeReviewPostProcessor:
                     agents=[UserAgentDTO(id=agent.agent_id) for agent in comment.buckets],
                 )
                 comments_to_insert.append(blended_comment)
-        await IdeCommentRepository.insert_comments(comments_to_insert)
         review_data = {"review_status": "Completed", "title": review_title}
-        await ExtensionReviewsRepository.update_review(review_id, review_data)
+        # the review is only completed along with the outcome of blending
+        async with in_transaction():
+            await IdeCommentRepository.update_comments(invalid_comment_ids, {"is_valid": False})
+            await IdeCommentRepository.insert_comments(comments_to_insert)
+            await ExtensionReviewsRepository.update_review(review_id, review_data)
         return {"status": "Completed"}
 
     @classmethod
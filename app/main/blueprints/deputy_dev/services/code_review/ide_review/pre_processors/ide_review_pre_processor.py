@@ -1,8 +1,7 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from deputydev_core.utils.constants.enums import Clients
 
-from app.backend_common.caches.ide_review_cache import IdeReviewCache
 from app.backend_common.models.dto.message_sessions_dto import MessageSessionData
 from app.backend_common.repository.chat_attachments.repository import ChatAttachmentsRepository
 from app.backend_common.repository.message_sessions.repository import (
@@ -14,6 +13,7 @@ from app.backend_common.repository.user_teams.user_team_repository import (
 )
 from app.backend_common.services.chat_file_upload.chat_file_upload import ChatFileUpload
 from app.backend_common.services.chat_file_upload.dataclasses.chat_file_upload import ChatAttachmentDataWithObjectBytes
+from app.backend_common.utils.diff_index import DiffIndex
 from app.main.blueprints.deputy_dev.constants.constants import (
     MAX_PR_DIFF_TOKEN_LIMIT,
     IdeReviewStatusTypes,
@@ -24,7 +24,13 @@ from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.ma
     GetRepoIdRequest,
     ReviewRequest,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.diff_blob_store import DiffBlobStore
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.incremental_review_planner import (
+    IncrementalReviewPlan,
+    IncrementalReviewPlanner,
+)
 from app.main.blueprints.deputy_dev.services.repository.extension_reviews.repository import ExtensionReviewsRepository
+from app.main.blueprints.deputy_dev.services.repository.ide_reviews_comments.repository import IdeCommentRepository
 
 
 class IdeReviewPreProcessor:
@@ -34,6 +40,7 @@ class IdeReviewPreProcessor:
         self.review_dto = None
         self.review_status = IdeReviewStatusTypes.IN_PROGRESS.value
         self.is_valid = True
+        self.incremental_plan: Optional[IncrementalReviewPlan] = None
 
     async def _get_attachment_data_and_metadata(
         self,
@@ -73,16 +80,25 @@ class IdeReviewPreProcessor:
 
         reviewed_files = [file.file_path for file in review_request.file_wise_diff]
 
-        diff_handler = IdeDiffHandler(review_diff)
-        loc = diff_handler.get_diff_loc()
-        token_count = diff_handler.get_diff_token_count()
-
         user_team = await UserTeamRepository.db_get(filters={"id": user_team_id}, fetch_one=True)
 
         self.extension_repo_dto = await RepoRepository.find_or_create_extension_repo(
             repo_name=review_request.repo_name, repo_origin=review_request.origin_url, team_id=user_team.team_id
         )
 
+        # with incremental review, agents only get the hunks changed since the last review of the branch
+        diff_index = None
+        if review_diff and IncrementalReviewPlanner.is_enabled():
+            diff_index = DiffIndex(review_diff)
+            self.incremental_plan = await IncrementalReviewPlanner.plan(
+                self.extension_repo_dto.id, user_team_id, review_request, diff_index
+            )
+        agent_diff = self.incremental_plan.diff if self.incremental_plan else review_diff
+
+        diff_handler = IdeDiffHandler(agent_diff)
+        loc = diff_handler.get_diff_loc()
+        token_count = diff_handler.get_diff_token_count()
+
         session = await MessageSessionsRepository.create_message_session(
             message_session_data=MessageSessionData(
                 user_team_id=user_team_id,
@@ -93,7 +109,14 @@ class IdeReviewPreProcessor:
         )
         self.session_id = session.id
 
-        await self.run_validation(review_diff, token_count)
+        await self.run_validation(agent_diff, token_count)
+
+        # large diffs are uploaded to S3 before the review is created, so that it records where they live
+        stored_diff = await DiffBlobStore.compress(agent_diff) if self.is_valid else None
+
+        meta_info = {"tokens": token_count}
+        if self.incremental_plan:
+            meta_info["incremental"] = IncrementalReviewPlanner.meta_info(self.incremental_plan)
 
         review_dto = IdeReviewDTO(
             review_status=self.review_status,
@@ -101,9 +124,9 @@ class IdeReviewPreProcessor:
             user_team_id=user_team_id,
             loc=loc,
             reviewed_files=reviewed_files,
-            diff_s3_url="testing",
+            diff_s3_url=stored_diff.s3_key if stored_diff else None,
             session_id=self.session_id,
-            meta_info={"tokens": token_count},
+            meta_info=meta_info,
             source_branch=review_request.source_branch,
             target_branch=review_request.target_branch,
             source_commit=review_request.source_commit,
@@ -113,7 +136,11 @@ class IdeReviewPreProcessor:
         self.review_dto = await ExtensionReviewsRepository.db_insert(review_dto)
 
         if self.is_valid:
-            await IdeReviewCache.set(key=str(self.review_dto.id), value=review_diff)
+            await DiffBlobStore.set(key=str(self.review_dto.id), value=stored_diff)
+            if diff_index is not None:
+                await IncrementalReviewPlanner.save_snapshot(self.review_dto.id, diff_index)
+            if self.incremental_plan:
+                await self.carry_forward_comments(meta_info)
 
         return {
             "review_id": self.review_dto.id,
@@ -121,6 +148,18 @@ class IdeReviewPreProcessor:
             "repo_id": self.extension_repo_dto.id,
         }
 
+    async def carry_forward_comments(self, meta_info: Dict[str, Any]) -> None:
+        """
+        Copy the open comments on unchanged hunks of the base review to this review. Their ids are kept in
+        `meta_info` so that the post processing of this review leaves them out of blending.
+        """
+        base_comments = await IdeCommentRepository.get_review_comments(self.incremental_plan.base_review_id)
+        carried_comments = self.incremental_plan.carry_forward_comments(base_comments, self.review_dto.id)
+        if not carried_comments:
+            return
+        meta_info["incremental"]["carried_comment_ids"] = await IdeCommentRepository.insert_comments(carried_comments)
+        await ExtensionReviewsRepository.update_review(self.review_dto.id, {"meta_info": meta_info})
+
     async def run_validation(self, review_diff: str, token_count: int) -> None:
         """
         Run validations on the review diff, token count, based on setting, MAX_DIFF_TOKEN_LIMIT.
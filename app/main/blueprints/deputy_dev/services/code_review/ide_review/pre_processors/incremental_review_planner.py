@@ -0,0 +1,217 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from deputydev_core.utils.app_logger import AppLogger
+from deputydev_core.utils.config_manager import ConfigManager
+from pydantic import BaseModel
+
+from app.backend_common.caches.ide_review_snapshot_cache import IdeReviewSnapshotCache
+from app.backend_common.utils.diff_index import DiffHunk, DiffIndex
+from app.main.blueprints.deputy_dev.constants.constants import IdeReviewCommentStatus
+from app.main.blueprints.deputy_dev.models.dto.ide_review_dto import IdeReviewDTO
+from app.main.blueprints.deputy_dev.models.dto.ide_reviews_comment_dto import IdeReviewsCommentDTO
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.main import ReviewRequest
+from app.main.blueprints.deputy_dev.services.repository.extension_reviews.repository import ExtensionReviewsRepository
+
+
+class HunkSnapshot(BaseModel):
+    content_hash: str
+    new_start: int
+    new_count: int
+
+
+class ReviewSnapshot(BaseModel):
+    """Hunks of the full diff of a review per file, identified by their content rather than their position."""
+
+    files: Dict[str, List[HunkSnapshot]]
+
+    @classmethod
+    def from_diff_index(cls, diff_index: DiffIndex) -> "ReviewSnapshot":
+        return cls(
+            files={
+                file_diff.path: [
+                    HunkSnapshot(
+                        content_hash=hunk_content_hash(diff_index, hunk),
+                        new_start=hunk.new_start,
+                        new_count=hunk.new_count,
+                    )
+                    for hunk in file_diff.hunks
+                ]
+                for file_diff in diff_index.files
+            }
+        )
+
+
+def hunk_content_hash(diff_index: DiffIndex, hunk: DiffHunk) -> str:
+    """Hash of the lines of a hunk, without its header, so that hunks moved by edits above them still match."""
+    hasher = hashlib.sha256()
+    for line in diff_index.iter_hunk_lines(hunk):
+        hasher.update(f"{line.kind}{line.text}\n".encode())
+    return hasher.hexdigest()
+
+
+@dataclass
+class IncrementalReviewPlan:
+    """
+    The part of a diff left to review against the snapshot of a previous review of the same changes.
+
+    `diff` holds the file headers and the changed hunks only, with their original hunk headers so that line
+    numbers still refer to the new files. `line_shifts` maps each unchanged hunk of the previous review, as
+    `(file_path, new_start, new_count)`, to its `new_start` in the current diff.
+    """
+
+    base_review_id: int
+    diff: str
+    changed_hunks: int
+    reused_hunks: int
+    line_shifts: Dict[Tuple[str, int, int], int] = field(default_factory=dict)
+
+    def carry_forward_line(self, file_path: str, line_number: int) -> Optional[int]:
+        """Line number in the current diff of a comment on an unchanged hunk, None if its hunk changed."""
+        for (shifted_path, new_start, new_count), current_start in self.line_shifts.items():
+            if shifted_path == file_path and new_start <= line_number < new_start + new_count:
+                return line_number - new_start + current_start
+        return None
+
+    def carry_forward_comments(
+        self, comments: List[IdeReviewsCommentDTO], review_id: int
+    ) -> List[IdeReviewsCommentDTO]:
+        """Copies of the still open comments of the previous review that sit on unchanged hunks."""
+        carried_comments = []
+        for comment in comments:
+            if comment.comment_status in (IdeReviewCommentStatus.REJECTED.value, IdeReviewCommentStatus.RESOLVED.value):
+                continue
+            line_number = self.carry_forward_line(comment.file_path, comment.line_number)
+            if line_number is None:
+                continue
+            carried_comments.append(
+                comment.model_copy(
+                    update={
+                        "id": None,
+                        "review_id": review_id,
+                        "line_number": line_number,
+                        "feedback": None,
+                        "created_at": None,
+                        "updated_at": None,
+                    }
+                )
+            )
+        return carried_comments
+
+
+class IncrementalReviewPlanner:
+    """
+    Limits a re-review to the hunks that changed since the last completed review of the same branches.
+
+    The last completed review with the same repo, user team, branches and review type is the base of the
+    re-review if the hunk snapshot of its full diff (see `save_snapshot`) is still cached.
+    """
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(ConfigManager.configs.get("CODE_REVIEW", {}).get("INCREMENTAL_REVIEW", {}).get("ENABLED", False))
+
+    @classmethod
+    async def get_base_review(
+        cls, repo_id: int, user_team_id: int, review_request: ReviewRequest
+    ) -> Optional[IdeReviewDTO]:
+        return await ExtensionReviewsRepository.db_get(
+            filters={
+                "repo_id": repo_id,
+                "user_team_id": user_team_id,
+                "source_branch": review_request.source_branch,
+                "target_branch": review_request.target_branch,
+                "review_type": review_request.review_type.value,
+                "review_status": "Completed",
+                "is_deleted": False,
+            },
+            fetch_one=True,
+            order_by="-id",
+        )
+
+    @classmethod
+    async def save_snapshot(cls, review_id: int, diff_index: DiffIndex) -> None:
+        try:
+            await IdeReviewSnapshotCache.set(
+                str(review_id), ReviewSnapshot.from_diff_index(diff_index).model_dump(mode="json")
+            )
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to cache diff snapshot of review_id={review_id}: {ex}")
+
+    @classmethod
+    async def get_snapshot(cls, review_id: int) -> Optional[ReviewSnapshot]:
+        try:
+            snapshot = await IdeReviewSnapshotCache.get(str(review_id))
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to read diff snapshot of review_id={review_id}: {ex}")
+            return None
+        return ReviewSnapshot.model_validate(snapshot) if snapshot else None
+
+    @classmethod
+    async def plan(
+        cls, repo_id: int, user_team_id: int, review_request: ReviewRequest, diff_index: DiffIndex
+    ) -> Optional[IncrementalReviewPlan]:
+        """
+        Plan the incremental review of `diff_index`, the full diff of `review_request`.
+
+        Returns None, meaning a full review, when there is no usable base review or when either no hunk or
+        every hunk changed since it.
+        """
+        base_review = await cls.get_base_review(repo_id, user_team_id, review_request)
+        if base_review is None:
+            return None
+        snapshot = await cls.get_snapshot(base_review.id)
+        if snapshot is None:
+            return None
+
+        plan = cls.build_plan(base_review.id, snapshot, diff_index)
+        if plan.changed_hunks == 0 or plan.reused_hunks == 0:
+            return None
+        return plan
+
+    @staticmethod
+    def build_plan(base_review_id: int, snapshot: ReviewSnapshot, diff_index: DiffIndex) -> IncrementalReviewPlan:
+        diff = diff_index.diff
+        sections: List[str] = []
+        plan = IncrementalReviewPlan(base_review_id=base_review_id, diff="", changed_hunks=0, reused_hunks=0)
+
+        for file_diff in diff_index.files:
+            previous_hunks = snapshot.files.get(file_diff.path)
+            if previous_hunks is None or not file_diff.hunks:
+                # new to the review, or a change without hunks such as a rename or a binary file
+                sections.append(diff[file_diff.start : file_diff.end])
+                plan.changed_hunks += len(file_diff.hunks) or 1
+                continue
+
+            unmatched_hunks: Dict[str, List[HunkSnapshot]] = {}
+            for previous_hunk in previous_hunks:
+                unmatched_hunks.setdefault(previous_hunk.content_hash, []).append(previous_hunk)
+
+            changed_sections: List[str] = []
+            for hunk in file_diff.hunks:
+                matches = unmatched_hunks.get(hunk_content_hash(diff_index, hunk))
+                if matches:
+                    previous_hunk = matches.pop(0)
+                    plan.line_shifts[(file_diff.path, previous_hunk.new_start, previous_hunk.new_count)] = (
+                        hunk.new_start
+                    )
+                    plan.reused_hunks += 1
+                else:
+                    changed_sections.append(diff[hunk.start : hunk.end])
+                    plan.changed_hunks += 1
+
+            if changed_sections:
+                sections.append(diff[file_diff.start : file_diff.hunks[0].start])
+                sections.extend(changed_sections)
+
+        plan.diff = "".join(sections)
+        return plan
+
+    @staticmethod
+    def meta_info(plan: IncrementalReviewPlan) -> Dict[str, Any]:
+        return {
+            "base_review_id": plan.base_review_id,
+            "changed_hunks": plan.changed_hunks,
+            "reused_hunks": plan.reused_hunks,
+        }
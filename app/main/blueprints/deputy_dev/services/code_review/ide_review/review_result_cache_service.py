@@ -0,0 +1,107 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from deputydev_core.utils.app_logger import AppLogger
+from deputydev_core.utils.config_manager import ConfigManager
+
+from app.backend_common.caches.ide_review_result_cache import IdeReviewResultCache
+from app.main.blueprints.deputy_dev.models.dto.ide_reviews_comment_dto import IdeReviewsCommentDTO
+from app.main.blueprints.deputy_dev.models.dto.user_agent_dto import UserAgentDTO
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.agents.llm_agents.commenters.base_commentor import (
+    BaseCommenterAgent,
+)
+
+
+class ReviewResultCacheService:
+    """
+    Reuses the comments of a commenter agent when the same diff is reviewed again by the same agent configuration.
+
+    Results live in `IdeReviewResultCache`, in one hash per diff (see `ReviewDiffContext.diff_hash`) holding a
+    field per agent fingerprint, so that all results of a diff can be invalidated at once. Cache failures are
+    logged and treated as misses, the review then runs the agent as usual.
+    """
+
+    CACHED_COMMENT_FIELDS = (
+        "title",
+        "comment",
+        "confidence_score",
+        "rationale",
+        "corrective_code",
+        "file_path",
+        "line_hash",
+        "line_number",
+        "tag",
+    )
+
+    @classmethod
+    def _config(cls) -> Dict[str, Any]:
+        return ConfigManager.configs.get("CODE_REVIEW", {}).get("RESULT_CACHE", {})
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return bool(cls._config().get("ENABLED", False))
+
+    @staticmethod
+    def agent_fingerprint(agent: BaseCommenterAgent, user_agent_dto: UserAgentDTO) -> str:
+        """Hash of everything besides the diff that shapes the comments of an agent."""
+        settings = {
+            "agent_id": user_agent_dto.id,
+            "agent_name": user_agent_dto.agent_name,
+            "agent_type": agent.agent_type.value,
+            "model": agent.model.value,
+            "prompt_version": agent.prompt_version,
+            "objective": user_agent_dto.objective,
+            "custom_prompt": user_agent_dto.custom_prompt,
+            "confidence_score": user_agent_dto.confidence_score,
+            "exclusions": user_agent_dto.exclusions,
+            "inclusions": user_agent_dto.inclusions,
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+    @classmethod
+    async def get_comments(
+        cls, diff_hash: str, fingerprint: str, review_id: int
+    ) -> Optional[List[IdeReviewsCommentDTO]]:
+        """Return the cached comments of the agent for the diff, bound to `review_id`, or None on a miss."""
+        try:
+            cached_comments = await IdeReviewResultCache.hget(diff_hash, fingerprint)
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to read cached review result of diff {diff_hash}: {ex}")
+            return None
+        if cached_comments is None:
+            return None
+
+        return [
+            IdeReviewsCommentDTO(
+                review_id=review_id,
+                is_valid=True,
+                agents=[UserAgentDTO(id=agent_id) for agent_id in cached_comment["agent_ids"]],
+                **{field: cached_comment[field] for field in cls.CACHED_COMMENT_FIELDS},
+            )
+            for cached_comment in cached_comments
+        ]
+
+    @classmethod
+    async def set_comments(cls, diff_hash: str, fingerprint: str, comments: List[IdeReviewsCommentDTO]) -> None:
+        cached_comments = [
+            {
+                **comment.model_dump(mode="json", include=set(cls.CACHED_COMMENT_FIELDS)),
+                "agent_ids": [agent.id for agent in comment.agents or []],
+            }
+            for comment in comments
+        ]
+        try:
+            await IdeReviewResultCache.hset_with_expire(
+                diff_hash, {fingerprint: cached_comments}, expire=cls._config().get("TTL")
+            )
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to cache review result of diff {diff_hash}: {ex}")
+
+    @classmethod
+    async def invalidate(cls, diff_hash: str, fingerprints: Optional[List[str]] = None) -> None:
+        """Drop the cached results of the given agent fingerprints for the diff, or all of them."""
+        if fingerprints:
+            await IdeReviewResultCache.hdel(diff_hash, fingerprints)
+        else:
+            await IdeReviewResultCache.delete([diff_hash])
@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Union
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple, Union
 
 from deputydev_core.utils.app_logger import AppLogger
 from tortoise.query_utils import Prefetch
+from tortoise.transactions import in_transaction
 
 from app.backend_common.repository.db import DB
 from app.main.blueprints.deputy_dev.models.dao.postgres.ide_reviews_comments import IdeReviewsComments
@@ -41,29 +43,86 @@ class IdeCommentRepository:
         if comment_id and data:
             await IdeReviewsComments.filter(id=comment_id).update(**data)
 
+    # asyncpg accepts at most 32767 query arguments, 12 are bound per comment
+    INSERT_BATCH_SIZE = 1000
+
     @classmethod
-    async def insert_comments(cls, comments: List[IdeReviewsCommentDTO]) -> None:
-        agent_comment_mappings = []
-        for comment in comments:
-            comment_to_insert = IdeReviewsComments(
-                title=comment.title,
-                review_id=comment.review_id,
-                comment=comment.comment,
-                rationale=comment.rationale,
-                corrective_code=comment.corrective_code,
-                is_deleted=comment.is_deleted,
-                file_path=comment.file_path,
-                line_hash=comment.line_hash,
-                line_number=int(comment.line_number),
-                tag=comment.tag,
-                confidence_score=comment.confidence_score,
+    async def insert_comments(cls, comments: List[IdeReviewsCommentDTO]) -> List[int]:
+        """
+        Insert the comments with their agent mappings, one INSERT per batch of comments and one for all the
+        mappings, in a transaction.
+
+        The ids of the comments are reserved from their sequence up front and inserted explicitly, since
+        PostgreSQL does not guarantee that `INSERT ... RETURNING` returns rows in the order of `VALUES`.
+
+        Returns:
+            List[int]: The ids of the inserted comments, in the order of `comments`.
+        """
+        if not comments:
+            return []
+
+        async with in_transaction():
+            comment_ids = await cls._reserve_comment_ids(len(comments))
+            for batch_start in range(0, len(comments), cls.INSERT_BATCH_SIZE):
+                batch_end = batch_start + cls.INSERT_BATCH_SIZE
+                await cls._insert_comment_rows(comments[batch_start:batch_end], comment_ids[batch_start:batch_end])
+
+            agent_comment_mappings = []
+            for comment, comment_id in zip(comments, comment_ids):
+                # the same agent may be listed more than once in blended comments
+                for agent_id in dict.fromkeys(agent.id for agent in comment.agents or []):
+                    agent_comment_mappings.append(UserAgentCommentMapping(agent_id=agent_id, comment_id=comment_id))
+            if agent_comment_mappings:
+                await UserAgentCommentMapping.bulk_create(agent_comment_mappings)
+        return comment_ids
+
+    @classmethod
+    async def _reserve_comment_ids(cls, count: int) -> List[int]:
+        query = """
+            SELECT nextval(pg_get_serial_sequence('ide_reviews_comments', 'id')) AS id
+            FROM generate_series(1, $1)
+        """
+        reserved_rows = await DB.raw_sql(query, values=[count])
+        return [row["id"] for row in reserved_rows]
+
+    @classmethod
+    def _build_insert_query(cls, comments: List[IdeReviewsCommentDTO], comment_ids: List[int]) -> Tuple[str, List[Any]]:
+        # $1 is the creation time shared by all rows
+        values: List[Any] = [datetime.now(timezone.utc).replace(tzinfo=None)]
+        rows: List[str] = []
+        for comment, comment_id in zip(comments, comment_ids):
+            placeholders = ", ".join(f"${len(values) + offset}" for offset in range(1, 13))
+            rows.append(f"({placeholders}, TRUE, $1, $1)")
+            values.extend(
+                [
+                    comment_id,
+                    comment.review_id,
+                    comment.title,
+                    comment.comment,
+                    comment.rationale,
+                    comment.corrective_code,
+                    comment.is_deleted,
+                    comment.file_path,
+                    comment.line_hash,
+                    int(comment.line_number),
+                    comment.tag,
+                    float(comment.confidence_score),
+                ]
             )
-            await comment_to_insert.save()
-            for agent in comment.agents:
-                agent_comment_mappings.append(
-                    UserAgentCommentMapping(agent_id=agent.id, comment_id=comment_to_insert.id)
-                )
-        await UserAgentCommentMapping.bulk_create(agent_comment_mappings)
+
+        query = f"""
+            INSERT INTO ide_reviews_comments (
+                id, review_id, title, comment, rationale, corrective_code, is_deleted, file_path, line_hash,
+                line_number, tag, confidence_score, is_valid, created_at, updated_at
+            )
+            VALUES {", ".join(rows)}
+        """
+        return query, values
+
+    @classmethod
+    async def _insert_comment_rows(cls, comments: List[IdeReviewsCommentDTO], comment_ids: List[int]) -> None:
+        query, values = cls._build_insert_query(comments, comment_ids)
+        await DB.raw_sql(query, values=values)
 
     @classmethod
     async def db_get(
@@ -16,6 +16,7 @@ class AgentChats(Base):
         "message_type",
         "message_data",
         "metadata",
+        "tool_use_id",
         "created_at",
         "updated_at",
     }
@@ -28,6 +29,8 @@ class AgentChats(Base):
     message_type = CITextField(max_length=16, null=False)
     message_data = fields.JSONField(null=False)
     metadata = fields.JSONField(null=False)
+    # denormalized from message_data of TOOL_USE chats, so that tool responses can be matched by index
+    tool_use_id = fields.CharField(max_length=256, null=True)
 
     class Meta:
         table = "agent_chats"
@@ -35,6 +38,7 @@ class AgentChats(Base):
             ("session_id",),
             ("actor",),
             ("message_type",),
+            ("session_id", "tool_use_id"),
         )
 
     class Columns(Enum):
@@ -46,5 +50,6 @@ class AgentChats(Base):
         message_type = ("message_type",)
         message_data = ("message_data",)
         metadata = ("metadata",)
+        tool_use_id = ("tool_use_id",)
         created_at = ("created_at",)
         updated_at = ("updated_at",)
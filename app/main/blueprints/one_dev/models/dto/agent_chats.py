@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing_extensions import Annotated, Literal
 
 from app.backend_common.services.chat_file_upload.dataclasses.chat_file_upload import Attachment
@@ -116,6 +116,13 @@ class AgentChatDTO(AgentChatData):
     created_at: datetime
     updated_at: datetime
 
+    # chats read from the database have naive UTC timestamps, freshly written ones aware timestamps
+    @field_validator("created_at", "updated_at")
+    def timestamp_as_naive_utc(cls, v: datetime) -> datetime:  # noqa: N805
+        if v.tzinfo is None:
+            return v
+        return v.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 class AgentChatCreateRequest(AgentChatData):
     pass
@@ -127,3 +134,9 @@ class AgentChatUpdateRequest(BaseModel):
     message_data: Optional[MessageData] = None
     metadata: Optional[Dict[str, Any]] = None
     previous_queries: Optional[List[str]] = None
+
+
+class ToolUseResponseUpdate(BaseModel):
+    tool_use_id: str
+    tool_response: Dict[str, Any]
+    tool_status: ToolStatus
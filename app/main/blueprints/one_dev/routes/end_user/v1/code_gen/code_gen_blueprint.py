@@ -1,13 +1,14 @@
 from typing import Any
 
 from sanic import Blueprint
-from sanic.response import JSONResponse
+from sanic.response import HTTPResponse, JSONResponse, raw
 
 from app.backend_common.utils.authenticate import authenticate
 from app.backend_common.utils.dataclasses.main import AuthData, ClientData
 from app.backend_common.utils.sanic_wrapper import Request, send_response
 from app.backend_common.utils.sanic_wrapper.response import ResponseDict
 from app.main.blueprints.one_dev.services.embedding.dataclasses.main import (
+    EmbeddingResponseFormat,
     OneDevEmbeddingPayload,
 )
 from app.main.blueprints.one_dev.services.embedding.manager import (
@@ -43,7 +44,15 @@ async def get_job_status(
 @code_gen_v1_bp.route("/create-embedding", methods=["POST"])
 @validate_client_version
 # @authenticate
-async def get_embeddings(_request: Request, client_data: ClientData, **kwargs: Any) -> ResponseDict | JSONResponse:
-    payload = _request.custom_json()
-    response = await OneDevEmbeddingManager.create_embeddings(payload=OneDevEmbeddingPayload(**payload))
+async def get_embeddings(
+    _request: Request, client_data: ClientData, **kwargs: Any
+) -> ResponseDict | JSONResponse | HTTPResponse:
+    payload = OneDevEmbeddingPayload(**_request.custom_json())
+    response = await OneDevEmbeddingManager.create_embeddings(payload=payload)
+    if payload.response_format == EmbeddingResponseFormat.BINARY:
+        return raw(
+            response["embeddings"],
+            content_type="application/octet-stream",
+            headers={**(kwargs.get("response_headers") or {}), "X-Tokens-Used": str(response["tokens_used"])},
+        )
     return send_response(response, headers=kwargs.get("response_headers"))
@@ -26,6 +26,7 @@ from app.main.blueprints.one_dev.utils.client.client_validator import (
     validate_client_version,
 )
 from app.main.blueprints.one_dev.utils.session import ensure_session_id
+from app.main.blueprints.one_dev.utils.session_validation_cache import SessionValidationCache
 
 history_v1_bp = Blueprint("history_v1_bp", url_prefix="/history")
 
@@ -121,6 +122,7 @@ async def delete_session(
         await MessageSessionsRepository.soft_delete_message_session_by_id(
             session_id=session_id, user_team_id=auth_data.user_team_id
         )
+        SessionValidationCache.invalidate(session_id)
         await ExtensionSessionsRepository.soft_delete_extension_session_by_id(
             session_id=session_id, user_team_id=auth_data.user_team_id
         )
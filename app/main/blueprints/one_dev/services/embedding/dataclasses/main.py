@@ -1,8 +1,25 @@
+from enum import Enum
 from typing import List
 
 from pydantic import BaseModel
 
 
+class EmbeddingResponseFormat(Enum):
+    # nested lists of floats
+    JSON = "JSON"
+    # packed embeddings, base64 encoded inside the JSON response
+    BASE64 = "BASE64"
+    # packed embeddings as the raw application/octet-stream body
+    BINARY = "BINARY"
+
+
+class EmbeddingDtype(Enum):
+    FLOAT32 = "float32"
+    FLOAT16 = "float16"
+
+
 class OneDevEmbeddingPayload(BaseModel):
     texts: List[str]
     store_embeddings: bool
+    response_format: EmbeddingResponseFormat = EmbeddingResponseFormat.JSON
+    dtype: EmbeddingDtype = EmbeddingDtype.FLOAT32
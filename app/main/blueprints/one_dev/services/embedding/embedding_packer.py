@@ -0,0 +1,44 @@
+import struct
+from typing import List, Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from app.main.blueprints.one_dev.services.embedding.dataclasses.main import EmbeddingDtype
+
+
+class EmbeddingPacker:
+    """
+    Packs embeddings into a compact binary format: a 12 byte header of three little-endian uint32, the item size
+    in bytes (4 for float32, 2 for float16), the number of embeddings and their dimensions, followed by the
+    embeddings as row-major little-endian floats of that size.
+
+    Example:
+        ```python
+        packed = EmbeddingPacker.pack([np.ones(3), np.zeros(3)], EmbeddingDtype.FLOAT16)
+        EmbeddingPacker.unpack(packed)  # array([[1., 1., 1.], [0., 0., 0.]], dtype=float16)
+        ```
+    """
+
+    HEADER = struct.Struct("<III")
+
+    DTYPES = {
+        EmbeddingDtype.FLOAT32: np.dtype("<f4"),
+        EmbeddingDtype.FLOAT16: np.dtype("<f2"),
+    }
+
+    @classmethod
+    def pack(cls, embeddings: Sequence[NDArray[np.floating]], dtype: EmbeddingDtype) -> bytes:
+        numpy_dtype = cls.DTYPES[dtype]
+        matrix = np.asarray(embeddings, dtype=numpy_dtype) if len(embeddings) else np.empty((0, 0), numpy_dtype)
+        return cls.HEADER.pack(numpy_dtype.itemsize, *matrix.shape) + matrix.tobytes()
+
+    @classmethod
+    def unpack(cls, data: bytes) -> NDArray[np.floating]:
+        item_size, rows, dimensions = cls.HEADER.unpack_from(data)
+        numpy_dtype = next(numpy_dtype for numpy_dtype in cls.DTYPES.values() if numpy_dtype.itemsize == item_size)
+        return np.frombuffer(data, dtype=numpy_dtype, offset=cls.HEADER.size).reshape(rows, dimensions)
+
+    @classmethod
+    def shape(cls, embeddings: Sequence[NDArray[np.floating]]) -> List[int]:
+        return [len(embeddings), len(embeddings[0]) if len(embeddings) else 0]
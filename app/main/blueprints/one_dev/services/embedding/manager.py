@@ -1,17 +1,35 @@
-from typing import List
+import base64
+from typing import Any, Dict
 
 from app.backend_common.services.embedding.openai_embedding_manager import (
     OpenAIEmbeddingManager,
 )
 from app.main.blueprints.one_dev.services.embedding.dataclasses.main import (
+    EmbeddingResponseFormat,
     OneDevEmbeddingPayload,
 )
+from app.main.blueprints.one_dev.services.embedding.embedding_packer import EmbeddingPacker
 
 
 class OneDevEmbeddingManager:
     @classmethod
-    async def create_embeddings(cls, payload: OneDevEmbeddingPayload) -> List[List[float]]:
+    async def create_embeddings(cls, payload: OneDevEmbeddingPayload) -> Dict[str, Any]:
+        """
+        Embed the texts of the payload, in the response format the client asked for. For the BINARY format,
+        `embeddings` holds the packed bytes, to be sent as the raw response body.
+        """
         embeddings, tokens_used = await OpenAIEmbeddingManager.embed_text_array(
             texts=payload.texts, store_embeddings=payload.store_embeddings
         )
-        return {"embeddings": [embedding.tolist() for embedding in embeddings], "tokens_used": tokens_used}
+        if payload.response_format == EmbeddingResponseFormat.JSON:
+            return {"embeddings": [embedding.tolist() for embedding in embeddings], "tokens_used": tokens_used}
+
+        packed_embeddings = EmbeddingPacker.pack(embeddings, payload.dtype)
+        if payload.response_format == EmbeddingResponseFormat.BINARY:
+            return {"embeddings": packed_embeddings, "tokens_used": tokens_used}
+        return {
+            "embeddings": base64.b64encode(packed_embeddings).decode("utf-8"),
+            "dtype": payload.dtype.value,
+            "shape": EmbeddingPacker.shape(embeddings),
+            "tokens_used": tokens_used,
+        }
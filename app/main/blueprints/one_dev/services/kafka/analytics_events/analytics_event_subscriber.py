@@ -1,4 +1,6 @@
-from typing import Any, Dict, Optional
+from collections.abc import Hashable
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 from deputydev_core.utils.app_logger import AppLogger
 
@@ -16,8 +18,16 @@ from ..base_kafka_subscriber import BaseKafkaSubscriber
 
 
 class AnalyticsEventSubscriber(BaseKafkaSubscriber):
+    COMMENT_EVENT_TYPES = (EventTypes.COMMENT_BOX_VIEW, EventTypes.FIX_WITH_DD)
+
     def __init__(self, config: Dict[str, Any]) -> None:
-        super().__init__(config, config["KAFKA"]["SESSION_QUEUE"]["NAME"])
+        super().__init__(
+            config, config["KAFKA"]["SESSION_QUEUE"]["NAME"], queue_config=config["KAFKA"]["SESSION_QUEUE"]
+        )
+
+    def _get_message_key(self, message: Any) -> Optional[Hashable]:
+        """Events of a session are processed in order."""
+        return message.value.get("session_id") if message.value else None
 
     async def _get_analytics_event_data_from_message(self, message: Dict[str, Any]) -> Optional[AnalyticsEventsData]:
         """Extract and return AnalyticsEventsData from the message."""
@@ -32,7 +42,7 @@ class AnalyticsEventSubscriber(BaseKafkaSubscriber):
                     return None
 
             user_team_id = None
-            if analytics_event_message.event_type in [EventTypes.COMMENT_BOX_VIEW, EventTypes.FIX_WITH_DD]:
+            if analytics_event_message.event_type in self.COMMENT_EVENT_TYPES:
                 comment_id = analytics_event_message.event_data.get("comment_id")
                 if not comment_id:
                     raise ValueError(f"comment_id is required for event_type '{analytics_event_message.event_type}'")
@@ -69,6 +79,127 @@ class AnalyticsEventSubscriber(BaseKafkaSubscriber):
             )
             return
 
+    async def _process_messages(self, messages: List[Any]) -> None:
+        """
+        Store the events of a batch of messages with one dedupe query, one lookup per kind of owner and one insert.
+        """
+        analytics_event_messages = self._parse_messages(messages)
+        analytics_event_messages = await self._drop_duplicate_events(analytics_event_messages)
+        comment_user_team_ids = await self.get_user_team_ids_from_comment_ids(
+            [
+                comment_id
+                for analytics_event_message in analytics_event_messages
+                if (comment_id := self._get_comment_id(analytics_event_message)) is not None
+            ]
+        )
+        session_user_team_ids = await self.get_user_team_ids_from_session_ids(
+            [
+                analytics_event_message.session_id
+                for analytics_event_message in analytics_event_messages
+                if analytics_event_message.event_type not in self.COMMENT_EVENT_TYPES
+                and analytics_event_message.session_id is not None
+            ]
+        )
+
+        analytics_events_data = []
+        for analytics_event_message in analytics_event_messages:
+            if analytics_event_message.event_type in self.COMMENT_EVENT_TYPES:
+                comment_id = self._get_comment_id(analytics_event_message)
+                user_team_id = comment_user_team_ids.get(comment_id)
+                owner = f"comment_id {comment_id}"
+            else:
+                user_team_id = session_user_team_ids.get(analytics_event_message.session_id)
+                owner = f"session_id {analytics_event_message.session_id}"
+            if not user_team_id:
+                AppLogger.log_error(
+                    f"Could not determine user_team_id from {owner}. Message: {analytics_event_message.model_dump()}"
+                )
+                continue
+            try:
+                analytics_events_data.append(
+                    AnalyticsEventsData(**analytics_event_message.model_dump(mode="json"), user_team_id=user_team_id)
+                )
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(
+                    f"Error processing analytics event message from Kafka: {str(ex)}. "
+                    f"Message: {analytics_event_message.model_dump()}"
+                )
+
+        await AnalyticsEventsRepository.save_analytics_events(analytics_events_data)
+
+    def _parse_messages(self, messages: List[Any]) -> List[KafkaAnalyticsEventMessage]:
+        analytics_event_messages = []
+        for message in messages:
+            try:
+                analytics_event_messages.append(KafkaAnalyticsEventMessage(**message.value))
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(
+                    f"Error processing analytics event message from Kafka: {str(ex)}. Message: {str(message.value)}"
+                )
+        return analytics_event_messages
+
+    async def _drop_duplicate_events(
+        self, analytics_event_messages: List[KafkaAnalyticsEventMessage]
+    ) -> List[KafkaAnalyticsEventMessage]:
+        """Drop the events already stored, or seen earlier in the same batch, by their event_id."""
+        event_ids = {
+            analytics_event_message.event_id: self._normalize_event_id(analytics_event_message.event_id)
+            for analytics_event_message in analytics_event_messages
+            if analytics_event_message.event_id
+        }
+        seen_event_ids = await AnalyticsEventsRepository.get_existing_event_ids(
+            [event_id for event_id in event_ids.values() if event_id]
+        )
+
+        unique_messages = []
+        for analytics_event_message in analytics_event_messages:
+            event_id = event_ids.get(analytics_event_message.event_id)
+            if event_id in seen_event_ids:
+                AppLogger.log_warn(f"Duplicate event with ID '{analytics_event_message.event_id}' received. Skipping.")
+                continue
+            if event_id:
+                seen_event_ids.add(event_id)
+            unique_messages.append(analytics_event_message)
+        return unique_messages
+
+    @staticmethod
+    def _normalize_event_id(event_id: str) -> Optional[str]:
+        try:
+            return str(UUID(event_id))
+        except ValueError:
+            return None
+
+    @classmethod
+    def _get_comment_id(cls, analytics_event_message: KafkaAnalyticsEventMessage) -> Optional[int]:
+        if analytics_event_message.event_type not in cls.COMMENT_EVENT_TYPES:
+            return None
+        try:
+            return int(analytics_event_message.event_data.get("comment_id"))
+        except (TypeError, ValueError):
+            return None
+
+    async def get_user_team_ids_from_comment_ids(self, comment_ids: List[int]) -> Dict[int, int]:
+        """Map comment ids to the user_team_id of their review, with one query for comments and one for reviews."""
+        if not comment_ids:
+            return {}
+        comments = await IdeCommentRepository.db_get(filters={"id__in": comment_ids, "is_deleted": False}) or []
+        reviews = (
+            await ExtensionReviewsRepository.db_get(
+                filters={"id__in": list({comment.review_id for comment in comments}), "is_deleted": False}
+            )
+            or []
+        )
+        review_user_team_ids = {review.id: review.user_team_id for review in reviews}
+        return {
+            comment.id: review_user_team_ids[comment.review_id]
+            for comment in comments
+            if comment.review_id in review_user_team_ids
+        }
+
+    async def get_user_team_ids_from_session_ids(self, session_ids: List[int]) -> Dict[int, int]:
+        message_sessions = await MessageSessionsRepository.get_by_ids(list(set(session_ids)))
+        return {message_session.id: message_session.user_team_id for message_session in message_sessions}
+
     async def get_user_team_id_from_comment_id(self, comment_id: int) -> Optional[int]:
         """
         Get user_team_id by fetching comment details and then review details.
@@ -1,14 +1,17 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from collections.abc import Hashable
+from typing import Any, Dict, List, Optional, Set
 
-from aiokafka import AIOKafkaConsumer
-from git import Optional
+from aiokafka import AIOKafkaConsumer, ConsumerRebalanceListener
+from aiokafka.structs import TopicPartition
 from sanic.log import logger
 from ujson import loads
 
 from app.backend_common.repository.failed_operations.repository import (
     FailedOperationsRepository,
 )
+from app.main.blueprints.one_dev.services.kafka.concurrent_message_processor import ConcurrentMessageProcessor
 
 
 def safe_json_deserializer(x: bytes) -> Optional[Dict[str, Any]]:
@@ -19,43 +22,187 @@ def safe_json_deserializer(x: bytes) -> Optional[Dict[str, Any]]:
         return None
 
 
+class CommitOnRevokeListener(ConsumerRebalanceListener):
+    """
+    Commits the processed offsets of the partitions revoked by a rebalance and drops their state from the processor,
+    so that later commits only carry partitions still assigned to the consumer.
+    """
+
+    def __init__(self, subscriber: "BaseKafkaSubscriber", processor: ConcurrentMessageProcessor) -> None:
+        self.subscriber = subscriber
+        self.processor = processor
+
+    async def on_partitions_revoked(self, revoked: Set[TopicPartition]) -> None:
+        await self.subscriber._commit_processed(self.processor, partitions=revoked)
+        self.processor.forget_partitions(revoked)
+
+    async def on_partitions_assigned(self, assigned: Set[TopicPartition]) -> None:
+        return None
+
+
 class BaseKafkaSubscriber(ABC):
-    def __init__(self, config: Dict[str, Any], topic_name: str) -> None:
+    """
+    Consumes a Kafka topic one message at a time, in batches or concurrently, as set in the `BATCH` and
+    `CONCURRENCY` sections of `queue_config`.
+
+    In batch mode, messages are fetched with `getmany` up to `MAX_RECORDS` at a time, waiting at most `LINGER_MS`
+    for them, and handed to `_process_messages` at once. Offsets are committed only after a batch has been
+    processed.
+
+    In concurrent mode, up to `MAX_IN_FLIGHT` messages per partition are processed at once, messages with the same
+    `_get_message_key` in order. Every `COMMIT_INTERVAL_MS`, offsets are committed up to the oldest message still
+    in flight of each partition. Partitions revoked by a rebalance get a last commit and are then dropped.
+    """
+
+    DEFAULT_BATCH_MAX_RECORDS = 500
+
+    DEFAULT_BATCH_LINGER_MS = 1000
+
+    DEFAULT_MAX_IN_FLIGHT = 16
+
+    DEFAULT_COMMIT_INTERVAL_MS = 1000
+
+    def __init__(self, config: Dict[str, Any], topic_name: str, queue_config: Optional[Dict[str, Any]] = None) -> None:
         self.config = config
         self.topic_name = topic_name
+        queue_config = queue_config or {}
+        batch_config = queue_config.get("BATCH", {})
+        self.batch_enabled = batch_config.get("ENABLED", False)
+        self.batch_max_records = batch_config.get("MAX_RECORDS", self.DEFAULT_BATCH_MAX_RECORDS)
+        self.batch_linger_ms = batch_config.get("LINGER_MS", self.DEFAULT_BATCH_LINGER_MS)
+        concurrency_config = queue_config.get("CONCURRENCY", {})
+        self.concurrency_enabled = not self.batch_enabled and concurrency_config.get("ENABLED", False)
+        self.max_in_flight = concurrency_config.get("MAX_IN_FLIGHT", self.DEFAULT_MAX_IN_FLIGHT)
+        self.commit_interval_ms = concurrency_config.get("COMMIT_INTERVAL_MS", self.DEFAULT_COMMIT_INTERVAL_MS)
         kafka_config = config.get("KAFKA", {})
         self.consumer = AIOKafkaConsumer(
-            topic_name,
             bootstrap_servers=kafka_config.get("HOST"),
             group_id=kafka_config.get("GROUP_ID"),
             value_deserializer=safe_json_deserializer,
+            enable_auto_commit=not (self.batch_enabled or self.concurrency_enabled),
         )
 
     async def consume(self) -> None:
         """Start consuming messages from Kafka."""
         try:
             logger.info("Starting kafka consumer")
+            processor = None
+            if self.concurrency_enabled:
+                processor = ConcurrentMessageProcessor(
+                    self._handle_message, self.max_in_flight, key_func=self._get_message_key
+                )
+                self.consumer.subscribe([self.topic_name], listener=CommitOnRevokeListener(self, processor))
+            else:
+                self.consumer.subscribe([self.topic_name])
             await self.consumer.start()
             logger.info("Kafka consumer started")
-            async for message in self.consumer:
-                # Skip messages that failed to deserialize
-                if message.value is None:
-                    logger.error(
-                        f"Skipping message at offset {message.offset} on topic {self.topic_name}: failed to deserialize"
-                    )
-                    continue
-                try:
-                    logger.info("kafka message", message.value)
-                    await self._process_message(message)
-                except Exception as e:  # noqa: BLE001
-                    logger.error(f"Error processing message: {str(e)}")
-                    dlq_payload = {"data": message.value, "type": message.value["event"]}
-                    await FailedOperationsRepository.db_insert(dlq_payload)
+            if self.batch_enabled:
+                await self._consume_batches()
+            elif processor is not None:
+                await self._consume_concurrently(processor)
+            else:
+                async for message in self.consumer:
+                    await self._handle_message(message)
         except Exception as e:  # noqa: BLE001
             logger.error(f"Kafka consumer error: {str(e)}")
         finally:
             await self.consumer.stop()
 
+    async def _consume_batches(self) -> None:
+        while True:
+            records = await self.consumer.getmany(timeout_ms=self.batch_linger_ms, max_records=self.batch_max_records)
+            messages = [message for partition_messages in records.values() for message in partition_messages]
+            if not messages:
+                continue
+            await self._handle_batch(messages)
+            # the batch is stored, or parked in the DLQ, by now
+            await self.consumer.commit()
+
+    async def _consume_concurrently(self, processor: ConcurrentMessageProcessor) -> None:
+        commit_task = asyncio.create_task(self._commit_periodically(processor))
+        try:
+            async for message in self.consumer:
+                await processor.submit(message)
+        finally:
+            commit_task.cancel()
+            try:
+                await processor.drain()
+            finally:
+                await self._commit_processed(processor)
+
+    async def _commit_periodically(self, processor: ConcurrentMessageProcessor) -> None:
+        while True:
+            await asyncio.sleep(self.commit_interval_ms / 1000)
+            await self._commit_processed(processor)
+
+    async def _commit_processed(
+        self, processor: ConcurrentMessageProcessor, partitions: Optional[Set[TopicPartition]] = None
+    ) -> None:
+        # a commit carrying a partition not assigned to the consumer is rejected as a whole
+        assigned_partitions = self.consumer.assignment() if partitions is None else partitions
+        offsets = {
+            partition: offset
+            for partition, offset in processor.committable_offsets().items()
+            if partition in assigned_partitions
+        }
+        if not offsets:
+            return
+        try:
+            await self.consumer.commit(offsets)
+            processor.mark_committed(offsets)
+        except Exception as e:  # noqa: BLE001
+            # e.g. partitions revoked by a rebalance, their messages are redelivered to the new owner
+            logger.error(f"Failed to commit offsets on topic {self.topic_name}: {str(e)}")
+
+    def _get_message_key(self, message: Any) -> Optional[Hashable]:
+        """
+        Key of the messages to process in order in concurrent mode, None for messages that can be processed in any
+        order. Subclasses can override it, e.g. to keep the events of a session in order.
+        """
+        return None
+
+    async def _handle_message(self, message: Any) -> None:
+        # Skip messages that failed to deserialize
+        if message.value is None:
+            logger.error(
+                f"Skipping message at offset {message.offset} on topic {self.topic_name}: failed to deserialize"
+            )
+            return
+        try:
+            logger.info("kafka message", message.value)
+            await self._process_message(message)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Error processing message: {str(e)}")
+            dlq_payload = {"data": message.value, "type": message.value["event"]}
+            await FailedOperationsRepository.db_insert(dlq_payload)
+
+    async def _handle_batch(self, messages: List[Any]) -> None:
+        valid_messages = []
+        for message in messages:
+            if message.value is None:
+                logger.error(
+                    f"Skipping message at offset {message.offset} on topic {self.topic_name}: failed to deserialize"
+                )
+                continue
+            valid_messages.append(message)
+        if not valid_messages:
+            return
+
+        try:
+            await self._process_messages(valid_messages)
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Error processing batch of {len(valid_messages)} messages, retrying one by one: {str(e)}")
+            for message in valid_messages:
+                await self._handle_message(message)
+
+    async def _process_messages(self, messages: List[Any]) -> None:
+        """
+        Process a batch of deserialized messages. Subclasses can override it to handle the whole batch at once,
+        if it raises, the messages of the batch are processed one by one.
+        """
+        for message in messages:
+            await self._handle_message(message)
+
     @abstractmethod
     async def _process_message(self, message: Any) -> None:
         """Abstract method to be implemented by subclasses for handling messages."""
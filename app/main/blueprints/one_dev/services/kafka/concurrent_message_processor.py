@@ -0,0 +1,115 @@
+import asyncio
+from collections.abc import Hashable
+from typing import Any, Awaitable, Callable, Collection, Dict, Optional, Set
+
+from aiokafka.structs import TopicPartition
+
+
+class ConcurrentMessageProcessor:
+    """
+    Processes the messages of a consumer concurrently, with at most `max_in_flight` of them in flight per partition.
+
+    Messages sharing a key, as returned by `key_func`, are processed one after the other in offset order, messages
+    without a key in any order. The committable offset of a partition is the offset of its oldest message still in
+    flight, so that a commit never skips a message that is not processed yet.
+
+    `handler` is expected to deal with failures of its own, e.g. by sending the message to a DLQ. If it raises,
+    the error is surfaced by the next `submit` or `drain` and offsets stop advancing past the failed message.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        max_in_flight: int,
+        key_func: Optional[Callable[[Any], Optional[Hashable]]] = None,
+    ) -> None:
+        self.handler = handler
+        self.max_in_flight = max_in_flight
+        self.key_func = key_func
+        self._semaphores: Dict[TopicPartition, asyncio.Semaphore] = {}
+        # offsets in flight per partition, in insertion order which is the offset order of the partition
+        self._in_flight: Dict[TopicPartition, Dict[int, None]] = {}
+        self._next_offsets: Dict[TopicPartition, int] = {}
+        self._committed_offsets: Dict[TopicPartition, int] = {}
+        self._key_tails: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._error: Optional[BaseException] = None
+
+    async def submit(self, message: Any) -> None:
+        """Start processing a message, waiting while its partition already has `max_in_flight` messages in flight."""
+        self._raise_error()
+        partition = TopicPartition(message.topic, message.partition)
+        semaphore = self._semaphores.setdefault(partition, asyncio.Semaphore(self.max_in_flight))
+        await semaphore.acquire()
+
+        self._in_flight.setdefault(partition, {})[message.offset] = None
+        self._next_offsets[partition] = message.offset + 1
+
+        key = self.key_func(message) if self.key_func else None
+        previous_task = self._key_tails.get(key) if key is not None else None
+        task = asyncio.create_task(self._process(message, previous_task))
+        self._tasks.add(task)
+        if key is not None:
+            self._key_tails[key] = task
+        task.add_done_callback(lambda done_task: self._on_done(done_task, partition, message.offset, key, semaphore))
+
+    async def _process(self, message: Any, previous_task: Optional[asyncio.Task]) -> None:
+        if previous_task is not None:
+            await asyncio.wait([previous_task])
+        await self.handler(message)
+
+    def _on_done(
+        self,
+        task: asyncio.Task,
+        partition: TopicPartition,
+        offset: int,
+        key: Optional[Hashable],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        self._tasks.discard(task)
+        semaphore.release()
+        if key is not None and self._key_tails.get(key) is task:
+            del self._key_tails[key]
+        error = None if task.cancelled() else task.exception()
+        if task.cancelled() or error is not None:
+            # the offset stays in flight, so that it is never committed
+            self._error = self._error or error or asyncio.CancelledError()
+            return
+        in_flight = self._in_flight.get(partition)
+        # the partition may have been revoked while the message was in flight
+        if in_flight is not None:
+            in_flight.pop(offset, None)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def committable_offsets(self) -> Dict[TopicPartition, int]:
+        """Offsets to commit per partition, for the partitions whose offset advanced since the last commit."""
+        offsets = {}
+        for partition, next_offset in self._next_offsets.items():
+            in_flight = self._in_flight.get(partition)
+            offset = next(iter(in_flight)) if in_flight else next_offset
+            if offset != self._committed_offsets.get(partition):
+                offsets[partition] = offset
+        return offsets
+
+    def mark_committed(self, offsets: Dict[TopicPartition, int]) -> None:
+        self._committed_offsets.update(offsets)
+
+    def forget_partitions(self, partitions: Collection[TopicPartition]) -> None:
+        """
+        Drop the state of partitions revoked from the consumer, so that their offsets are no longer committable.
+        Their messages still in flight run to completion, but are redelivered to the new owner of the partition.
+        """
+        for partition in partitions:
+            self._next_offsets.pop(partition, None)
+            self._in_flight.pop(partition, None)
+            self._committed_offsets.pop(partition, None)
+            self._semaphores.pop(partition, None)
+
+    async def drain(self) -> None:
+        """Wait for the messages in flight, surfacing the first failure."""
+        if self._tasks:
+            await asyncio.wait(list(self._tasks))
+        self._raise_error()
@@ -1,5 +1,5 @@
 import asyncio
-from typing import List
+from typing import List, Optional
 
 from deputydev_core.llm_handler.core.handler import LLMHandler
 from deputydev_core.utils.app_logger import AppLogger
@@ -57,9 +57,15 @@ class AgentManager:
         payload: QuerySolverInput,
         llm_handler: LLMHandler[PromptFeatures],
         previous_agent_chats: List[AgentChatDTO],
+        all_agents: Optional[List[QuerySolverAgent]] = None,
+        selection_timeout: float = 5,
     ) -> QuerySolverAgent:
-        """Get the appropriate query solver agent instance for the payload."""
-        all_agents = await self.generate_dynamic_query_solver_agents()  # this will have default agent as well
+        """
+        Get the appropriate query solver agent instance for the payload.
+        `all_agents` can be passed if already fetched, and `selection_timeout` bounds the LLM based agent selection.
+        """
+        if all_agents is None:
+            all_agents = await self.generate_dynamic_query_solver_agents()  # this will have default agent as well
         agent_instance: QuerySolverAgent
 
         if not all_agents:
@@ -78,7 +84,7 @@ class AgentManager:
                 session_id=payload.session_id,
             )
             try:
-                agent_instance = await asyncio.wait_for(agent_selector.select_agent(), timeout=5)
+                agent_instance = await asyncio.wait_for(agent_selector.select_agent(), timeout=selection_timeout)
             except asyncio.TimeoutError:
                 AppLogger.log_info("Agent selection timed out, using default query solver agent instead.")
                 agent_instance = default_agent
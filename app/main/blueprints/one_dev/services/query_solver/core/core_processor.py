@@ -1,4 +1,5 @@
 import asyncio
+from datetime import datetime, timezone
 from typing import Any, AsyncIterator, Dict, Optional
 from uuid import uuid4
 
@@ -19,6 +20,7 @@ from app.main.blueprints.one_dev.models.dto.agent_chats import (
 )
 from app.main.blueprints.one_dev.models.dto.agent_chats import MessageType as ChatMessageType
 from app.main.blueprints.one_dev.services.query_solver.agent.agent_manager import AgentManager
+from app.main.blueprints.one_dev.services.query_solver.core.preflight import Preflight
 from app.main.blueprints.one_dev.services.query_solver.dataclasses.main import (
     LLMModel,
     QuerySolverInput,
@@ -29,7 +31,7 @@ from app.main.blueprints.one_dev.services.query_solver.models.model_manager impo
 from app.main.blueprints.one_dev.services.query_solver.prompts.dataclasses.main import PromptFeatures
 from app.main.blueprints.one_dev.services.query_solver.prompts.factory import PromptFeatureFactory
 from app.main.blueprints.one_dev.services.query_solver.session.session_manager import SessionManager
-from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_handler import StreamHandler
+from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_writer import StreamWriter
 from app.main.blueprints.one_dev.services.query_solver.stream_processing.stream_processor import StreamProcessor
 from app.main.blueprints.one_dev.services.query_solver.tools.tool_response_manager import ToolResponseManager
 from app.main.blueprints.one_dev.services.repository.agent_chats.repository import AgentChatsRepository
@@ -96,44 +98,16 @@ class CoreProcessor:
         if not payload.llm_model:
             raise ValueError("LLM model is required for query solving.")
 
-        session_chats = await AgentChatsRepository.get_chats_by_session_id(session_id=payload.session_id)
-        session_chats.sort(key=lambda x: x.created_at)
-
-        agent_instance = await self.agent_manager.get_query_solver_agent_instance(
-            payload=payload, llm_handler=llm_handler, previous_agent_chats=session_chats
-        )
-
-        await self.model_manager.set_required_model(
-            llm_model=LLModels(payload.llm_model.value),
-            session_id=payload.session_id,
-            query_id=generated_query_id,
-            agent_name=agent_instance.agent_name,
-            retry_reason=payload.retry_reason,
-            user_team_id=payload.user_team_id,
-            session_type=payload.session_type,
-            reasoning=reasoning,
-        )
-
-        new_query_chat = await AgentChatsRepository.create_chat(
-            chat_data=AgentChatCreateRequest(
-                session_id=payload.session_id,
-                actor=ActorType.USER,
-                message_data=TextMessageData(
-                    text=payload.query,
-                    attachments=payload.attachments,
-                    focus_items=payload.focus_items,
-                    vscode_env=payload.vscode_env,
-                    repositories=payload.repositories,
-                    deputy_dev_rules=payload.deputy_dev_rules,
-                ),
-                message_type=ChatMessageType.TEXT,
-                metadata={
-                    "llm_model": LLModels(payload.llm_model.value).value,
-                    "agent_name": agent_instance.agent_name,
-                },
-                query_id=generated_query_id,
-                previous_queries=[],
-            )
+        model_to_use = LLModels(payload.llm_model.value)
+        preflight = Preflight(query_id=generated_query_id)
+
+        # the session is created here if needed, so that the steps below only ever find it
+        session_chats, all_agents, current_session = await preflight.gather(
+            session_chats=AgentChatsRepository.get_chats_by_session_id(session_id=payload.session_id),
+            agents=self.agent_manager.generate_dynamic_query_solver_agents(),
+            extension_session=self.model_manager.get_or_create_session(
+                payload.session_id, payload.user_team_id, payload.session_type, model_to_use
+            ),
         )
 
         _summary_task = asyncio.create_task(
@@ -147,6 +121,55 @@ class CoreProcessor:
             )
         )
 
+        agent_instance = await preflight.run(
+            "agent_selection",
+            self.agent_manager.get_query_solver_agent_instance(
+                payload=payload,
+                llm_handler=llm_handler,
+                previous_agent_chats=session_chats,
+                all_agents=all_agents,
+                selection_timeout=preflight.remaining(),
+            ),
+        )
+
+        # the model change message must precede the new query, so its time is pinned before either is written
+        model_changed_at = datetime.now(timezone.utc)
+        _, new_query_chat = await preflight.gather(
+            set_model=self.model_manager.set_required_model(
+                llm_model=model_to_use,
+                session_id=payload.session_id,
+                query_id=generated_query_id,
+                agent_name=agent_instance.agent_name,
+                retry_reason=payload.retry_reason,
+                user_team_id=payload.user_team_id,
+                session_type=payload.session_type,
+                reasoning=reasoning,
+                current_session=current_session,
+                changed_at=model_changed_at,
+            ),
+            create_query_chat=AgentChatsRepository.create_chat(
+                chat_data=AgentChatCreateRequest(
+                    session_id=payload.session_id,
+                    actor=ActorType.USER,
+                    message_data=TextMessageData(
+                        text=payload.query,
+                        attachments=payload.attachments,
+                        focus_items=payload.focus_items,
+                        vscode_env=payload.vscode_env,
+                        repositories=payload.repositories,
+                        deputy_dev_rules=payload.deputy_dev_rules,
+                    ),
+                    message_type=ChatMessageType.TEXT,
+                    metadata={
+                        "llm_model": model_to_use.value,
+                        "agent_name": agent_instance.agent_name,
+                    },
+                    query_id=generated_query_id,
+                    previous_queries=[],
+                ),
+            ),
+        )
+
         prompt_vars_to_use: Dict[str, Any] = {
             "query": payload.query,
             "focus_items": payload.focus_items,
@@ -158,10 +181,13 @@ class CoreProcessor:
             "repositories": payload.repositories,
         }
 
-        model_to_use = LLModels(payload.llm_model.value)
-        llm_inputs, previous_queries = await agent_instance.get_llm_inputs_and_previous_queries(
-            payload=payload, _client_data=client_data, llm_model=model_to_use, new_query_chat=new_query_chat
+        llm_inputs, previous_queries = await preflight.run(
+            "llm_inputs",
+            agent_instance.get_llm_inputs_and_previous_queries(
+                payload=payload, _client_data=client_data, llm_model=model_to_use, new_query_chat=new_query_chat
+            ),
         )
+        preflight.log_timings()
 
         prompt_vars_to_use = {**prompt_vars_to_use, **llm_inputs.extra_prompt_vars}
 
@@ -205,13 +231,8 @@ class CoreProcessor:
         task_checker: Optional[CancellationChecker],
     ) -> AsyncIterator[BaseModel]:
         """Handle tool response processing."""
-        inserted_tool_responses = await asyncio.gather(
-            *[
-                self.tool_response_manager.store_tool_response_in_chat_chain(
-                    tool_resp, payload.session_id, payload.vscode_env, payload.focus_items
-                )
-                for tool_resp in payload.batch_tool_responses
-            ]
+        inserted_tool_responses = await self.tool_response_manager.store_tool_responses_in_chat_chain(
+            payload.batch_tool_responses, payload.session_id, payload.vscode_env, payload.focus_items
         )
 
         prompt_vars: Dict[str, Any] = {
@@ -287,10 +308,11 @@ class CoreProcessor:
         from deputydev_core.exceptions.exceptions import InputTokenLimitExceededError
         from deputydev_core.exceptions.llm_exceptions import LLMThrottledError
 
+        stream_writer = StreamWriter(stream_id=query_id)
         try:
             # Push stream initialization event first
             init_event = self.event_manager.create_stream_start_event()
-            await StreamHandler.push_to_stream(stream_id=query_id, data=init_event)
+            await stream_writer.push(init_event)
 
             # Get the stream iterator from the existing solve_query method
             stream_iterator = await self.solve_query(
@@ -301,11 +323,11 @@ class CoreProcessor:
                 query_id=query_id,
             )
 
-            # Stream all events to Redis using StreamHandler
+            # Stream all events to Redis, coalescing adjacent deltas
             last_event = None
             async for event in stream_iterator:
                 last_event = event
-                await StreamHandler.push_to_stream(stream_id=query_id, data=event)
+                await stream_writer.push(event)
 
             # Push completion events
             if (
@@ -314,33 +336,36 @@ class CoreProcessor:
                 and last_event.type != StreamingEventType.TOOL_USE_REQUEST_END
             ):
                 completion_event = self.event_manager.create_completion_event()
-                await StreamHandler.push_to_stream(stream_id=query_id, data=completion_event)
+                await stream_writer.push(completion_event)
 
                 close_event = self.event_manager.create_close_event()
-                await StreamHandler.push_to_stream(stream_id=query_id, data=close_event)
+                await stream_writer.push(close_event)
             else:
                 end_event = self.event_manager.create_end_event()
-                await StreamHandler.push_to_stream(stream_id=query_id, data=end_event)
+                await stream_writer.push(end_event)
 
         except LLMThrottledError as ex:
             AppLogger.log_error(f"LLM throttled error in query solver: {ex}")
             error_event = self.event_manager.create_llm_throttled_error_event(ex)
-            await StreamHandler.push_to_stream(stream_id=query_id, data=error_event)
+            await stream_writer.push(error_event)
 
         except InputTokenLimitExceededError as ex:
             AppLogger.log_error(
                 f"Input token limit exceeded: model={ex.model_name}, tokens={ex.current_tokens}/{ex.max_tokens}"
             )
             error_event = await self.event_manager.create_token_limit_error_event(ex, payload.query)
-            await StreamHandler.push_to_stream(stream_id=query_id, data=error_event)
+            await stream_writer.push(error_event)
 
         except asyncio.CancelledError as ex:
             AppLogger.log_error(f"Query cancelled: {ex}")
             error_event = self.event_manager.create_error_event(f"LLM processing error: {str(ex)}")
-            await StreamHandler.push_to_stream(stream_id=query_id, data=error_event)
+            await stream_writer.push(error_event)
 
         except Exception as e:  # noqa: BLE001
             # Handle other errors by pushing error event to stream
             AppLogger.log_error(f"Error in query solver: {e}")
             error_event = self.event_manager.create_error_event(f"LLM processing error: {str(e)}")
-            await StreamHandler.push_to_stream(stream_id=query_id, data=error_event)
+            await stream_writer.push(error_event)
+
+        finally:
+            await stream_writer.close()
@@ -0,0 +1,59 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+
+from deputydev_core.utils.app_logger import AppLogger
+
+T = TypeVar("T")
+
+
+class Preflight:
+    """
+    Times the steps run before a query reaches the LLM, and bounds their total duration.
+
+    Steps that do not depend on each other are run together with `gather`. The budget is not
+    enforced on mandatory steps, it is the deadline optional steps (like agent selection) are given
+    through `remaining`, so that they degrade to their fallback instead of delaying the first token.
+
+    Example:
+        ```python
+        preflight = Preflight(query_id)
+        chats, agents = await preflight.gather(chats=load_chats(), agents=load_agents())
+        agent = await preflight.run("agent_selection", select_agent(timeout=preflight.remaining()))
+        preflight.log_timings()
+        ```
+    """
+
+    # Total time (in seconds) the pre-LLM steps of a query may take before optional steps are skipped
+    BUDGET = 5.0
+
+    def __init__(self, query_id: str, budget: Optional[float] = None) -> None:
+        self.query_id = query_id
+        self.budget = budget if budget is not None else self.BUDGET
+        self.timings: Dict[str, float] = {}
+        self._started_at = time.monotonic()
+
+    async def run(self, name: str, step: Awaitable[T]) -> T:
+        """Await a single step, recording how long it took."""
+        started_at = time.monotonic()
+        try:
+            return await step
+        finally:
+            self.timings[name] = time.monotonic() - started_at
+
+    async def gather(self, **steps: Awaitable[Any]) -> Tuple[Any, ...]:
+        """Run independent steps concurrently, returning their results in the order they were given."""
+        return tuple(await asyncio.gather(*(self.run(name, step) for name, step in steps.items())))
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative."""
+        return max(0.0, self.budget - self.elapsed())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started_at
+
+    def log_timings(self) -> None:
+        step_timings = ", ".join(f"{name}={duration * 1000:.0f}ms" for name, duration in self.timings.items())
+        AppLogger.log_info(
+            f"Pre-LLM stage for query {self.query_id} took {self.elapsed() * 1000:.0f}ms ({step_timings})"
+        )
@@ -1,10 +1,11 @@
 import asyncio
+from datetime import datetime
 from typing import Optional
 
 from deputydev_core.llm_handler.models.dto.message_thread_dto import LLModels
 from deputydev_core.utils.config_manager import ConfigManager
 
-from app.backend_common.models.dto.extension_sessions_dto import ExtensionSessionData
+from app.backend_common.models.dto.extension_sessions_dto import ExtensionSessionData, ExtensionSessionDTO
 from app.backend_common.repository.extension_sessions.repository import ExtensionSessionsRepository
 from app.main.blueprints.one_dev.models.dto.agent_chats import (
     ActorType,
@@ -47,6 +48,23 @@ class ModelManager:
         else:
             return f"LLM model changed from {current_display} to {new_display} by the user."
 
+    async def get_or_create_session(
+        self, session_id: int, user_team_id: int, session_type: str, llm_model: LLModels
+    ) -> ExtensionSessionDTO:
+        """Fetch the extension session, creating it with the given model if it does not exist yet."""
+        current_session = await ExtensionSessionsRepository.get_by_id(session_id=session_id)
+        if current_session:
+            return current_session
+
+        return await ExtensionSessionsRepository.create_extension_session(
+            extension_session_data=ExtensionSessionData(
+                session_id=session_id,
+                user_team_id=user_team_id,
+                session_type=session_type,
+                current_model=llm_model,
+            )
+        )
+
     async def set_required_model(
         self,
         llm_model: LLModels,
@@ -57,21 +75,16 @@ class ModelManager:
         user_team_id: int,
         session_type: str,
         reasoning: Optional[Reasoning],
+        current_session: Optional[ExtensionSessionDTO] = None,
+        changed_at: Optional[datetime] = None,
     ) -> None:
         """
         Set the required model for the session.
+        `current_session` can be passed if already fetched with `get_or_create_session`, and `changed_at`
+        pins the time of the model change message, for callers creating other chats concurrently.
         """
-        current_session = await ExtensionSessionsRepository.get_by_id(session_id=session_id)
-
         if not current_session:
-            current_session = await ExtensionSessionsRepository.create_extension_session(
-                extension_session_data=ExtensionSessionData(
-                    session_id=session_id,
-                    user_team_id=user_team_id,
-                    session_type=session_type,
-                    current_model=llm_model,
-                )
-            )
+            current_session = await self.get_or_create_session(session_id, user_team_id, session_type, llm_model)
 
         if current_session.current_model != llm_model:
             # TODO: remove after v15 Force upgrade
@@ -106,6 +119,8 @@ class ModelManager:
                         },
                         query_id=query_id,
                         previous_queries=[],
-                    )
+                    ),
+                    custom_created_at=changed_at,
+                    custom_updated_at=changed_at,
                 ),
             )
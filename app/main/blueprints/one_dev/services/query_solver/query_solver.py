@@ -69,14 +69,11 @@ class QuerySolver:
                 offset_id = payload.resume_offset_id or "0"
                 stream_iterator = StreamHandler.stream_from(stream_id=query_id, offset_id=offset_id)
             else:
-                # Normal case: start new query processing and ensure stream starts before subscription
+                # Normal case: start new query processing; the subscription waits for the stream to be created
                 query_id, stream_task = await self.start_query_solver_with_task(
                     payload=payload, client_data=client_data, task_checker=task_checker
                 )
 
-                # Wait for the stream initialization event to ensure the stream has started
-                await self._wait_for_stream_initialization(query_id)
-
                 stream_iterator = StreamHandler.stream_from(stream_id=query_id, offset_id="0")
 
             # Stream events to client
@@ -167,37 +164,6 @@ class QuerySolver:
 
         return query_id, task
 
-    async def _wait_for_stream_initialization(self, query_id: str, check_timeout: float = 60.0) -> None:
-        """
-        Wait for the stream initialization event to ensure the stream has started.
-
-        Args:
-            query_id: The query/stream ID to wait for
-            timeout: Maximum time to wait in seconds
-        """
-        start_time = asyncio.get_event_loop().time()
-        while True:
-            try:
-                # Create a stream iterator to check for the initialization event
-                stream_iterator = StreamHandler.stream_from(stream_id=query_id, offset_id="0")
-
-                # Wait for the first event with timeout
-                async for event in stream_iterator():
-                    if hasattr(event, "data") and isinstance(event.data, dict):
-                        event_data = event.data
-                        if event_data.get("type") == "STREAM_INITIALIZED":
-                            return
-                    elif hasattr(event, "type") and event.type == "STREAM_INITIALIZED":
-                        return
-
-                # Check timeout
-                if asyncio.get_event_loop().time() - start_time > check_timeout:
-                    break
-
-            except Exception:  # noqa: BLE001
-                # If stream not found yet, wait and retry
-                await asyncio.sleep(1)
-
     async def resume_stream(
         self,
         payload: Union[QuerySolverInput, QuerySolverResumeInput],
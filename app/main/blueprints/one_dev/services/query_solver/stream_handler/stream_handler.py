@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime
 from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
@@ -14,7 +13,7 @@ class StreamHandler(BaseServiceCache):
 
     This class provides functionality to:
     - Push BaseModel messages to Redis streams
-    - Read BaseModel messages from Redis streams with offset support
+    - Read BaseModel messages from Redis streams with offset support, through a shared per-process reader
     - Automatically expire streams after 10 minutes
     - Return functions that create async iterators for both existing and upcoming messages
     """
@@ -26,6 +25,12 @@ class StreamHandler(BaseServiceCache):
     # Stream TTL in seconds (10 minutes)
     STREAM_TTL = 600
 
+    # Approximate upper bound on entries retained per stream (XADD MAXLEN ~)
+    STREAM_MAX_LEN = 10000
+
+    # Events after which the producer writes nothing more to the stream
+    TERMINAL_EVENT_TYPES = {"STREAM_END_CLOSE_CONNECTION", "STREAM_END", "STREAM_ERROR"}
+
     @classmethod
     def _get_stream_key(cls, stream_id: str) -> str:
         """Get the full Redis key for a stream."""
@@ -49,100 +54,74 @@ class StreamHandler(BaseServiceCache):
         # Serialize BaseModel to JSON string for Redis storage
         redis_data = {"data": data.model_dump_json()}
 
-        # Push to stream using XADD
-        result = await cls._redis_xadd(stream_key, redis_data, message_id)
+        # Push to stream and set expiration in a single round trip
+        results = await cls._redis_xadd_many(stream_key, [redis_data], message_id=message_id)
+
+        return results[0]
+
+    @classmethod
+    async def push_many_to_stream(
+        cls, stream_id: str, serialized_messages: List[str], set_expiration: bool = True
+    ) -> List[str]:
+        """
+        Push several already serialized messages to a Redis stream in one pipelined round trip.
+
+        Args:
+            stream_id (str): The identifier for the stream
+            serialized_messages (List[str]): JSON encoded messages, in the order they should appear in the stream
+            set_expiration (bool): Whether to (re)set the stream TTL as part of the same round trip
 
-        # Set expiration on the stream
-        await cls._set_stream_expiration(stream_key)
+        Returns:
+            List[str]: The message IDs assigned to the messages, in order
+        """
+        if not serialized_messages:
+            return []
 
-        return result
+        stream_key = cls._get_stream_key(stream_id)
+        return await cls._redis_xadd_many(
+            stream_key, [{"data": message} for message in serialized_messages], set_expiration=set_expiration
+        )
 
     @classmethod
-    def get_from_stream(  # noqa: C901
+    def get_from_stream(
         cls,
         stream_id: str,
         offset_id: str = "0",
-        count: Optional[int] = None,
-        block_timeout: Optional[int] = 1000,
         model_class: Optional[type] = None,
     ) -> Callable[[], AsyncIterator[BaseModel]]:
         """
         Get messages from a Redis stream with offset support.
         Returns a function that returns an async iterator for both existing and upcoming messages.
 
+        Reads are served by the per-process StreamMultiplexer, so any number of consumers share a
+        single blocking XREAD. The iterator ends after a terminal event (see TERMINAL_EVENT_TYPES)
+        or once the stream has expired.
+
         Args:
             stream_id (str): The identifier for the stream
             offset_id (str): The offset ID to start reading from (defaults to "0")
-            count (Optional[int]): Maximum number of messages to read per batch
-            block_timeout (Optional[int]): Timeout in milliseconds for blocking reads
             model_class (Optional[type]): Specific BaseModel class to deserialize to
 
         Returns:
             Callable[[], AsyncIterator[BaseModel]]: A function that returns an async iterator
         """
 
-        async def stream_iterator() -> AsyncIterator[BaseModel]:  # noqa: C901
+        async def stream_iterator() -> AsyncIterator[BaseModel]:
             """Async iterator function that yields BaseModel messages from the stream."""
-
-            stream_key = cls._get_stream_key(stream_id)
-            current_offset = offset_id
-
-            # First, read existing messages from the offset
-            existing_messages: List[Tuple[str, List[Tuple[str, Dict[str, str]]]]] = await cls._redis_xread(
-                {stream_key: current_offset}, count=count
+            from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_multiplexer import (
+                StreamMultiplexer,
             )
 
-            for _stream_name, messages in existing_messages:
-                for message_id, fields in messages:
-                    # Update current offset to the latest message ID
-                    current_offset = message_id
-
-                    # Parse and yield the BaseModel message
+            subscription = await StreamMultiplexer.subscribe(cls._get_stream_key(stream_id), offset_id)
+            try:
+                async for message_id, fields in subscription:
                     message_data: BaseModel = cls._parse_stream_message(message_id, fields, model_class)
                     yield message_data
 
-            # Now start blocking reads for new messages
-            # Use the last seen message ID for XREAD (don't use ">" as it's only for XREADGROUP)
-            next_offset: str = current_offset
-
-            while True:
-                try:
-                    # Check if stream still exists and hasn't expired
-                    stream_exists: bool = await cls._stream_exists(stream_key)
-                    if not stream_exists:
+                    if cls._is_terminal_message(message_data):
                         break
-
-                    # Blocking read for new messages
-                    new_messages: List[Tuple[str, List[Tuple[str, Dict[str, str]]]]] = await cls._redis_xread(
-                        {stream_key: next_offset}, count=count, block=block_timeout
-                    )
-
-                    if not new_messages:
-                        # Timeout occurred, continue to next iteration
-                        continue
-
-                    for _stream_name, messages in new_messages:
-                        for message_id, fields in messages:
-                            # Update offset for next read
-                            next_offset = message_id
-
-                            # Parse and yield the BaseModel message
-                            message_data: BaseModel = cls._parse_stream_message(message_id, fields, model_class)
-                            yield message_data
-
-                            if (
-                                hasattr(message_data, "data")
-                                and (message_data.data or {}).get("type") == "STREAM_END_CLOSE_CONNECTION"
-                            ):
-                                # If this is a close connection event, stop the iterator
-                                break
-
-                except asyncio.CancelledError:
-                    # Handle task cancellation gracefully
-                    break
-                except Exception:  # noqa: BLE001
-                    # Log error and continue (could add proper logging here)
-                    await asyncio.sleep(1)  # Brief pause before retry
+            finally:
+                StreamMultiplexer.unsubscribe(subscription)
 
         return stream_iterator
 
@@ -151,8 +130,6 @@ class StreamHandler(BaseServiceCache):
         cls,
         stream_id: str,
         offset_id: str = "0",
-        count: Optional[int] = None,
-        block_timeout: Optional[int] = 1000,
         model_class: Optional[type] = None,
     ) -> Callable[[], AsyncIterator[BaseModel]]:
         """
@@ -162,25 +139,38 @@ class StreamHandler(BaseServiceCache):
         Args:
             stream_id (str): The identifier for the stream
             offset_id (str): The offset ID to start reading from (defaults to "0")
-            count (Optional[int]): Maximum number of messages to read per batch
-            block_timeout (Optional[int]): Timeout in milliseconds for blocking reads
             model_class (Optional[type]): Specific BaseModel class to deserialize to
 
         Returns:
             AsyncIterator[BaseModel]: An async iterator that yields BaseModel messages
         """
-        return cls.get_from_stream(stream_id, offset_id, count, block_timeout, model_class)
+        return cls.get_from_stream(stream_id, offset_id, model_class)
 
     @classmethod
-    async def _redis_xadd(cls, stream_key: str, data: Dict[str, str], message_id: str = "*") -> str:
-        """Execute XADD command on Redis."""
-        # Flatten the data dictionary for Redis XADD command
-        args: List[str] = []
-        for key, value in data.items():
-            args.extend([key, value])
+    def _is_terminal_message(cls, message_data: BaseModel) -> bool:
+        """Check whether a message is the last one the producer writes to its stream."""
+        data = getattr(message_data, "data", None)
+        event_type = data.get("type") if isinstance(data, dict) else getattr(message_data, "type", None)
+        return event_type in cls.TERMINAL_EVENT_TYPES
 
-        result = await cls._get_redis_client().execute_command("XADD", stream_key, message_id, *args)
-        return result
+    @classmethod
+    async def _redis_xadd_many(
+        cls,
+        stream_key: str,
+        entries: List[Dict[str, str]],
+        message_id: str = "*",
+        set_expiration: bool = True,
+    ) -> List[str]:
+        """Execute XADD for every entry (capped with MAXLEN) and optionally EXPIRE, in one pipeline."""
+        pipeline = cls._get_redis_client().pipeline(transaction=False)
+        for entry in entries:
+            pipeline.xadd(stream_key, entry, id=message_id, maxlen=cls.STREAM_MAX_LEN, approximate=True)
+
+        if set_expiration:
+            pipeline.expire(stream_key, cls.STREAM_TTL)
+
+        results = await pipeline.execute()
+        return results[: len(entries)]
 
     @classmethod
     async def _redis_xread(
@@ -208,15 +198,9 @@ class StreamHandler(BaseServiceCache):
         return result or []
 
     @classmethod
-    async def _stream_exists(cls, stream_key: str) -> bool:
-        """Check if a stream exists in Redis."""
-        result = await cls._get_redis_client().exists(stream_key)
-        return bool(result)
-
-    @classmethod
-    async def _set_stream_expiration(cls, stream_key: str) -> None:
+    async def set_stream_expiration(cls, stream_id: str) -> None:
         """Set expiration time for a stream."""
-        await cls._get_redis_client().expire(stream_key, cls.STREAM_TTL)
+        await cls._get_redis_client().expire(cls._get_stream_key(stream_id), cls.STREAM_TTL)
 
     @classmethod
     def _parse_stream_message(
@@ -0,0 +1,194 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from deputydev_core.utils.app_logger import AppLogger
+
+from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_handler import StreamHandler
+
+StreamEntry = Tuple[str, Dict[str, str]]
+
+
+def _parse_stream_id(message_id: str) -> Tuple[int, int]:
+    """Convert a Redis stream ID (`<ms>-<seq>` or `<ms>`) into a comparable tuple."""
+    milliseconds, _, sequence = message_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class StreamSubscription:
+    """A single consumer of a Redis stream, fed by the `StreamMultiplexer`."""
+
+    def __init__(self, stream_key: str, offset_id: str = "0") -> None:
+        self.stream_key = stream_key
+        self.offset_id = offset_id
+        self.created_at = time.monotonic()
+        self.received_entries = False
+        # a subscription resuming from an offset expects the stream to exist already, so it does not wait for it
+        self.waits_for_stream = _parse_stream_id(offset_id) == (0, 0)
+        self._queue: asyncio.Queue[Optional[StreamEntry]] = asyncio.Queue()
+
+    def deliver(self, message_id: str, fields: Dict[str, str]) -> None:
+        """Queue an entry for the consumer, skipping entries at or before the subscription offset."""
+        if _parse_stream_id(message_id) <= _parse_stream_id(self.offset_id):
+            return
+        self.offset_id = message_id
+        self.received_entries = True
+        self._queue.put_nowait((message_id, fields))
+
+    def close(self) -> None:
+        """Signal the consumer that no further entries will be delivered."""
+        self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[StreamEntry]:
+        while True:
+            entry = await self._queue.get()
+            if entry is None:
+                return
+            yield entry
+
+
+class StreamMultiplexer:
+    """
+    Per-process reader that serves every subscribed stream with a single blocking XREAD.
+
+    Instead of each WebSocket consumer holding its own blocking Redis call, consumers register a
+    `StreamSubscription` and the multiplexer dispatches entries to the per-subscription queues.
+    A private wake-up stream is included in every XREAD so that new subscriptions are picked up
+    without waiting for the blocking read to time out. Stream existence is checked for all
+    subscribed keys together, at most once every `EXISTENCE_CHECK_INTERVAL` seconds.
+    """
+
+    # Blocking timeout (in milliseconds) of the shared XREAD
+    READ_BLOCK_MS = 1000
+
+    # Maximum entries returned per stream by a single XREAD
+    READ_COUNT = 500
+
+    # Seconds between EXISTS checks of subscribed streams
+    EXISTENCE_CHECK_INTERVAL = 5.0
+
+    # Seconds a subscription from the start of a stream waits for the stream to be created
+    STREAM_WAIT_TIMEOUT = 60.0
+
+    # Seconds to wait before retrying after a failed read
+    RETRY_BACKOFF = 1.0
+
+    _subscriptions: Dict[str, Set[StreamSubscription]] = {}
+    _reader_task: Optional[asyncio.Task[None]] = None
+    _reader_blocked: bool = False
+    _wakeup_key: str = StreamHandler.prefixed_key(f"multiplexer_wakeup:{uuid4().hex}")
+    _wakeup_offset: str = "0-0"
+    _last_existence_check: float = 0.0
+
+    @classmethod
+    async def subscribe(cls, stream_key: str, offset_id: str = "0") -> StreamSubscription:
+        """
+        Subscribe to entries of a stream added after the given offset.
+
+        Args:
+            stream_key (str): Full Redis key of the stream
+            offset_id (str): Only entries with a greater ID are delivered
+
+        Returns:
+            StreamSubscription: Async iterable of (message_id, fields) tuples
+        """
+        subscription = StreamSubscription(stream_key, offset_id)
+        cls._subscriptions.setdefault(stream_key, set()).add(subscription)
+        if not subscription.waits_for_stream:
+            # check on the next read, so that resuming an expired stream ends right away
+            cls._last_existence_check = 0.0
+
+        if cls._reader_task is None or cls._reader_task.done():
+            cls._reader_task = asyncio.create_task(cls._read_loop())
+        elif cls._reader_blocked:
+            await cls._wake_reader()
+
+        return subscription
+
+    @classmethod
+    def unsubscribe(cls, subscription: StreamSubscription) -> None:
+        """Remove a subscription; its consumer stops after draining already queued entries."""
+        subscriptions = cls._subscriptions.get(subscription.stream_key)
+        if subscriptions is not None and subscription in subscriptions:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                cls._subscriptions.pop(subscription.stream_key, None)
+            subscription.close()
+
+    @classmethod
+    async def _wake_reader(cls) -> None:
+        """Unblock the in-flight XREAD so that the next one includes newly subscribed streams."""
+        try:
+            await StreamHandler._redis_xadd_many(cls._wakeup_key, [{"wakeup": "1"}])
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to wake stream multiplexer: {ex}")
+
+    @classmethod
+    def _get_read_offsets(cls) -> Dict[str, str]:
+        offsets: Dict[str, str] = {
+            stream_key: min((sub.offset_id for sub in subscriptions), key=_parse_stream_id)
+            for stream_key, subscriptions in cls._subscriptions.items()
+        }
+        offsets[cls._wakeup_key] = cls._wakeup_offset
+        return offsets
+
+    @classmethod
+    def _dispatch(cls, results: List[Tuple[str, List[StreamEntry]]]) -> None:
+        for stream_key, messages in results:
+            if not messages:
+                continue
+            if stream_key == cls._wakeup_key:
+                cls._wakeup_offset = messages[-1][0]
+                continue
+            for subscription in list(cls._subscriptions.get(stream_key, ())):
+                for message_id, fields in messages:
+                    subscription.deliver(message_id, fields)
+
+    @classmethod
+    async def _close_missing_streams(cls) -> None:
+        """
+        Close subscriptions of streams that expired, resumed streams that no longer exist, and streams that
+        never appeared within the wait timeout.
+        """
+        now = time.monotonic()
+        if now - cls._last_existence_check < cls.EXISTENCE_CHECK_INTERVAL:
+            return
+        cls._last_existence_check = now
+
+        stream_keys = list(cls._subscriptions.keys())
+        pipeline = StreamHandler._get_redis_client().pipeline(transaction=False)
+        for stream_key in stream_keys:
+            pipeline.exists(stream_key)
+        existence: List[int] = await pipeline.execute()
+
+        for stream_key, exists in zip(stream_keys, existence):
+            if exists:
+                continue
+            for subscription in list(cls._subscriptions.get(stream_key, ())):
+                if (
+                    subscription.received_entries
+                    or not subscription.waits_for_stream
+                    or now - subscription.created_at > cls.STREAM_WAIT_TIMEOUT
+                ):
+                    cls.unsubscribe(subscription)
+
+    @classmethod
+    async def _read_loop(cls) -> None:
+        while cls._subscriptions:
+            try:
+                cls._reader_blocked = True
+                try:
+                    results = await StreamHandler._redis_xread(
+                        cls._get_read_offsets(), count=cls.READ_COUNT, block=cls.READ_BLOCK_MS
+                    )
+                finally:
+                    cls._reader_blocked = False
+
+                cls._dispatch(results)
+                await cls._close_missing_streams()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(f"Error in stream multiplexer read loop: {ex}")
+                await asyncio.sleep(cls.RETRY_BACKOFF)
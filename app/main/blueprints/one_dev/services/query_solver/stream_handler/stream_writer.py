@@ -0,0 +1,177 @@
+import asyncio
+import json
+import time
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+from deputydev_core.utils.app_logger import AppLogger
+from pydantic import BaseModel
+
+from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_handler import StreamHandler
+
+
+class StreamWriter:
+    """
+    Buffered writer for a single query stream.
+
+    LLM responses are relayed as many tiny delta events. Instead of issuing an XADD (plus an EXPIRE)
+    per event, this writer:
+    - Coalesces adjacent deltas of the same block into a single stream entry
+    - Holds deltas for at most `flush_interval` seconds or until a size threshold is crossed
+    - Flushes immediately on any non-delta event (block start/end, tool use end, errors, ...)
+    - Writes every flush as one pipelined round trip, setting the stream TTL once and
+      only refreshing it when half of it has elapsed
+    """
+
+    # Maximum time (in seconds) a buffered delta waits before it is written
+    FLUSH_INTERVAL = 0.03
+
+    # Flush as soon as this many entries are buffered
+    MAX_BUFFERED_ENTRIES = 64
+
+    # Flush as soon as the buffered delta payload grows beyond this many characters
+    MAX_BUFFERED_CHARS = 16 * 1024
+
+    # Delta event type -> name of the content field carrying the incremental payload
+    COALESCABLE_DELTA_FIELDS: Dict[str, str] = {
+        "TEXT_BLOCK_DELTA": "text",
+        "THINKING_BLOCK_DELTA": "thinking_delta",
+        "CODE_BLOCK_DELTA": "code_delta",
+        "SUMMARY_BLOCK_DELTA": "summary_delta",
+        "TOOL_USE_REQUEST_DELTA": "input_params_json_delta",
+    }
+
+    def __init__(
+        self,
+        stream_id: str,
+        flush_interval: Optional[float] = None,
+        max_buffered_entries: Optional[int] = None,
+        max_buffered_chars: Optional[int] = None,
+    ) -> None:
+        self.stream_id = stream_id
+        self.flush_interval = flush_interval if flush_interval is not None else self.FLUSH_INTERVAL
+        self.max_buffered_entries = max_buffered_entries or self.MAX_BUFFERED_ENTRIES
+        self.max_buffered_chars = max_buffered_chars or self.MAX_BUFFERED_CHARS
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffered_chars: int = 0
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        self._expiration_set_at: Optional[float] = None
+
+    async def __aenter__(self) -> "StreamWriter":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def push(self, data: BaseModel) -> None:
+        """
+        Buffer an event for the stream.
+
+        Args:
+            data (BaseModel): The event to push to the stream
+        """
+        event: Dict[str, Any] = data.model_dump(mode="json")
+        delta_field = self._get_delta_field(event)
+
+        if delta_field is None:
+            self._buffer.append(event)
+            await self.flush()
+            return
+
+        if not self._coalesce_with_last(event, delta_field):
+            self._buffer.append(event)
+        self._buffered_chars += len(event["content"][delta_field])
+
+        if len(self._buffer) >= self.max_buffered_entries or self._buffered_chars >= self.max_buffered_chars:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+
+    async def flush(self, refresh_expiration: bool = False) -> None:
+        """
+        Write all buffered events to the stream in a single round trip.
+
+        Args:
+            refresh_expiration (bool): Force the stream TTL to be reset, even if it was set recently
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        async with self._lock:
+            entries, buffered_chars = self._buffer, self._buffered_chars
+            self._buffer, self._buffered_chars = [], 0
+            set_expiration = refresh_expiration or self._is_expiration_due()
+
+            if entries:
+                try:
+                    await StreamHandler.push_many_to_stream(
+                        self.stream_id,
+                        [json.dumps(entry, separators=(",", ":")) for entry in entries],
+                        set_expiration=set_expiration,
+                    )
+                except BaseException:
+                    # put the entries back ahead of those pushed meanwhile, so that the next flush retries them in order
+                    self._buffer[:0] = entries
+                    self._buffered_chars += buffered_chars
+                    raise
+            elif set_expiration and self._expiration_set_at is not None:
+                await StreamHandler.set_stream_expiration(self.stream_id)
+            else:
+                return
+
+            if set_expiration:
+                self._expiration_set_at = time.monotonic()
+
+    async def close(self) -> None:
+        """Flush pending events and reset the stream TTL so it is counted from the last event."""
+        await self.flush(refresh_expiration=True)
+
+    def _get_delta_field(self, event: Dict[str, Any]) -> Optional[str]:
+        delta_field = self.COALESCABLE_DELTA_FIELDS.get(event.get("type"))
+        content = event.get("content")
+        if delta_field is None or not isinstance(content, dict) or not isinstance(content.get(delta_field), str):
+            return None
+        return delta_field
+
+    def _coalesce_with_last(self, event: Dict[str, Any], delta_field: str) -> bool:
+        """Merge the delta into the last buffered entry if both belong to the same block."""
+        if not self._buffer:
+            return False
+
+        last = self._buffer[-1]
+        if last.get("type") != event.get("type") or last.keys() != event.keys():
+            return False
+        if any(value != last[key] for key, value in event.items() if key != "content"):
+            return False
+
+        last_content, content = last["content"], event["content"]
+        if last_content.keys() != content.keys():
+            return False
+        if any(value != last_content[key] for key, value in content.items() if key != delta_field):
+            return False
+
+        last_content[delta_field] += content[delta_field]
+        return True
+
+    def _is_expiration_due(self) -> bool:
+        if self._expiration_set_at is None:
+            return True
+        return time.monotonic() - self._expiration_set_at >= StreamHandler.STREAM_TTL / 2
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # detach before flushing so that a concurrent flush does not cancel an in-flight write
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as ex:  # noqa: BLE001
+            # the events stay buffered and are retried by the next flush
+            AppLogger.log_error(f"Failed to flush buffered events to stream {self.stream_id}: {ex}")
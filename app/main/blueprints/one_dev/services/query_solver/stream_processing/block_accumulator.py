@@ -0,0 +1,31 @@
+from typing import Any, Dict, List
+
+from app.main.blueprints.one_dev.models.dto.agent_chats import MessageType as ChatMessageType
+
+
+class BlockAccumulator:
+    """
+    Accumulates the streamed deltas of one open content block.
+
+    Deltas are kept as a list of chunks and joined once, when the block is materialized at block end,
+    instead of rebuilding the block's message data (and copying its whole content) on every delta.
+    """
+
+    def __init__(self, message_type: ChatMessageType, **attributes: Any) -> None:
+        self.message_type = message_type
+        self.attributes: Dict[str, Any] = attributes
+        self._chunks: List[str] = []
+
+    def append(self, chunk: str) -> None:
+        """Add a delta to the block."""
+        if chunk:
+            self._chunks.append(chunk)
+
+    def is_of_type(self, message_type: ChatMessageType) -> bool:
+        return self.message_type == message_type
+
+    def materialize(self) -> str:
+        """Return the full content of the block, joining the buffered chunks only once."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
@@ -22,7 +22,6 @@ from app.main.blueprints.one_dev.models.dto.agent_chats import (
     ActorType,
     AgentChatCreateRequest,
     CodeBlockData,
-    MessageData,
     TaskPlanData,
     TextMessageData,
     ThinkingInfoData,
@@ -47,8 +46,9 @@ from app.main.blueprints.one_dev.services.query_solver.prompts.feature_prompts.c
     ThinkingBlockEnd,
     ThinkingBlockStart,
 )
+from app.main.blueprints.one_dev.services.query_solver.stream_processing.block_accumulator import BlockAccumulator
 from app.main.blueprints.one_dev.services.query_solver.summary.summary_manager import SummaryManager
-from app.main.blueprints.one_dev.services.repository.agent_chats.repository import AgentChatsRepository
+from app.main.blueprints.one_dev.services.repository.agent_chats.write_buffer import AgentChatsWriteBuffer
 
 
 class StreamProcessor:
@@ -72,25 +72,29 @@ class StreamProcessor:
         """Handle the final stream iterator with all message types."""
         query_summary: Optional[str] = None
         tool_use_detected: bool = False
+        chat_writer = AgentChatsWriteBuffer(session_id)
 
-        async def _update_current_message_data_for_text(
-            current_message_data: Optional[TextMessageData],
+        async def _update_current_block_for_text(
+            current_block: Optional[BlockAccumulator],
             event: TextBlockStart | TextBlockDelta | TextBlockEnd,
             previous_queries: List[str],
-        ) -> Optional[MessageData]:
-            new_data: Optional[MessageData] = None
+        ) -> Optional[BlockAccumulator]:
+            new_block: Optional[BlockAccumulator] = None
             if isinstance(event, TextBlockStart):
-                new_data = TextMessageData(text="")
+                new_block = BlockAccumulator(ChatMessageType.TEXT)
             elif isinstance(event, TextBlockDelta):
-                new_data = TextMessageData(
-                    text=((current_message_data.text if current_message_data else "") + event.content.text)
+                new_block = (
+                    current_block
+                    if current_block and current_block.is_of_type(ChatMessageType.TEXT)
+                    else BlockAccumulator(ChatMessageType.TEXT)
                 )
-            elif current_message_data:  # TextBlockEnd
-                await AgentChatsRepository.create_chat(
+                new_block.append(event.content.text)
+            elif current_block:  # TextBlockEnd
+                chat_writer.add(
                     chat_data=AgentChatCreateRequest(
                         session_id=session_id,
                         actor=ActorType.ASSISTANT,
-                        message_data=current_message_data,
+                        message_data=TextMessageData(text=current_block.materialize()),
                         message_type=ChatMessageType.TEXT,
                         metadata={
                             "llm_model": llm_model.value,
@@ -101,37 +105,38 @@ class StreamProcessor:
                         previous_queries=previous_queries,
                     )
                 )
-                new_data = None
+                new_block = None
 
-            return new_data
+            return new_block
 
-        async def _update_current_message_data_for_thinking(
-            current_message_data: Optional[ThinkingInfoData],
+        async def _update_current_block_for_thinking(
+            current_block: Optional[BlockAccumulator],
             event: ThinkingBlockStart | ThinkingBlockDelta | ThinkingBlockEnd,
             previous_queries: List[str],
-        ) -> Optional[MessageData]:
-            new_data: Optional[MessageData] = None
+        ) -> Optional[BlockAccumulator]:
+            new_block: Optional[BlockAccumulator] = None
             if isinstance(event, ThinkingBlockStart):
-                new_data = ThinkingInfoData(
-                    thinking_summary="",
-                    ignore_in_chat=getattr(event, "ignore_in_chat", False),
+                new_block = BlockAccumulator(
+                    ChatMessageType.THINKING, ignore_in_chat=getattr(event, "ignore_in_chat", False)
                 )
             elif isinstance(event, ThinkingBlockDelta):
-                new_data = ThinkingInfoData(
-                    thinking_summary=(
-                        (current_message_data.thinking_summary if current_message_data else "")
-                        + event.content.thinking_delta
-                    ),
-                    ignore_in_chat=getattr(event, "ignore_in_chat", False)
-                    if hasattr(event, "ignore_in_chat")
-                    else (current_message_data.ignore_in_chat if current_message_data else False),
+                new_block = (
+                    current_block
+                    if current_block and current_block.is_of_type(ChatMessageType.THINKING)
+                    else BlockAccumulator(ChatMessageType.THINKING, ignore_in_chat=False)
                 )
-            elif current_message_data:  # ThinkingBlockEnd
-                await AgentChatsRepository.create_chat(
+                new_block.append(event.content.thinking_delta)
+                if hasattr(event, "ignore_in_chat"):
+                    new_block.attributes["ignore_in_chat"] = getattr(event, "ignore_in_chat", False)
+            elif current_block:  # ThinkingBlockEnd
+                chat_writer.add(
                     chat_data=AgentChatCreateRequest(
                         session_id=session_id,
                         actor=ActorType.ASSISTANT,
-                        message_data=current_message_data,
+                        message_data=ThinkingInfoData(
+                            thinking_summary=current_block.materialize(),
+                            ignore_in_chat=current_block.attributes["ignore_in_chat"],
+                        ),
                         message_type=ChatMessageType.THINKING,
                         metadata={
                             "llm_model": llm_model.value,
@@ -142,34 +147,33 @@ class StreamProcessor:
                         previous_queries=previous_queries,
                     )
                 )
-                new_data = None
+                new_block = None
 
-            return new_data
+            return new_block
 
-        async def _update_current_message_data_for_code(
-            current_message_data: Optional[CodeBlockData],
+        async def _update_current_block_for_code(
+            current_block: Optional[BlockAccumulator],
             event: CodeBlockStart | CodeBlockDelta | CodeBlockEnd,
             previous_queries: List[str],
-        ) -> Optional[MessageData]:
-            new_data: Optional[MessageData] = None
+        ) -> Optional[BlockAccumulator]:
+            new_block: Optional[BlockAccumulator] = None
             if isinstance(event, CodeBlockStart):
-                new_data = CodeBlockData(language=event.content.language, file_path=event.content.filepath, code="")
+                new_block = BlockAccumulator(
+                    ChatMessageType.CODE_BLOCK, language=event.content.language, file_path=event.content.filepath
+                )
             elif isinstance(event, CodeBlockDelta):
-                if current_message_data:
-                    new_data = CodeBlockData(
-                        language=current_message_data.language,
-                        file_path=current_message_data.file_path,
-                        code=current_message_data.code + event.content.code_delta,
-                    )
-            elif current_message_data:  # CodeBlockEnd
-                await AgentChatsRepository.create_chat(
+                if current_block and current_block.is_of_type(ChatMessageType.CODE_BLOCK):
+                    new_block = current_block
+                    new_block.append(event.content.code_delta)
+            elif current_block:  # CodeBlockEnd
+                chat_writer.add(
                     chat_data=AgentChatCreateRequest(
                         session_id=session_id,
                         actor=ActorType.ASSISTANT,
                         message_data=CodeBlockData(
-                            language=current_message_data.language,
-                            file_path=current_message_data.file_path,
-                            code=current_message_data.code,
+                            language=current_block.attributes["language"],
+                            file_path=current_block.attributes["file_path"],
+                            code=current_block.materialize(),
                             diff=event.content.diff,
                         ),
                         message_type=ChatMessageType.CODE_BLOCK,
@@ -182,41 +186,35 @@ class StreamProcessor:
                         previous_queries=previous_queries,
                     )
                 )
-                new_data = None
+                new_block = None
 
-            return new_data
+            return new_block
 
-        async def _update_current_message_data_for_tool_use(
-            current_message_data: Optional[ToolUseMessageData],
+        async def _update_current_block_for_tool_use(
+            current_block: Optional[BlockAccumulator],
             event: ToolUseRequestStart | ToolUseRequestDelta | ToolUseRequestEnd,
             previous_queries: List[str],
-        ) -> Optional[MessageData]:
-            new_data: Optional[MessageData] = None
+        ) -> Optional[BlockAccumulator]:
+            new_block: Optional[BlockAccumulator] = None
             if isinstance(event, ToolUseRequestStart):
-                new_data = ToolUseMessageData(
+                new_block = BlockAccumulator(
+                    ChatMessageType.TOOL_USE,
                     tool_name=event.content.tool_name,
-                    tool_input={},
                     tool_use_id=event.content.tool_use_id,
                 )
             elif isinstance(event, ToolUseRequestDelta):
-                if current_message_data:
-                    new_data = ToolUseMessageData(
-                        tool_name=current_message_data.tool_name,
-                        tool_input={
-                            "delta": current_message_data.tool_input.get("delta", "")
-                            + event.content.input_params_json_delta
-                        },
-                        tool_use_id=current_message_data.tool_use_id,
-                    )
-            elif current_message_data:  # ToolUseRequestEnd
-                await AgentChatsRepository.create_chat(
+                if current_block and current_block.is_of_type(ChatMessageType.TOOL_USE):
+                    new_block = current_block
+                    new_block.append(event.content.input_params_json_delta)
+            elif current_block:  # ToolUseRequestEnd
+                chat_writer.add(
                     chat_data=AgentChatCreateRequest(
                         session_id=session_id,
                         actor=ActorType.ASSISTANT,
                         message_data=ToolUseMessageData(
-                            tool_name=current_message_data.tool_name,
-                            tool_input=json.loads(current_message_data.tool_input.get("delta", "{}")),
-                            tool_use_id=current_message_data.tool_use_id,
+                            tool_name=current_block.attributes["tool_name"],
+                            tool_input=json.loads(current_block.materialize() or "{}"),
+                            tool_use_id=current_block.attributes["tool_use_id"],
                         ),
                         message_type=ChatMessageType.TOOL_USE,
                         metadata={
@@ -228,17 +226,17 @@ class StreamProcessor:
                         previous_queries=previous_queries,
                     )
                 )
-                new_data = None
+                new_block = None
 
-            return new_data
+            return new_block
 
-        async def _update_current_message_data_for_task_plan(
-            current_message_data: Optional[MessageData],
+        async def _update_current_block_for_task_plan(
+            current_block: Optional[BlockAccumulator],
             event: TaskPlanBlock,
             previous_queries: List[str],
-        ) -> Optional[MessageData]:
-            new_data: Optional[MessageData] = None
-            await AgentChatsRepository.create_chat(
+        ) -> Optional[BlockAccumulator]:
+            new_block: Optional[BlockAccumulator] = None
+            chat_writer.add(
                 chat_data=AgentChatCreateRequest(
                     session_id=session_id,
                     actor=ActorType.ASSISTANT,
@@ -255,9 +253,9 @@ class StreamProcessor:
                     previous_queries=previous_queries,
                 )
             )
-            new_data = None
+            new_block = None
 
-            return new_data
+            return new_block
 
         async def _streaming_content_block_generator() -> AsyncIterator[BaseModel]:  # noqa: C901
             nonlocal llm_response
@@ -287,7 +285,7 @@ class StreamProcessor:
             else:
                 queue = None
 
-            current_message_data: Optional[MessageData] = None
+            current_block: Optional[BlockAccumulator] = None
 
             async for data_block in llm_response.parsed_content:
                 # Check if the current task is cancelled
@@ -308,22 +306,20 @@ class StreamProcessor:
                     or isinstance(data_block, TextBlockDelta)
                     or isinstance(data_block, TextBlockEnd)
                 ):
-                    current_message_data = await _update_current_message_data_for_text(
-                        current_message_data, data_block, previous_queries
-                    )
+                    current_block = await _update_current_block_for_text(current_block, data_block, previous_queries)
 
                 elif (
                     isinstance(data_block, ThinkingBlockStart)
                     or isinstance(data_block, ThinkingBlockDelta)
                     or isinstance(data_block, ThinkingBlockEnd)
                 ):
-                    current_message_data = await _update_current_message_data_for_thinking(
-                        current_message_data, data_block, previous_queries
+                    current_block = await _update_current_block_for_thinking(
+                        current_block, data_block, previous_queries
                     )
 
                 elif isinstance(data_block, TaskPlanBlock):
-                    current_message_data = await _update_current_message_data_for_task_plan(
-                        current_message_data, data_block, previous_queries
+                    current_block = await _update_current_block_for_task_plan(
+                        current_block, data_block, previous_queries
                     )
 
                 elif (
@@ -331,17 +327,15 @@ class StreamProcessor:
                     or isinstance(data_block, CodeBlockDelta)
                     or isinstance(data_block, CodeBlockEnd)
                 ):
-                    current_message_data = await _update_current_message_data_for_code(
-                        current_message_data, data_block, previous_queries
-                    )
+                    current_block = await _update_current_block_for_code(current_block, data_block, previous_queries)
 
                 elif (
                     isinstance(data_block, ToolUseRequestStart)
                     or isinstance(data_block, ToolUseRequestDelta)
                     or isinstance(data_block, ToolUseRequestEnd)
                 ):
-                    current_message_data = await _update_current_message_data_for_tool_use(
-                        current_message_data, data_block, previous_queries
+                    current_block = await _update_current_block_for_tool_use(
+                        current_block, data_block, previous_queries
                     )
 
                 yield data_block
@@ -349,6 +343,9 @@ class StreamProcessor:
                     while not queue.empty():
                         yield await queue.get()
 
+            # persist the chats of this turn before it is reported complete, tool responses are matched against them
+            await chat_writer.flush()
+
             # wait till the data has been stored in order to ensure that no race around occurs in submitting tool response
             await llm_response.llm_response_storage_task
             # Conditionally generate query summary only if no tool use was detected
@@ -381,4 +378,12 @@ class StreamProcessor:
                 if queue and not queue.empty():
                     yield await queue.get()
 
-        return _streaming_content_block_generator()
+        async def _persisting_stream_generator() -> AsyncIterator[BaseModel]:
+            try:
+                async for data_block in _streaming_content_block_generator():
+                    yield data_block
+            finally:
+                # a turn that failed or was cancelled midway still keeps the chats it produced
+                await chat_writer.close()
+
+        return _persisting_stream_generator()
@@ -6,10 +6,8 @@ from app.backend_common.utils.tool_response_parser import LLMResponseFormatter
 from app.main.blueprints.one_dev.constants.tools import ToolStatus
 from app.main.blueprints.one_dev.models.dto.agent_chats import (
     AgentChatDTO,
-    AgentChatUpdateRequest,
-    ToolUseMessageData,
+    ToolUseResponseUpdate,
 )
-from app.main.blueprints.one_dev.models.dto.agent_chats import MessageType as ChatMessageType
 from app.main.blueprints.one_dev.services.query_solver.dataclasses.main import (
     FocusItem,
     ToolUseResponseInput,
@@ -63,35 +61,32 @@ class ToolResponseManager:
         focus_items: Optional[List[FocusItem]],
     ) -> AgentChatDTO:
         """Store tool response in the chat chain."""
-        # store query in DB
-        tool_use_chats = await AgentChatsRepository.get_chats_by_message_type_and_session(
-            message_type=ChatMessageType.TOOL_USE, session_id=session_id
+        stored_responses = await self.store_tool_responses_in_chat_chain(
+            [tool_response], session_id, vscode_env, focus_items
         )
-        selected_tool_use_chat = next(
-            (
-                chat
-                for chat in tool_use_chats
-                if getattr(chat.message_data, "tool_use_id", None) == tool_response.tool_use_id
-            ),
-            None,
-        )
-
-        if not selected_tool_use_chat or not isinstance(selected_tool_use_chat.message_data, ToolUseMessageData):
-            raise Exception("tool use request not found")
+        return stored_responses[0]
 
-        formatted_response_data = self.format_tool_response(tool_response, vscode_env, focus_items)
-        updated_chat = await AgentChatsRepository.update_chat(
-            chat_id=selected_tool_use_chat.id,
-            update_data=AgentChatUpdateRequest(
-                message_data=ToolUseMessageData(
-                    tool_use_id=selected_tool_use_chat.message_data.tool_use_id,
-                    tool_response=formatted_response_data,
-                    tool_name=selected_tool_use_chat.message_data.tool_name,
-                    tool_input=selected_tool_use_chat.message_data.tool_input,
+    async def store_tool_responses_in_chat_chain(
+        self,
+        tool_responses: List[ToolUseResponseInput],
+        session_id: int,
+        vscode_env: Optional[str],
+        focus_items: Optional[List[FocusItem]],
+    ) -> List[AgentChatDTO]:
+        """Store a batch of tool responses in the chat chain, in the order they were given."""
+        updated_chats = await AgentChatsRepository.update_tool_use_responses(
+            session_id=session_id,
+            responses=[
+                ToolUseResponseUpdate(
+                    tool_use_id=tool_response.tool_use_id,
+                    tool_response=self.format_tool_response(tool_response, vscode_env, focus_items),
                     tool_status=tool_response.status,
                 )
-            ),
+                for tool_response in tool_responses
+            ],
         )
-        if not updated_chat:
-            raise Exception("Failed to update tool use chat with response")
-        return updated_chat
+
+        missing_tool_use_ids = [resp.tool_use_id for resp in tool_responses if resp.tool_use_id not in updated_chats]
+        if missing_tool_use_ids:
+            raise Exception(f"tool use request not found: {missing_tool_use_ids}")
+        return [updated_chats[tool_response.tool_use_id] for tool_response in tool_responses]
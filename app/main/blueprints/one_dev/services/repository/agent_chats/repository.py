@@ -1,5 +1,7 @@
+import json
 from datetime import datetime
-from typing import List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional
 
 from sanic.log import logger
 
@@ -9,7 +11,10 @@ from app.main.blueprints.one_dev.models.dto.agent_chats import (
     AgentChatCreateRequest,
     AgentChatDTO,
     AgentChatUpdateRequest,
+    ToolUseMessageData,
+    ToolUseResponseUpdate,
 )
+from app.main.blueprints.one_dev.services.repository.agent_chats.session_chats_snapshot import SessionChatsSnapshot
 
 
 class AgentChatsRepository:
@@ -17,7 +22,14 @@ class AgentChatsRepository:
     async def get_chats_by_session_id(cls, session_id: int) -> List[AgentChatDTO]:
         """
         Fetch all chats for a given session_id, ordered by creation time.
+        Served from the session's chat snapshot, which falls back to the database on a miss.
         """
+        return await SessionChatsSnapshot.get_chats(
+            session_id, loader=lambda: cls._fetch_chats_by_session_id(session_id)
+        )
+
+    @classmethod
+    async def _fetch_chats_by_session_id(cls, session_id: int) -> List[AgentChatDTO]:
         try:
             chats = await DB.by_filters(
                 model_name=AgentChats,
@@ -61,17 +73,69 @@ class AgentChatsRepository:
         Create a new chat entry.
         """
         try:
-            payload = chat_data.model_dump(mode="json")
+            payload = cls._get_create_payload(chat_data)
             if custom_created_at:
                 payload["created_at"] = custom_created_at
             if custom_updated_at:
                 payload["updated_at"] = custom_updated_at
             created_chat = await DB.create(AgentChats, payload)
-            return AgentChatDTO(**await created_chat.to_dict())
+            created_chat_dto = AgentChatDTO(**await created_chat.to_dict())
+            await SessionChatsSnapshot.record_write(created_chat_dto)
+            return created_chat_dto
         except Exception as ex:
             logger.error(f"Error occurred while creating agent chat for session_id: {chat_data.session_id}, ex: {ex}")
             raise ex
 
+    @classmethod
+    async def bulk_create_chats(
+        cls, chats_data: List[AgentChatCreateRequest], custom_created_at: Optional[List[datetime]] = None
+    ) -> List[AgentChatDTO]:
+        """
+        Create many chat entries with a single insert, keeping their order.
+
+        Ids are reserved from the table sequence up front, since bulk inserts do not return them.
+
+        Args:
+            chats_data (List[AgentChatCreateRequest]): The chats to create, in order
+            custom_created_at (Optional[List[datetime]]): Creation time of each chat, defaults to now
+        """
+        if not chats_data:
+            return []
+
+        try:
+            reserved_ids = await DB.raw_sql(
+                "SELECT nextval('agent_chats_id_seq') AS id FROM generate_series(1, $1)", values=[len(chats_data)]
+            )
+            chat_ids = sorted(row["id"] for row in reserved_ids)
+
+            chats: List[AgentChats] = []
+            for index, (chat_id, chat_data) in enumerate(zip(chat_ids, chats_data)):
+                payload = cls._get_create_payload(chat_data)
+                payload["id"] = chat_id
+                if custom_created_at:
+                    payload["created_at"] = custom_created_at[index]
+                    payload["updated_at"] = custom_created_at[index]
+                chats.append(AgentChats(**payload))
+
+            await DB.bulk_create(AgentChats, chats)
+            created_chat_dtos = [AgentChatDTO(**await chat.to_dict()) for chat in chats]
+            for created_chat_dto in created_chat_dtos:
+                await SessionChatsSnapshot.record_write(created_chat_dto)
+            return created_chat_dtos
+        except Exception as ex:
+            logger.error(
+                f"Error occurred while bulk creating agent chats for session_ids: "
+                f"{sorted({chat_data.session_id for chat_data in chats_data})}, ex: {ex}"
+            )
+            raise ex
+
+    @staticmethod
+    def _get_create_payload(chat_data: AgentChatCreateRequest) -> Dict[str, Any]:
+        payload = chat_data.model_dump(mode="json")
+        if isinstance(chat_data.message_data, ToolUseMessageData):
+            payload["tool_use_id"] = chat_data.message_data.tool_use_id
+        return payload
+
     @classmethod
     async def update_chat(cls, chat_id: int, update_data: AgentChatUpdateRequest) -> Optional[AgentChatDTO]:
         """
@@ -95,18 +159,85 @@ class AgentChatsRepository:
                 update_fields=updated_fields,
             )
 
-            return await cls.get_chat_by_id(chat_id)
+            updated_chat = await cls.get_chat_by_id(chat_id)
+            if updated_chat:
+                await SessionChatsSnapshot.record_write(updated_chat)
+            return updated_chat
         except Exception as ex:
             logger.error(f"Error occurred while updating agent chat id: {chat_id}, ex: {ex}")
             raise ex
 
+    @classmethod
+    async def update_tool_use_responses(
+        cls, session_id: int, responses: List[ToolUseResponseUpdate]
+    ) -> Dict[str, AgentChatDTO]:
+        """
+        Store the responses of many tool uses of a session with a single UPDATE, matched on the indexed tool_use_id.
+
+        Returns:
+            Dict[str, AgentChatDTO]: The updated TOOL_USE chats by tool_use_id. Tool uses that were not found are absent.
+        """
+        if not responses:
+            return {}
+
+        try:
+            values: List[Any] = [session_id]
+            rows: List[str] = []
+            for response in responses:
+                placeholder = len(values) + 1
+                rows.append(f"(${placeholder}::varchar, ${placeholder + 1}::jsonb, ${placeholder + 2}::varchar)")
+                values.extend([response.tool_use_id, json.dumps(response.tool_response), response.tool_status.value])
+
+            # chats written before tool_use_id was a column are matched on message_data, and backfilled on the way
+            query = f"""
+                UPDATE agent_chats AS chats
+                SET message_data = chats.message_data || jsonb_build_object(
+                        'tool_response', updates.tool_response, 'tool_status', updates.tool_status
+                    ),
+                    tool_use_id = updates.tool_use_id,
+                    updated_at = NOW()
+                FROM (VALUES {", ".join(rows)}) AS updates (tool_use_id, tool_response, tool_status)
+                WHERE chats.session_id = $1
+                    AND chats.message_type = 'TOOL_USE'
+                    AND (
+                        chats.tool_use_id = updates.tool_use_id
+                        OR (chats.tool_use_id IS NULL AND chats.message_data ->> 'tool_use_id' = updates.tool_use_id)
+                    )
+                RETURNING chats.*
+            """
+            updated_rows = await DB.raw_sql(query, values=values)
+
+            updated_chats: Dict[str, AgentChatDTO] = {}
+            for row in updated_rows:
+                chat_dto = cls._chat_from_row(row)
+                await SessionChatsSnapshot.record_write(chat_dto)
+                updated_chats[chat_dto.message_data.tool_use_id] = chat_dto
+            return updated_chats
+        except Exception as ex:
+            logger.error(f"Error occurred while storing tool use responses for session_id: {session_id}, ex: {ex}")
+            raise ex
+
+    # columns returned as JSON text by raw queries, which bypass the decoding of the model's JSONFields
+    JSON_COLUMNS = ("previous_queries", "message_data", "metadata")
+
+    @classmethod
+    def _chat_from_row(cls, row: Dict[str, Any]) -> AgentChatDTO:
+        chat = {key: value for key, value in row.items() if key in AgentChats.serializable_keys}
+        for column in cls.JSON_COLUMNS:
+            if isinstance(chat.get(column), str):
+                chat[column] = json.loads(chat[column])
+        return AgentChatDTO(**chat)
+
     @classmethod
     async def delete_chat(cls, chat_id: int) -> bool:
         """
         Delete a chat entry by ID.
         """
         try:
+            chat = await cls.get_chat_by_id(chat_id)
             await DB.delete_with_filters(model=AgentChats, where_clause={"id": chat_id})
+            if chat:
+                await SessionChatsSnapshot.record_delete(chat.session_id, chat_id)
             return True
         except Exception as ex:
             logger.error(f"Error occurred while deleting agent chat id: {chat_id}, ex: {ex}")
@@ -139,39 +270,18 @@ class AgentChatsRepository:
         """
         Fetch chats by session_id and actor type (USER/ASSISTANT).
         """
-        try:
-            chats = await DB.by_filters(
-                model_name=AgentChats,
-                where_clause={"session_id": session_id, "actor": actor},
-                fetch_one=False,
-                order_by="created_at",
-            )
-            if not chats:
-                return []
-            return [AgentChatDTO(**chat) for chat in chats]
-        except Exception as ex:
-            logger.error(
-                f"Error occurred while fetching agent chats for session_id: {session_id}, actor: {actor}, ex: {ex}"
-            )
-            raise ex
+        chats = await cls.get_chats_by_session_id(session_id)
+        return [chat for chat in chats if cls._matches(chat.actor, actor)]
 
     @classmethod
     async def get_chats_by_message_type_and_session(cls, session_id: int, message_type: str) -> List[AgentChatDTO]:
         """
         Fetch chats by session_id and message type (TEXT/TOOL_USE/INFO).
         """
-        try:
-            chats = await DB.by_filters(
-                model_name=AgentChats,
-                where_clause={"session_id": session_id, "message_type": message_type},
-                fetch_one=False,
-                order_by="created_at",
-            )
-            if not chats:
-                return []
-            return [AgentChatDTO(**chat) for chat in chats]
-        except Exception as ex:
-            logger.error(
-                f"Error occurred while fetching agent chats for session_id: {session_id}, message_type: {message_type}, ex: {ex}"
-            )
-            raise ex
+        chats = await cls.get_chats_by_session_id(session_id)
+        return [chat for chat in chats if cls._matches(chat.message_type, message_type)]
+
+    @staticmethod
+    def _matches(value: Enum, expected: str) -> bool:
+        """Case-insensitive comparison, mirroring the CITEXT columns these filters used to query."""
+        return value.value.lower() == getattr(expected, "value", expected).lower()
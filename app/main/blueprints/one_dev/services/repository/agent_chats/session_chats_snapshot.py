@@ -0,0 +1,132 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from deputydev_core.utils.app_logger import AppLogger
+
+from app.backend_common.caches.agent_chats_snapshot_cache import AgentChatsSnapshotCache
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.main.blueprints.one_dev.models.dto.agent_chats import AgentChatDTO
+
+VersionedChats = Tuple[int, Dict[int, AgentChatDTO]]
+
+
+class SessionChatsSnapshot:
+    """
+    Versioned snapshot of all agent chats of a session, shared by every history read in a query turn.
+
+    L1 is an in-process LRU of validated DTOs, L2 is `AgentChatsSnapshotCache` in Redis. Writes made
+    through `AgentChatsRepository` are applied to both tiers and bump the session version, so a
+    read costs a single Redis GET while the local copy is current, and Postgres is only queried
+    when no tier holds the session.
+
+    Chats are copied on their way in and out of the local tier, so callers are free to mutate them.
+    """
+
+    MAX_LOCAL_SESSIONS = 512
+
+    # Must stay well below AgentChatsSnapshotCache.VERSION_EXPIRE_IN_SEC
+    LOCAL_TTL = 600
+
+    _local: LocalLRUCache[int, VersionedChats] = LocalLRUCache(max_size=MAX_LOCAL_SESSIONS, ttl=LOCAL_TTL)
+
+    @classmethod
+    async def get_chats(
+        cls, session_id: int, loader: Callable[[], Awaitable[List[AgentChatDTO]]]
+    ) -> List[AgentChatDTO]:
+        """
+        Return all chats of the session ordered by creation time.
+
+        Args:
+            session_id (int): The session to read
+            loader (Callable[[], Awaitable[List[AgentChatDTO]]]): Loads the chats from the database on a full miss
+        """
+        try:
+            version, chats = await cls._get_cached_chats(session_id)
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Agent chats snapshot unavailable for session_id: {session_id}, ex: {ex}")
+            return await loader()
+
+        if chats is None:
+            chats = await cls._load_and_populate(session_id, version, loader)
+        return [chat.model_copy(deep=True) for chat in cls._ordered(chats)]
+
+    @classmethod
+    async def record_write(cls, chat: AgentChatDTO) -> None:
+        """Apply a created or updated chat to the snapshot."""
+        await cls._record(chat.session_id, chat.id, chat)
+
+    @classmethod
+    async def record_delete(cls, session_id: int, chat_id: int) -> None:
+        """Remove a deleted chat from the snapshot."""
+        await cls._record(session_id, chat_id, None)
+
+    @classmethod
+    async def _get_cached_chats(cls, session_id: int) -> Tuple[int, Optional[Dict[int, AgentChatDTO]]]:
+        """Return the current session version and its chats, if any tier holds them."""
+        local = cls._local.get(session_id)
+        if local is not None:
+            version = await AgentChatsSnapshotCache.get_version(session_id)
+            if local[0] == version:
+                return version, local[1]
+
+        version, cached = await AgentChatsSnapshotCache.get_snapshot(session_id)
+        if cached is None:
+            return version, None
+
+        chats = {int(chat_id): AgentChatDTO.model_validate_json(chat) for chat_id, chat in cached.items()}
+        cls._local.set(session_id, (version, chats))
+        return version, chats
+
+    @classmethod
+    async def _load_and_populate(
+        cls, session_id: int, version: int, loader: Callable[[], Awaitable[List[AgentChatDTO]]]
+    ) -> Dict[int, AgentChatDTO]:
+        # `version` was read before loading, so a write racing with the load prevents caching a stale result
+        chats = {chat.id: chat for chat in await loader()}
+        try:
+            populated = await AgentChatsSnapshotCache.populate(
+                session_id, version, {chat_id: chat.model_dump_json() for chat_id, chat in chats.items()}
+            )
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to cache agent chats snapshot for session_id: {session_id}, ex: {ex}")
+            return chats
+
+        if populated:
+            cls._local.set(session_id, (version, chats))
+        return chats
+
+    @classmethod
+    async def _record(cls, session_id: int, chat_id: int, chat: Optional[AgentChatDTO]) -> None:
+        try:
+            version = await AgentChatsSnapshotCache.record_write(
+                session_id, chat_id, chat.model_dump_json() if chat else None
+            )
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to update agent chats snapshot for session_id: {session_id}, ex: {ex}")
+            cls._local.pop(session_id)
+            await cls._invalidate(session_id)
+            return
+
+        local = cls._local.get(session_id)
+        if local is None or local[0] != version - 1:
+            # another write happened elsewhere in between, the local copy can not be patched
+            cls._local.pop(session_id)
+            return
+
+        chats = local[1]
+        if chat:
+            chats[chat_id] = chat.model_copy(deep=True)
+        else:
+            chats.pop(chat_id, None)
+        cls._local.set(session_id, (version, chats))
+
+    @classmethod
+    async def _invalidate(cls, session_id: int) -> None:
+        # without the write applied, the shared snapshot would serve other workers stale chats until it expires
+        try:
+            await AgentChatsSnapshotCache.invalidate(session_id)
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to invalidate agent chats snapshot for session_id: {session_id}, ex: {ex}")
+
+    @staticmethod
+    def _ordered(chats: Dict[int, AgentChatDTO]) -> List[AgentChatDTO]:
+        return sorted(chats.values(), key=lambda chat: (chat.created_at, chat.id))
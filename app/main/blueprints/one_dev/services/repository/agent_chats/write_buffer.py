@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Optional, Set, Tuple
+
+from deputydev_core.utils.app_logger import AppLogger
+
+from app.main.blueprints.one_dev.models.dto.agent_chats import AgentChatCreateRequest, AgentChatDTO
+from app.main.blueprints.one_dev.services.repository.agent_chats.repository import AgentChatsRepository
+
+
+class AgentChatsWriteBuffer:
+    """
+    Write-behind buffer for the chats produced while streaming one query turn of a session.
+
+    `add` never waits on the database: chats are queued with their creation time and written in order
+    with a single bulk insert, once `max_buffered_chats` are pending or `flush_interval` seconds after the
+    first pending chat was added. Flushes are serialized, so chats keep their relative order in the table.
+
+    Callers must `flush` before announcing the end of the turn, as that is the only point where
+    durability is guaranteed; chats of a failed background flush are kept and retried by the next flush.
+    """
+
+    # Maximum time (in seconds) a chat waits before it is written
+    FLUSH_INTERVAL = 0.5
+
+    # Flush in the background as soon as this many chats are pending
+    MAX_BUFFERED_CHATS = 16
+
+    def __init__(
+        self,
+        session_id: int,
+        flush_interval: Optional[float] = None,
+        max_buffered_chats: Optional[int] = None,
+    ) -> None:
+        self.session_id = session_id
+        self.flush_interval = flush_interval if flush_interval is not None else self.FLUSH_INTERVAL
+        self.max_buffered_chats = max_buffered_chats or self.MAX_BUFFERED_CHATS
+
+        self._buffer: List[Tuple[AgentChatCreateRequest, datetime]] = []
+        self._lock = asyncio.Lock()
+        self._timer_task: Optional[asyncio.Task[None]] = None
+        self._background_flushes: Set[asyncio.Task[None]] = set()
+
+    def add(self, chat_data: AgentChatCreateRequest) -> None:
+        """Queue a chat for persistence, recording its creation time now."""
+        self._buffer.append((chat_data, datetime.now(timezone.utc)))
+
+        if len(self._buffer) >= self.max_buffered_chats:
+            self._flush_in_background()
+        elif self._timer_task is None:
+            self._timer_task = asyncio.create_task(self._flush_after_interval())
+
+    async def flush(self) -> List[AgentChatDTO]:
+        """
+        Write all pending chats, including those of any in-flight background flush.
+
+        Returns:
+            List[AgentChatDTO]: The chats written by this call
+
+        Raises:
+            Exception: If the chats could not be written; they stay pending for the next flush
+        """
+        self._cancel_timer()
+        async with self._lock:
+            pending, self._buffer = self._buffer, []
+            if not pending:
+                return []
+
+            try:
+                return await AgentChatsRepository.bulk_create_chats(
+                    [chat_data for chat_data, _created_at in pending],
+                    custom_created_at=[created_at for _chat_data, created_at in pending],
+                )
+            except Exception:
+                # put the chats back ahead of anything added meanwhile, so that ordering is kept on retry
+                self._buffer = pending + self._buffer
+                raise
+
+    async def close(self) -> None:
+        """Best-effort flush of whatever is still pending, for turns that end abnormally."""
+        try:
+            await self.flush()
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(
+                f"Failed to persist {len(self._buffer)} buffered agent chats for session_id: {self.session_id}, "
+                f"ex: {ex}"
+            )
+
+    def _cancel_timer(self) -> None:
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            self._timer_task = None
+
+    def _flush_in_background(self) -> None:
+        self._cancel_timer()
+        task = asyncio.create_task(self._flush_logging_errors())
+        self._background_flushes.add(task)
+        task.add_done_callback(self._background_flushes.discard)
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        # detach before flushing so that a concurrent flush does not cancel an in-flight write
+        self._timer_task = None
+        await self._flush_logging_errors()
+
+    async def _flush_logging_errors(self) -> None:
+        try:
+            await self.flush()
+        except Exception as ex:  # noqa: BLE001
+            AppLogger.log_error(f"Failed to flush buffered agent chats for session_id: {self.session_id}, ex: {ex}")
@@ -2,11 +2,16 @@ import asyncio
 from typing import Optional
 
 from app.backend_common.caches.code_gen_tasks_cache import CodeGenTasksCache
+from app.main.blueprints.one_dev.utils.cancellation_subscriber import CancellationSubscriber
 
 
 class CancellationChecker:
     """
-    Periodic checker that monitors Redis for task cancellation across servers
+    Monitors task cancellation across servers.
+
+    Cancellations are pushed through the worker's shared `CancellationSubscriber`. Redis is only
+    polled once at start (to catch cancellations issued before subscribing) and while the
+    subscriber is not listening.
     """
 
     def __init__(self, session_id: int, check_interval: float = 1) -> None:
@@ -17,13 +22,15 @@ class CancellationChecker:
         self._checker_task: Optional[asyncio.Task] = None
 
     async def start_monitoring(self) -> None:
-        """Start the periodic cancellation check"""
+        """Start the cancellation check"""
         # Reset our local cancelled event
         self.cancelled_event.clear()
+        CancellationSubscriber.register(self.session_id, self.cancelled_event)
         self._checker_task = asyncio.create_task(self.check_cancellation())
 
     async def stop_monitoring(self) -> None:
-        """Stop the periodic cancellation check"""
+        """Stop the cancellation check"""
+        CancellationSubscriber.unregister(self.session_id, self.cancelled_event)
         if self._checker_task and not self._checker_task.done():
             self._checker_task.cancel()
             try:
@@ -32,13 +39,18 @@ class CancellationChecker:
                 pass
 
     async def check_cancellation(self) -> None:
-        """Periodically check Redis for cancellation status"""
+        """Check Redis for cancellation status once, then only while pub/sub delivery is unavailable"""
         try:
-            while True:
-                if await CodeGenTasksCache.is_session_cancelled(self.session_id):
+            poll_redis = True
+            while not self.cancelled_event.is_set():
+                if poll_redis and await CodeGenTasksCache.is_session_cancelled(self.session_id):
                     self.cancelled_event.set()
                     break
-                await asyncio.sleep(self.check_interval)
+                try:
+                    await asyncio.wait_for(self.cancelled_event.wait(), timeout=self.check_interval)
+                except asyncio.TimeoutError:
+                    pass
+                poll_redis = not CancellationSubscriber.is_listening()
         except asyncio.CancelledError:
             pass
 
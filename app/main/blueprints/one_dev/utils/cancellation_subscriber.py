@@ -0,0 +1,104 @@
+import asyncio
+import json
+from typing import Dict, Optional, Set
+
+from deputydev_core.utils.app_logger import AppLogger
+
+from app.backend_common.caches.code_gen_tasks_cache import CodeGenTasksCache
+
+
+class CancellationSubscriber:
+    """
+    Per-worker Redis pub/sub subscriber that fans session cancellations out to in-process events.
+
+    A single subscription to `CodeGenTasksCache.cancellation_channel()` is shared by every
+    `CancellationChecker` running in the worker. While the subscription is down, `is_listening`
+    returns False so that checkers can fall back to polling Redis.
+    """
+
+    # Seconds a single read on the pub/sub connection waits for a message
+    POLL_TIMEOUT = 1.0
+
+    # Seconds to wait before re-subscribing after the connection is lost
+    RECONNECT_BACKOFF = 1.0
+
+    _session_events: Dict[int, Set[asyncio.Event]] = {}
+    _listener_task: Optional[asyncio.Task[None]] = None
+    _listening: bool = False
+
+    @classmethod
+    def register(cls, session_id: int, event: asyncio.Event) -> None:
+        """Register an event to be set when the given session is cancelled."""
+        cls._session_events.setdefault(session_id, set()).add(event)
+        cls._ensure_listener()
+
+    @classmethod
+    def unregister(cls, session_id: int, event: asyncio.Event) -> None:
+        """Stop delivering cancellations of the given session to the event."""
+        events = cls._session_events.get(session_id)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            cls._session_events.pop(session_id, None)
+
+    @classmethod
+    def is_listening(cls) -> bool:
+        """Whether cancellations are currently being received through the subscription."""
+        return cls._listening
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop the listener task, if running."""
+        if cls._listener_task and not cls._listener_task.done():
+            cls._listener_task.cancel()
+            try:
+                await cls._listener_task
+            except asyncio.CancelledError:
+                pass
+        cls._listener_task = None
+        cls._listening = False
+
+    @classmethod
+    def _ensure_listener(cls) -> None:
+        if cls._listener_task is None or cls._listener_task.done():
+            cls._listener_task = asyncio.create_task(cls._listen())
+
+    @classmethod
+    def _dispatch(cls, session_id: int) -> None:
+        for event in cls._session_events.get(session_id, ()):
+            event.set()
+
+    @classmethod
+    async def _resync_registered_sessions(cls) -> None:
+        """Catch up on cancellations that may have been published while the subscription was down."""
+        for session_id in list(cls._session_events.keys()):
+            if await CodeGenTasksCache.is_session_cancelled(session_id):
+                cls._dispatch(session_id)
+
+    @classmethod
+    async def _listen(cls) -> None:
+        channel = CodeGenTasksCache.cancellation_channel()
+        while True:
+            pubsub = CodeGenTasksCache.get_pubsub()
+            try:
+                await pubsub.subscribe(channel)
+                cls._listening = True
+                await cls._resync_registered_sessions()
+
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=cls.POLL_TIMEOUT)
+                    if message and message.get("type") == "message":
+                        cls._dispatch(int(json.loads(message["data"])))
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:  # noqa: BLE001
+                AppLogger.log_error(f"Cancellation subscriber lost connection, falling back to polling: {ex}")
+            finally:
+                cls._listening = False
+                try:
+                    await pubsub.aclose()
+                except Exception:  # noqa: BLE001
+                    pass
+
+            await asyncio.sleep(cls.RECONNECT_BACKOFF)
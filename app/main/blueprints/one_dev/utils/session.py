@@ -14,17 +14,25 @@ from app.backend_common.repository.message_sessions.repository import (
 from app.backend_common.utils.dataclasses.main import AuthData, ClientData
 from app.backend_common.utils.sanic_wrapper import Request
 from app.backend_common.utils.sanic_wrapper.exceptions import BadRequestException
+from app.main.blueprints.one_dev.utils.session_validation_cache import SessionValidationCache
 
 
 async def get_stored_session(session_id: Optional[int] = None) -> Optional[MessageSessionDTO]:
     """
     Check if the session ID is valid.
+    Recently validated sessions are served from SessionValidationCache.
     """
     if not session_id:
         return None
 
     try:
+        cached_session = SessionValidationCache.get(int(session_id))
+        if cached_session:
+            return cached_session
+
         session = await MessageSessionsRepository.get_by_id(session_id=session_id)
+        if session:
+            SessionValidationCache.set(session)
         return session
     except Exception as _ex:  # noqa: BLE001
         AppLogger.log_error(f"Error occurred while fetching session from DB: {str(_ex)}")
@@ -45,6 +53,7 @@ async def create_new_session(session_type: str, client_data: ClientData, auth_da
             session_type=session_type,
         )
     )
+    SessionValidationCache.set(message_session)
     return message_session
 
 
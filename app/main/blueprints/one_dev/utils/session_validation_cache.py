@@ -0,0 +1,35 @@
+from typing import Optional
+
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.backend_common.models.dto.message_sessions_dto import MessageSessionDTO
+
+
+class SessionValidationCache:
+    """
+    Per-worker cache of message sessions validated by `ensure_session_id`.
+
+    IDE clients send dozens of requests per minute in the same session, so the session row is kept here
+    for `TTL` seconds instead of being read from Postgres on every request. Entries must be invalidated
+    when a session is deleted or changes owner; workers other than the one doing so may keep the entry
+    for at most `TTL` seconds. Only the identity and ownership of the cached session are meant to be
+    relied upon, other fields (like the summary) may be stale.
+    """
+
+    MAX_SESSIONS = 10000
+
+    # Seconds a validated session is trusted without going back to the database
+    TTL = 60
+
+    _sessions: LocalLRUCache[int, MessageSessionDTO] = LocalLRUCache(max_size=MAX_SESSIONS, ttl=TTL)
+
+    @classmethod
+    def get(cls, session_id: int) -> Optional[MessageSessionDTO]:
+        return cls._sessions.get(session_id)
+
+    @classmethod
+    def set(cls, session: MessageSessionDTO) -> None:
+        cls._sessions.set(session.id, session)
+
+    @classmethod
+    def invalidate(cls, session_id: int) -> None:
+        cls._sessions.pop(session_id)
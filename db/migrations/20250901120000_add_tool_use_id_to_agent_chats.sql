@@ -0,0 +1,12 @@
+-- migrate:up
+ALTER TABLE agent_chats ADD COLUMN tool_use_id VARCHAR NULL;
+
+UPDATE agent_chats
+SET tool_use_id = message_data ->> 'tool_use_id'
+WHERE message_type = 'TOOL_USE';
+
+CREATE INDEX agent_chats_session_id_tool_use_id ON agent_chats (session_id, tool_use_id);
+
+-- migrate:down
+DROP INDEX IF EXISTS agent_chats_session_id_tool_use_id;
+ALTER TABLE agent_chats DROP COLUMN tool_use_id;
@@ -0,0 +1,52 @@
+"""
+Unit tests for LocalEmbeddingCache.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from app.backend_common.caches.local_embedding_cache import LocalEmbeddingCache
+
+
+class TestLocalEmbeddingCache:
+    """Test class for LocalEmbeddingCache."""
+
+    def test_vectors_round_trip_as_float32(self, tmp_path: Path) -> None:
+        cache = LocalEmbeddingCache(max_size=4, directory=str(tmp_path))
+        vector = np.array([0.1, 0.2, 0.3], dtype=np.float64)
+
+        cache.set_many({"a": vector})
+
+        cached_vector, missing = cache.get_many(["a", "b"])
+        assert missing is None
+        assert cached_vector.dtype == np.float32
+        np.testing.assert_allclose(cached_vector, vector, rtol=1e-6)
+
+    def test_memory_mapped_file_leaves_nothing_behind(self, tmp_path: Path) -> None:
+        cache = LocalEmbeddingCache(max_size=4, directory=str(tmp_path))
+        cache.set_many({"a": np.ones(8), "b": np.zeros(8)})
+
+        a, b = cache.get_many(["a", "b"])
+
+        assert a.tolist() == [1.0] * 8 and b.tolist() == [0.0] * 8
+        assert list(tmp_path.iterdir()) == []
+
+    def test_least_recently_used_slot_is_reused(self, tmp_path: Path) -> None:
+        cache = LocalEmbeddingCache(max_size=2, directory=str(tmp_path))
+        cache.set_many({"a": np.full(2, 1.0), "b": np.full(2, 2.0)})
+        cache.get_many(["a"])  # "b" is now the least recently used vector
+
+        cache.set_many({"c": np.full(2, 3.0)})
+
+        a, b, c = cache.get_many(["a", "b", "c"])
+        assert b is None
+        assert a.tolist() == [1.0, 1.0] and c.tolist() == [3.0, 3.0]
+        assert len(cache) == 2
+
+    def test_vectors_of_other_dimensions_are_not_cached(self, tmp_path: Path) -> None:
+        cache = LocalEmbeddingCache(max_size=2, directory=str(tmp_path))
+        cache.set_many({"a": np.ones(3), "b": np.ones(4)})
+
+        assert cache.get_many(["b"]) == [None]
+        assert len(cache) == 1
@@ -0,0 +1,52 @@
+"""
+Unit tests for LocalLRUCache.
+"""
+
+from unittest.mock import patch
+
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+
+MONOTONIC_PATH = "app.backend_common.caches.local_lru_cache.time.monotonic"
+
+
+class TestLocalLRUCache:
+    """Test class for LocalLRUCache."""
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: LocalLRUCache[str, int] = LocalLRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now the least recently used entry
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self) -> None:
+        cache: LocalLRUCache[str, int] = LocalLRUCache(max_size=10, ttl=5)
+        with patch(MONOTONIC_PATH, return_value=100.0):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl=60)
+
+        with patch(MONOTONIC_PATH, return_value=104.9):
+            assert cache.get("a") == 1
+
+        with patch(MONOTONIC_PATH, return_value=105.0):
+            assert cache.get("a") is None
+            assert "a" not in cache
+            assert cache.get("b") == 2
+
+    def test_pop_and_clear(self) -> None:
+        cache: LocalLRUCache[int, str] = LocalLRUCache(max_size=10)
+        cache.set(1, "one")
+        cache.set(2, "two")
+
+        assert cache.pop(1) == "one"
+        assert cache.pop(1) is None
+        assert cache.get(2) == "two"
+
+        cache.clear()
+        assert len(cache) == 0
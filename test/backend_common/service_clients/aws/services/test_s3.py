@@ -0,0 +1,118 @@
+"""
+Unit tests for the streaming, ranged and bounded reads and the streaming uploads of AWSS3ServiceClient.
+"""
+
+from typing import AsyncIterator, Iterator, List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.backend_common.exception.exception import S3ObjectTooLargeError
+from app.backend_common.service_clients.aws.services.s3 import AWSS3ServiceClient
+
+BUCKET_NAME = "bucket"
+
+
+class StreamingBody:
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    async def __aenter__(self) -> "StreamingBody":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    async def read(self) -> bytes:
+        return self.data
+
+    async def iter_chunks(self, chunk_size: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start : start + chunk_size]
+
+
+async def stream(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.fixture
+def s3_client() -> Iterator[MagicMock]:
+    mock_s3_client = MagicMock()
+    mock_s3_client.create_multipart_upload = AsyncMock(return_value={"UploadId": "upload-id"})
+    mock_s3_client.upload_part = AsyncMock(
+        side_effect=lambda **params: {"ETag": f"etag-{params['PartNumber']}-{len(params['Body'])}"}
+    )
+    mock_s3_client.complete_multipart_upload = AsyncMock()
+    mock_s3_client.abort_multipart_upload = AsyncMock()
+    mock_s3_client.put_object = AsyncMock()
+    yield mock_s3_client
+
+
+@pytest.fixture
+def client(s3_client: MagicMock) -> Iterator[AWSS3ServiceClient]:
+    client = AWSS3ServiceClient.__new__(AWSS3ServiceClient)
+    client.bucket_name = BUCKET_NAME
+    client.aws_client_manager = MagicMock(get_client=AsyncMock(return_value=s3_client))
+    with patch.object(AWSS3ServiceClient, "MULTIPART_PART_SIZE", 4):
+        yield client
+
+
+class TestAWSS3ServiceClientStreaming:
+    """Test class for the streaming APIs of AWSS3ServiceClient."""
+
+    @pytest.mark.asyncio
+    async def test_ranged_object_is_streamed_in_chunks(self, client: AWSS3ServiceClient, s3_client: MagicMock) -> None:
+        s3_client.get_object = AsyncMock(return_value={"Body": StreamingBody(b"abcdefg"), "ContentLength": 7})
+
+        chunks = [chunk async for chunk in client.iter_object("key", chunk_size=3, byte_range=(10, 16))]
+
+        assert chunks == [b"abc", b"def", b"g"]
+        s3_client.get_object.assert_awaited_once_with(Bucket=BUCKET_NAME, Key="key", Range="bytes=10-16")
+
+    @pytest.mark.asyncio
+    async def test_object_over_budget_is_rejected(self, client: AWSS3ServiceClient, s3_client: MagicMock) -> None:
+        s3_client.get_object = AsyncMock(return_value={"Body": StreamingBody(b"abcdefg"), "ContentLength": 7})
+
+        assert await client.get_object("key", max_bytes=7) == b"abcdefg"
+        with pytest.raises(S3ObjectTooLargeError):
+            await client.get_object("key", max_bytes=6)
+
+    @pytest.mark.asyncio
+    async def test_large_stream_is_uploaded_in_parts(self, client: AWSS3ServiceClient, s3_client: MagicMock) -> None:
+        await client.upload_stream("key", stream([b"abc", b"defgh", b"ij"]), content_type="application/json")
+
+        s3_client.create_multipart_upload.assert_awaited_once_with(
+            Bucket=BUCKET_NAME, Key="key", ContentType="application/json"
+        )
+        assert [call.kwargs["Body"] for call in s3_client.upload_part.await_args_list] == [b"abcd", b"efgh", b"ij"]
+        s3_client.complete_multipart_upload.assert_awaited_once_with(
+            Bucket=BUCKET_NAME,
+            Key="key",
+            UploadId="upload-id",
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": "etag-1-4", "PartNumber": 1},
+                    {"ETag": "etag-2-4", "PartNumber": 2},
+                    {"ETag": "etag-3-2", "PartNumber": 3},
+                ]
+            },
+        )
+        s3_client.put_object.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_small_stream_is_put_at_once(self, client: AWSS3ServiceClient, s3_client: MagicMock) -> None:
+        await client.upload_stream("key", stream([b"ab", b"c"]))
+
+        s3_client.put_object.assert_awaited_once_with(Bucket=BUCKET_NAME, Key="key", Body=b"abc")
+        s3_client.create_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_upload(self, client: AWSS3ServiceClient, s3_client: MagicMock) -> None:
+        s3_client.upload_part.side_effect = ConnectionError("S3 unavailable")
+
+        with pytest.raises(ConnectionError):
+            await client.upload_stream("key", stream([b"abcdefgh"]))
+
+        s3_client.abort_multipart_upload.assert_awaited_once_with(Bucket=BUCKET_NAME, Key="key", UploadId="upload-id")
+        s3_client.complete_multipart_upload.assert_not_called()
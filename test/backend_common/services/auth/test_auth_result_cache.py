@@ -0,0 +1,98 @@
+"""
+Unit tests for AuthResultCache.
+
+Covers the local and Redis tiers, token expiry handling and revocation of cached
+auth service responses. Redis is never touched: AuthCache is patched.
+"""
+
+import time
+from typing import Any, Dict, Iterator, Optional
+from unittest.mock import AsyncMock, patch
+
+import jwt
+import pytest
+
+from app.backend_common.services.auth.auth_result_cache import AuthResultCache
+
+AUTH_CACHE_PATH = "app.backend_common.services.auth.auth_result_cache.AuthCache"
+
+
+def _authorization_header(expires_in: Optional[int] = None) -> str:
+    claims: Dict[str, Any] = {"sub": "user"}
+    if expires_in is not None:
+        claims["exp"] = int(time.time()) + expires_in
+    return f"Bearer {jwt.encode(claims, key='secret', algorithm='HS256')}"
+
+
+def _auth_response(session_refresh_token: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "auth_data": {"user_team_id": 1, "session_refresh_token": session_refresh_token},
+        "response_headers": {},
+    }
+
+
+@pytest.fixture(autouse=True)
+def cache_config() -> Iterator[None]:
+    AuthResultCache._local.clear()
+    with patch.object(AuthResultCache, "_config", return_value={"ENABLED": True, "REDIS_ENABLED": True, "TTL": 300}):
+        yield
+    AuthResultCache._local.clear()
+
+
+class TestAuthResultCache:
+    """Test class for AuthResultCache."""
+
+    @pytest.mark.asyncio
+    async def test_cached_response_is_served_locally(self) -> None:
+        header = _authorization_header(expires_in=3600)
+        with (
+            patch(f"{AUTH_CACHE_PATH}.set", new_callable=AsyncMock) as mock_set,
+            patch(f"{AUTH_CACHE_PATH}.get", new_callable=AsyncMock) as mock_get,
+        ):
+            await AuthResultCache.set(header, _auth_response())
+            cached = await AuthResultCache.get(header)
+
+        assert cached == _auth_response()
+        mock_get.assert_not_called()
+        assert mock_set.call_args.kwargs["expire"] == 300
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_is_used_on_local_miss(self) -> None:
+        header = _authorization_header()
+        with patch(f"{AUTH_CACHE_PATH}.get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = {"auth_response": _auth_response(), "expires_at": time.time() + 60}
+            cached = await AuthResultCache.get(header)
+
+        assert cached == _auth_response()
+        mock_get.assert_called_once_with(AuthResultCache.cache_key(header))
+
+    @pytest.mark.asyncio
+    async def test_ttl_is_bounded_by_token_expiry(self) -> None:
+        header = _authorization_header(expires_in=60)
+        with patch(f"{AUTH_CACHE_PATH}.set", new_callable=AsyncMock) as mock_set:
+            await AuthResultCache.set(header, _auth_response())
+
+        assert mock_set.call_args.kwargs["expire"] <= 60 - AuthResultCache.EXPIRY_LEEWAY
+
+    @pytest.mark.asyncio
+    async def test_expired_token_and_token_rotation_are_not_cached(self) -> None:
+        with patch(f"{AUTH_CACHE_PATH}.set", new_callable=AsyncMock) as mock_set:
+            await AuthResultCache.set(_authorization_header(expires_in=-10), _auth_response())
+            await AuthResultCache.set(_authorization_header(), _auth_response(session_refresh_token="new"))
+
+        mock_set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_revoke_removes_both_tiers(self) -> None:
+        header = _authorization_header()
+        with (
+            patch(f"{AUTH_CACHE_PATH}.set", new_callable=AsyncMock),
+            patch(f"{AUTH_CACHE_PATH}.delete", new_callable=AsyncMock) as mock_delete,
+            patch(f"{AUTH_CACHE_PATH}.get", new_callable=AsyncMock, return_value=None),
+        ):
+            await AuthResultCache.set(header, _auth_response())
+            await AuthResultCache.revoke(header)
+            cached = await AuthResultCache.get(header)
+
+        assert cached is None
+        mock_delete.assert_called_once_with([AuthResultCache.cache_key(header)])
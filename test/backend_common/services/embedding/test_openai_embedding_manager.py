@@ -0,0 +1,194 @@
+"""
+Unit tests for the cache first embedding of OpenAIEmbeddingManager and its batch scheduler.
+
+Covers the lookup of all texts across the local and Redis tiers ahead of batching, the batching,
+embedding and storage of the misses only, and the order and retries of the sliding window of batches.
+OpenAI and Redis are never touched: a stub embedder and an in memory CommonCache stand in for them.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from app.backend_common.caches.local_embedding_cache import LocalEmbeddingCache
+from app.backend_common.services.embedding.openai_embedding_manager import OpenAIEmbeddingManager
+
+MANAGER_PATH = "app.backend_common.services.embedding.openai_embedding_manager"
+
+
+def embed(text: str) -> NDArray[np.float32]:
+    return np.full(4, len(text), dtype=np.float32)
+
+
+class StubEmbedder:
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+
+    async def embed_batch(self, batch: List[str]) -> Tuple[NDArray[np.float64], int]:
+        self.batches.append(batch)
+        return np.array([embed(text) for text in batch], dtype=np.float64), len(batch)
+
+
+@pytest.fixture
+def redis() -> Iterator[Tuple[Dict[str, bytes], MagicMock]]:
+    stored: Dict[str, bytes] = {}
+
+    async def mget(keys: List[str]) -> List[bytes]:
+        return [stored.get(key) for key in keys]
+
+    async def mset_with_expire(mapping: Dict[str, NDArray[np.floating]]) -> None:
+        stored.update({key: value.astype(np.float32).tobytes() for key, value in mapping.items()})
+
+    with patch(f"{MANAGER_PATH}.CommonCache") as mock_cache:
+        mock_cache.mget = AsyncMock(side_effect=mget)
+        mock_cache.mset_with_expire = AsyncMock(side_effect=mset_with_expire)
+        mock_cache.expire_many = AsyncMock()
+        mock_cache._mset_with_expire_max_keys_limit = 2
+        yield stored, mock_cache
+
+
+@pytest.fixture
+def embedder(tmp_path: Path) -> Iterator[StubEmbedder]:
+    stub_embedder = StubEmbedder()
+    tiktoken_client = MagicMock()
+    tiktoken_client.count.side_effect = lambda text, model: len(text.split())
+    with (
+        patch(f"{MANAGER_PATH}.config", {"EMBEDDING": {"TOKEN_LIMIT": 8192, "MODEL": "embedding-model"}}),
+        patch(f"{MANAGER_PATH}.TikToken", return_value=tiktoken_client),
+        patch.object(OpenAIEmbeddingManager, "_embed_batch", side_effect=stub_embedder.embed_batch),
+        patch.object(OpenAIEmbeddingManager, "_get_cache_keys", side_effect=lambda texts: texts),
+        patch.object(
+            OpenAIEmbeddingManager, "_get_local_cache", return_value=LocalEmbeddingCache(10, directory=str(tmp_path))
+        ),
+    ):
+        yield stub_embedder
+
+
+class TestOpenAIEmbeddingManagerCacheFirst:
+    """Test class for the cache first embedding of OpenAIEmbeddingManager."""
+
+    @pytest.mark.asyncio
+    async def test_only_misses_are_embedded_once(
+        self, embedder: StubEmbedder, redis: Tuple[Dict[str, bytes], MagicMock]
+    ) -> None:
+        stored, mock_cache = redis
+        stored["cached"] = embed("cached").tobytes()
+
+        embeddings, input_tokens = await OpenAIEmbeddingManager.embed_text_array(["new", "cached", "new", "other"])
+
+        assert embedder.batches == [["new", "other"]]
+        assert input_tokens == 2
+        assert [embedding.tolist() for embedding in embeddings] == [
+            embed(text).tolist() for text in ["new", "cached", "new", "other"]
+        ]
+        mock_cache.mget.assert_awaited_once_with(["new", "cached", "other"])
+        mock_cache.expire_many.assert_awaited_once_with(["cached"], mock_cache._expire_in_sec)
+        assert set(stored) == {"cached", "new", "other"}
+
+    @pytest.mark.asyncio
+    async def test_repeated_texts_are_served_from_local_tier(
+        self, embedder: StubEmbedder, redis: Tuple[Dict[str, bytes], MagicMock]
+    ) -> None:
+        _, mock_cache = redis
+        await OpenAIEmbeddingManager.embed_text_array(["a", "bb", "ccc"])
+        mock_cache.mget.reset_mock()
+
+        embeddings, input_tokens = await OpenAIEmbeddingManager.embed_text_array(["ccc", "a"])
+
+        assert input_tokens == 0
+        assert len(embedder.batches) == 1
+        mock_cache.mget.assert_not_called()
+        assert [embedding.tolist() for embedding in embeddings] == [embed("ccc").tolist(), embed("a").tolist()]
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_embedding(
+        self, embedder: StubEmbedder, redis: Tuple[Dict[str, bytes], MagicMock]
+    ) -> None:
+        _, mock_cache = redis
+        mock_cache.mget.side_effect = ConnectionError("redis unavailable")
+
+        embeddings, input_tokens = await OpenAIEmbeddingManager.embed_text_array(["a", "b"])
+
+        assert input_tokens == 2
+        assert [embedding.tolist() for embedding in embeddings] == [embed("a").tolist(), embed("b").tolist()]
+
+    def test_oversized_texts_keep_batch_order(self, embedder: StubEmbedder) -> None:
+        with patch(f"{MANAGER_PATH}.TikToken") as tiktoken:
+            tiktoken.return_value.count.side_effect = lambda text, model: len(text.split())
+            tiktoken.return_value.truncate_string.side_effect = lambda text, max_tokens, model: "truncated"
+
+            batches = OpenAIEmbeddingManager.create_optimized_batches(
+                ["a", "b c d e", "f"], max_tokens=3, model="embedding-model"
+            )
+
+        assert batches == [["a"], ["truncated"], ["f"]]
+
+
+class TestOpenAIEmbeddingManagerScheduler:
+    """Test class for the sliding window batch scheduler of OpenAIEmbeddingManager."""
+
+    @pytest.mark.asyncio
+    async def test_window_slides_past_slow_batch_and_keeps_order(self) -> None:
+        started: List[str] = []
+        slow_batch_release = asyncio.Event()
+
+        async def embed_batch(batch: List[str]) -> Tuple[List[NDArray[np.float32]], int]:
+            started.append(batch[0])
+            if batch[0] == "slow":
+                await slow_batch_release.wait()
+            elif len(started) == 4:
+                slow_batch_release.set()
+            return [embed(text) for text in batch], 1
+
+        with patch.object(OpenAIEmbeddingManager, "MAX_PARALLEL_TASKS", 2):
+            embeddings, input_tokens = await OpenAIEmbeddingManager._embed_batches(
+                [["slow"], ["a"], ["bb"], ["ccc"]], embed_batch
+            )
+
+        # a wave of two would wait for the slow batch before starting "bb" and "ccc"
+        assert started == ["slow", "a", "bb", "ccc"]
+        assert [embedding.tolist() for embedding in embeddings] == [
+            embed(text).tolist() for text in ["slow", "a", "bb", "ccc"]
+        ]
+        assert input_tokens == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_in_place(self) -> None:
+        attempts: Dict[str, int] = {}
+
+        async def embed_batch(batch: List[str]) -> Tuple[List[NDArray[np.float32]], int]:
+            attempts[batch[0]] = attempts.get(batch[0], 0) + 1
+            if batch[0] == "a" and attempts["a"] < 3:
+                raise ConnectionError("rate limited")
+            return [embed(text) for text in batch], 1
+
+        with (
+            patch.object(OpenAIEmbeddingManager, "INITIAL_BACKOFF_SEC", 0),
+            patch.object(OpenAIEmbeddingManager, "MAX_PARALLEL_TASKS", 2),
+        ):
+            embeddings, input_tokens = await OpenAIEmbeddingManager._embed_batches(
+                [["a"], ["bb"], [], ["ccc", "dddd"]], embed_batch
+            )
+
+        assert attempts == {"a": 3, "bb": 1, "ccc": 1}
+        assert [embedding.tolist() for embedding in embeddings] == [
+            embed(text).tolist() for text in ["a", "bb", "ccc", "dddd"]
+        ]
+        assert input_tokens == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_failing_all_attempts_raises(self) -> None:
+        embed_batch = AsyncMock(side_effect=ConnectionError("OpenAI unavailable"))
+
+        with (
+            patch.object(OpenAIEmbeddingManager, "INITIAL_BACKOFF_SEC", 0),
+            pytest.raises(ConnectionError),
+        ):
+            await OpenAIEmbeddingManager._embed_batches([["a"]], embed_batch)
+
+        assert embed_batch.await_count == OpenAIEmbeddingManager.MAX_BATCH_ATTEMPTS
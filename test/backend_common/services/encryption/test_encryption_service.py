@@ -0,0 +1,67 @@
+"""
+Unit tests for EncryptionService.
+
+Covers the round trip of the versioned envelope, the decryption of the legacy envelope, the cache of
+PBKDF2 keys, which are derived once per salt, and the batch APIs.
+"""
+
+import base64
+import os
+from typing import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import algorithms
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.backend_common.services.encryption.encryption_service import EncryptionService
+
+
+@pytest.fixture
+def pbkdf2() -> Iterator[MagicMock]:
+    with (
+        patch.object(EncryptionService, "_derived_keys", LocalLRUCache(max_size=16)),
+        patch(
+            "app.backend_common.services.encryption.encryption_service.PBKDF2HMAC",
+            wraps=PBKDF2HMAC,
+        ) as mock_pbkdf2,
+    ):
+        yield mock_pbkdf2
+
+
+def encrypt_legacy(plaintext: str) -> str:
+    salt, iv = os.urandom(EncryptionService.SALT_LENGTH), os.urandom(EncryptionService.IV_LENGTH)
+    key = EncryptionService._EncryptionService__derive_key(salt=salt)
+    padder = padding.PKCS7(algorithms.AES.block_size).padder()
+    encryptor = EncryptionService._get_cipher(key=key, iv=iv).encryptor()
+    ciphertext = encryptor.update(padder.update(plaintext.encode()) + padder.finalize()) + encryptor.finalize()
+    return base64.b64encode(salt + iv + ciphertext).decode("utf-8")
+
+
+class TestEncryptionService:
+    """Test class for EncryptionService."""
+
+    def test_records_get_own_salt_but_share_derived_key(self, pbkdf2: MagicMock) -> None:
+        first, second = EncryptionService.encrypt("secret"), EncryptionService.encrypt("secret")
+
+        assert first.startswith("v2:") and first != second
+        assert EncryptionService.decrypt(first) == EncryptionService.decrypt(second) == "secret"
+        assert pbkdf2.call_count == 1
+
+    def test_legacy_envelope_is_decrypted_once_derived(self, pbkdf2: MagicMock) -> None:
+        encrypted_data = encrypt_legacy("legacy secret")
+        pbkdf2.reset_mock()
+
+        assert EncryptionService.decrypt(encrypted_data) == "legacy secret"
+        assert EncryptionService.decrypt(encrypted_data) == "legacy secret"
+        assert pbkdf2.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_apis_keep_order(self, pbkdf2: MagicMock) -> None:
+        plaintexts = [f"token-{index}" for index in range(5)]
+
+        encrypted_data = await EncryptionService.encrypt_many(plaintexts)
+
+        assert await EncryptionService.decrypt_many(encrypted_data) == plaintexts
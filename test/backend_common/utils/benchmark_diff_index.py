@@ -0,0 +1,163 @@
+"""
+Micro-benchmark of DiffIndex against the per-line regex implementation it replaced.
+
+Builds synthetic unified diffs of a few MB and times line numbering, LOC counting and the
+extraction of every file. Not collected by pytest; run it with:
+
+    python -m test.backend_common.utils.benchmark_diff_index [--sizes 1 4 16] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from app.backend_common.utils.diff_index import DiffIndex
+
+
+def reference_append_line_numbers(pr_diff: str) -> str:  # noqa: C901
+    """The former `append_line_numbers`, kept verbatim as the baseline and the expected output."""
+    result = []
+    current_file = None
+    original_line_number = 0
+    new_line_number = 0
+
+    lines = pr_diff.split("\n")
+    for line in lines:
+        file_match = re.match(r"^\+\+\+ b/(.+)$", line)
+        if file_match:
+            current_file = file_match.group(1)
+            result.append(line)
+            continue
+
+        line_info_match = re.match(r"^@@ -(\d+),\d+ \+(\d+),\d+ @@", line)
+        if line_info_match:
+            original_line_number = int(line_info_match.group(1))
+            new_line_number = int(line_info_match.group(2))
+            result.append(line)
+            continue
+
+        if line.startswith("+") and not line.startswith("+++"):
+            if current_file:
+                result.append(f"<+{new_line_number}> {line}")
+            new_line_number += 1
+            continue
+
+        if line.startswith("-") and not line.startswith("---"):
+            if current_file:
+                result.append(f"<-{original_line_number}> {line}")
+            original_line_number += 1
+            continue
+
+        if not line.startswith("-") and not line.startswith("+") and not line.startswith("@@"):
+            if current_file:
+                result.append(f"<+{new_line_number}> {line}")
+            new_line_number += 1
+            original_line_number += 1
+
+    if not result:
+        return pr_diff
+
+    return "\n".join(result)
+
+
+def reference_get_diff_loc(pr_diff: str) -> int:
+    """The former `IdeDiffHandler.get_diff_loc`."""
+    added = 0
+    removed = 0
+    for line in pr_diff.splitlines():
+        if line.startswith("+++") or line.startswith("---"):
+            continue
+        if line.startswith("+") and not line.startswith("+++"):
+            added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return added + removed
+
+
+def reference_extract_all_files(pr_diff: str) -> List[str]:
+    """Per-file extraction the way callers did it before: one regex scan of the whole diff per file."""
+    paths = re.findall(r"^\+\+\+ b/(.+)$", pr_diff, re.MULTILINE)
+    sections = []
+    for path in paths:
+        match = re.search(rf"^diff --git a/.+? b/{re.escape(path)}$(.*?)(?=^diff --git |\Z)", pr_diff, re.M | re.S)
+        sections.append(match.group(0) if match else "")
+    return sections
+
+
+def build_synthetic_diff(target_bytes: int, seed: int = 7) -> str:
+    """A git style diff of many files and hunks mixing context, added and removed lines."""
+    rng = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    file_no = 0
+    while size < target_bytes:
+        path = f"src/module_{file_no // 50}/file_{file_no}.py"
+        file_no += 1
+        file_lines = [f"diff --git a/{path} b/{path}", f"--- a/{path}", f"+++ b/{path}"]
+        line_no = 1
+        for _ in range(rng.randint(1, 6)):
+            line_no += rng.randint(5, 80)
+            body: List[str] = []
+            old_count = new_count = 0
+            for _ in range(rng.randint(6, 40)):
+                kind = rng.choices(" +-", weights=(6, 3, 2))[0]
+                body.append(f"{kind}    value_{rng.randint(0, 10**6)} = compute(value_{rng.randint(0, 999)}, {kind!r})")
+                old_count += kind != "+"
+                new_count += kind != "-"
+            file_lines.append(f"@@ -{line_no},{old_count} +{line_no},{new_count} @@ def function_{line_no}():")
+            file_lines.extend(body)
+        chunk = "\n".join(file_lines) + "\n"
+        parts.append(chunk)
+        size += len(chunk)
+    return "".join(parts)
+
+
+def _best_of(repeat: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def run(sizes_mb: List[float], repeat: int) -> None:
+    print(f"{'size':>8} {'files':>6} {'ref numbering+loc':>18} {'ref with extraction':>20} {'DiffIndex':>10}")  # noqa: T201
+    for size_mb in sizes_mb:
+        diff = build_synthetic_diff(int(size_mb * 1024 * 1024))
+        index = DiffIndex(diff)
+        assert index.line_numbered_diff == reference_append_line_numbers(diff)
+        assert index.loc == reference_get_diff_loc(diff)
+
+        def reference_numbering() -> None:
+            reference_append_line_numbers(diff)
+            reference_get_diff_loc(diff)
+
+        def reference_with_extraction() -> None:
+            reference_numbering()
+            reference_extract_all_files(diff)
+
+        def indexed() -> None:
+            diff_index = DiffIndex(diff)
+            _ = diff_index.line_numbered_diff, diff_index.loc
+            for path in diff_index.file_paths:
+                diff_index.get_file_diff(path)
+
+        numbering_time = _best_of(repeat, reference_numbering)
+        # the reference file extraction is quadratic, keep it to the smaller sizes
+        extraction = f"{_best_of(repeat, reference_with_extraction) * 1000:.0f}ms" if size_mb <= 1 else "skipped"
+        indexed_time = _best_of(repeat, indexed)
+        print(  # noqa: T201
+            f"{size_mb:>6.1f}MB {len(index.files):>6} {numbering_time * 1000:>16.0f}ms "
+            f"{extraction:>20} {indexed_time * 1000:>8.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 16], help="diff sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,178 @@
+"""
+Unit tests for DiffIndex.
+
+Line numbering and LOC counts are checked against the regex based implementations DiffIndex
+replaced (kept in the benchmark module), file and hunk extraction against hand written diffs.
+"""
+
+import pytest
+
+from app.backend_common.utils.diff_index import DiffIndex
+from test.backend_common.utils.benchmark_diff_index import (
+    build_synthetic_diff,
+    reference_append_line_numbers,
+    reference_get_diff_loc,
+)
+
+GIT_DIFF = """diff --git a/src/app.py b/src/app.py
+index 83db48f..bf269f4 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,4 @@
+ import os
+-import sys
++import json
++import logging
+
+@@ -10,2 +11,2 @@ def main():
+-    print(sys.argv)
++    print(json.dumps(os.environ))
+     return 0
+diff --git a/src/new.py b/src/new.py
+new file mode 100644
+--- /dev/null
++++ b/src/new.py
+@@ -0,0 +1,2 @@
++VALUE = 1
++OTHER = 2
+\\ No newline at end of file
+diff --git a/src/old.py b/src/old.py
+deleted file mode 100644
+--- a/src/old.py
++++ /dev/null
+@@ -1 +0,0 @@
+-REMOVED = True
+"""
+
+# file headers only, as produced by the IDE for each changed file
+HEADERS_ONLY_DIFF = """--- a/one.py
++++ b/one.py
+@@ -5,2 +5,2 @@
+-a = 1
++a = 2
+ b = 3
+--- a/two.py
++++ b/two.py
+@@ -1 +1 @@
+-x
++y
+"""
+
+# a binary file and a pure rename carry no ---/+++ headers
+BINARY_AND_RENAME_DIFF = """diff --git a/a.py b/a.py
+index 1111111..2222222 100644
+--- a/a.py
++++ b/a.py
+@@ -1 +1 @@
+-a = 1
++a = 2
+diff --git a/img.png b/img.png
+new file mode 100644
+index 0000000..3333333
+Binary files /dev/null and b/img.png differ
+diff --git a/old.py b/new.py
+similarity index 100%
+rename from old.py
+rename to new.py
+diff --git a/c.py b/c.py
+index 4444444..5555555 100644
+--- a/c.py
++++ b/c.py
+@@ -1 +1 @@
+-c = 1
++c = 2
+"""
+
+
+class TestDiffIndex:
+    """Test class for DiffIndex."""
+
+    @pytest.mark.parametrize(
+        "diff",
+        [
+            GIT_DIFF,
+            HEADERS_ONLY_DIFF,
+            "",
+            "not a diff at all",
+            "+++ b/only/header.py",
+            BINARY_AND_RENAME_DIFF,
+            build_synthetic_diff(64 * 1024),
+        ],
+    )
+    def test_matches_reference_implementations(self, diff: str) -> None:
+        index = DiffIndex(diff)
+
+        assert index.line_numbered_diff == reference_append_line_numbers(diff)
+        assert index.loc == reference_get_diff_loc(diff)
+
+    def test_files_and_hunks(self) -> None:
+        index = DiffIndex(GIT_DIFF)
+
+        assert index.file_paths == ["src/app.py", "src/new.py", "src/old.py"]
+
+        app_file = index.get_file("src/app.py")
+        assert (app_file.added, app_file.removed) == (3, 2)
+        assert [(hunk.old_start, hunk.new_start) for hunk in app_file.hunks] == [(1, 1), (10, 11)]
+
+        new_file, old_file = index.get_file("src/new.py"), index.get_file("src/old.py")
+        assert new_file.is_new and new_file.loc == 2
+        assert old_file.is_deleted and old_file.loc == 1
+
+    def test_file_sections_cover_the_diff(self) -> None:
+        index = DiffIndex(GIT_DIFF)
+
+        sections = [index.get_file_diff(path) for path in index.file_paths]
+
+        assert "".join(sections) == GIT_DIFF
+        assert sections[1].startswith("diff --git a/src/new.py b/src/new.py")
+        assert sections[1].endswith("\\ No newline at end of file\n")
+        assert index.get_file_diff("missing.py") is None
+
+    def test_file_sections_without_diff_git_lines(self) -> None:
+        index = DiffIndex(HEADERS_ONLY_DIFF)
+
+        assert index.get_file_diff("one.py") == "--- a/one.py\n+++ b/one.py\n@@ -5,2 +5,2 @@\n-a = 1\n+a = 2\n b = 3\n"
+        assert index.get_file_diff("two.py") == "--- a/two.py\n+++ b/two.py\n@@ -1 +1 @@\n-x\n+y\n"
+
+    def test_hunk_lines_carry_line_numbers(self) -> None:
+        index = DiffIndex(GIT_DIFF)
+        second_hunk = index.get_file("src/app.py").hunks[1]
+
+        lines = [(line.kind, line.old_line, line.new_line, line.text) for line in index.iter_hunk_lines(second_hunk)]
+
+        assert lines == [
+            ("-", 10, None, "    print(sys.argv)"),
+            ("+", None, 11, "    print(json.dumps(os.environ))"),
+            (" ", 11, 12, "    return 0"),
+        ]
+        first_line = next(index.iter_hunk_lines(second_hunk))
+        assert GIT_DIFF[first_line.offset :].startswith("-    print(sys.argv)")
+
+    def test_binary_and_rename_only_sections_are_files(self) -> None:
+        index = DiffIndex(BINARY_AND_RENAME_DIFF)
+
+        assert index.file_paths == ["a.py", "img.png", "new.py", "c.py"]
+        assert index.get_file_diff("a.py") == (
+            "diff --git a/a.py b/a.py\nindex 1111111..2222222 100644\n--- a/a.py\n+++ b/a.py\n"
+            "@@ -1 +1 @@\n-a = 1\n+a = 2\n"
+        )
+        assert index.get_file_diff("img.png").startswith("diff --git a/img.png b/img.png")
+        assert index.get_file_diff("img.png").endswith("Binary files /dev/null and b/img.png differ\n")
+        assert index.get_file_diff("new.py").endswith("rename to new.py\n")
+        assert "".join(index.get_file_diff(path) for path in index.file_paths) == BINARY_AND_RENAME_DIFF
+
+        image, renamed = index.get_file("img.png"), index.get_file("new.py")
+        assert image.is_new and image.hunks == []
+        assert (renamed.old_path, renamed.new_path, renamed.hunks) == ("old.py", "new.py", [])
+        assert index.get_file("a.py").loc == 2 and index.get_file("c.py").loc == 2
+
+    def test_renamed_file_with_changes_takes_its_new_path(self) -> None:
+        diff = (
+            "diff --git a/old name.py b/new name.py\nsimilarity index 90%\nrename from old name.py\n"
+            "rename to new name.py\n--- a/old name.py\n+++ b/new name.py\n@@ -1 +1 @@\n-x\n+y\n"
+        )
+        index = DiffIndex(diff)
+
+        assert index.file_paths == ["new name.py"]
+        assert index.get_file("new name.py").old_path == "old name.py"
+        assert index.get_file_diff("new name.py") == diff
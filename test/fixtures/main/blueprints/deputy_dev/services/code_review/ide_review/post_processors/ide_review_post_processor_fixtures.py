@@ -152,6 +152,7 @@ def sample_extension_review() -> Mock:
     review.session_id = "session-123"
     review.review_status = "In Progress"
     review.title = "Code Review"
+    review.meta_info = None
     return review
 
 
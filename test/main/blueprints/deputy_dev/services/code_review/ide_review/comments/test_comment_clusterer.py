@@ -0,0 +1,84 @@
+"""
+Unit tests for CommentClusterer.
+
+Covers the clustering of the comments of a line into near duplicates and the split between lines
+blended locally and lines left for the summarization agent.
+"""
+
+from typing import List, Tuple
+
+from app.main.blueprints.deputy_dev.services.code_review.common.comments.dataclasses.main import (
+    CommentBuckets,
+    ParsedAggregatedCommentData,
+)
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.comments.comment_clusterer import (
+    CommentClusterer,
+    hamming_distance,
+    simhash,
+)
+
+NULL_CHECK = "Missing null check: `user` may be None before accessing `user.id`, which raises AttributeError."
+NULL_CHECK_DUPLICATE = "Missing null check: `user` can be None before accessing `user.id`, raising an AttributeError."
+SQL_INJECTION = "SQL query built with string formatting is vulnerable to SQL injection."
+
+
+def build_line(comments: List[Tuple[str, str, float]]) -> ParsedAggregatedCommentData:
+    """Comments of one line, each given as (comment, bucket, confidence score)."""
+    return ParsedAggregatedCommentData(
+        titles=[f"title {index}" for index in range(len(comments))],
+        file_path="app/service.py",
+        line_number="12",
+        comments=[comment for comment, _, _ in comments],
+        tags=["bug"] * len(comments),
+        comment_ids=list(range(1, len(comments) + 1)),
+        buckets=[CommentBuckets(name=bucket, agent_id=str(index)) for index, (_, bucket, _) in enumerate(comments)],
+        corrective_code=[f"fix_{index}()" for index in range(len(comments))],
+        confidence_scores=[score for _, _, score in comments],
+        confidence_score=0.9,
+        rationales=[f"rationale {index}" for index in range(len(comments))],
+    )
+
+
+class TestCommentClusterer:
+    """Test class for CommentClusterer."""
+
+    def test_simhash_is_close_for_near_duplicates_only(self) -> None:
+        assert simhash(NULL_CHECK) == simhash(NULL_CHECK)
+        assert hamming_distance(simhash(NULL_CHECK), simhash(NULL_CHECK_DUPLICATE)) < hamming_distance(
+            simhash(NULL_CHECK), simhash(SQL_INJECTION)
+        )
+
+    def test_duplicates_are_blended_locally(self) -> None:
+        line = build_line([(NULL_CHECK, "ERROR", 0.8), (NULL_CHECK_DUPLICATE, "SECURITY", 0.95)])
+
+        blended_comments, divergent_lines = CommentClusterer.blend([line])
+
+        assert divergent_lines == []
+        assert len(blended_comments) == 1
+        blended_comment = blended_comments[0]
+        # the most confident comment represents the cluster
+        assert blended_comment.comment == NULL_CHECK_DUPLICATE
+        assert blended_comment.buckets == [CommentBuckets(name="SECURITY", agent_id="1")]
+        assert blended_comment.corrective_code == "fix_1()"
+        assert blended_comment.confidence_score == 0.88
+        assert blended_comment.id is None and blended_comment.is_summarized
+
+    def test_divergent_lines_keep_one_comment_per_cluster(self) -> None:
+        line = build_line(
+            [(NULL_CHECK, "ERROR", 0.8), (SQL_INJECTION, "SECURITY", 0.9), (NULL_CHECK_DUPLICATE, "ERROR", 0.7)]
+        )
+
+        blended_comments, divergent_lines = CommentClusterer.blend([line])
+
+        assert blended_comments == []
+        assert len(divergent_lines) == 1
+        assert divergent_lines[0].comments == [SQL_INJECTION, NULL_CHECK]
+        assert divergent_lines[0].comment_ids == [2, 1]
+
+    def test_unrelated_comments_are_left_untouched(self) -> None:
+        line = build_line([(NULL_CHECK, "ERROR", 0.8), (SQL_INJECTION, "SECURITY", 0.9)])
+
+        blended_comments, divergent_lines = CommentClusterer.blend([line])
+
+        assert blended_comments == []
+        assert divergent_lines == [line]
@@ -1,3 +1,4 @@
+from typing import Iterator
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -5,10 +6,34 @@ import pytest
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service import (
     IdeReviewContextService,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context import (
+    ReviewDiffContext,
+)
 from test.fixtures.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service_fixtures import (
     IdeReviewContextServiceFixtures,
 )
 
+CONTEXT_SERVICE_PATH = (
+    "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service"
+)
+
+
+@pytest.fixture(autouse=True)
+def diff_context_caches() -> Iterator[Mock]:
+    """Start every test with empty diff context caches, and keep Redis out of them."""
+    IdeReviewContextService._local_contexts.clear()
+    with (
+        patch(f"{CONTEXT_SERVICE_PATH}.IdeReviewDiffContextCache") as mock_context_cache,
+        patch(
+            "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context.get_token_count",
+            side_effect=lambda value: len(value.split()),
+        ),
+    ):
+        mock_context_cache.get = AsyncMock(return_value=None)
+        mock_context_cache.set = AsyncMock()
+        yield mock_context_cache
+    IdeReviewContextService._local_contexts.clear()
+
 
 class TestIdeReviewContextService:
     """Test cases for IdeReviewContextService class."""
@@ -26,7 +51,7 @@ class TestIdeReviewContextService:
 
     @pytest.mark.asyncio
     @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.IdeReviewCache"
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.DiffBlobStore"
     )
     async def test_get_pr_diff_success_without_line_numbers(self, mock_cache: Mock) -> None:
         """Test get_pr_diff returns diff without line numbers."""
@@ -45,15 +70,11 @@ class TestIdeReviewContextService:
         mock_cache.get.assert_called_once_with("123")
 
     @pytest.mark.asyncio
+    @patch("app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context.DiffIndex")
     @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.append_line_numbers"
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.DiffBlobStore"
     )
-    @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.IdeReviewCache"
-    )
-    async def test_get_pr_diff_success_with_line_numbers(
-        self, mock_cache: Mock, mock_append_line_numbers: Mock
-    ) -> None:
+    async def test_get_pr_diff_success_with_line_numbers(self, mock_cache: Mock, mock_diff_index: Mock) -> None:
         """Test get_pr_diff returns diff with line numbers."""
         # Arrange
         review_id = 456
@@ -61,7 +82,8 @@ class TestIdeReviewContextService:
         expected_diff_with_lines = IdeReviewContextServiceFixtures.get_sample_pr_diff_with_line_numbers()
 
         mock_cache.get = AsyncMock(return_value=original_diff)
-        mock_append_line_numbers.return_value = expected_diff_with_lines
+        mock_diff_index.return_value.line_numbered_diff = expected_diff_with_lines
+        mock_diff_index.return_value.files = []
 
         service = IdeReviewContextService(review_id=review_id)
 
@@ -71,11 +93,11 @@ class TestIdeReviewContextService:
         # Assert
         assert result == expected_diff_with_lines
         mock_cache.get.assert_called_once_with("456")
-        mock_append_line_numbers.assert_called_once_with(original_diff)
+        mock_diff_index.assert_called_once_with(original_diff)
 
     @pytest.mark.asyncio
     @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.IdeReviewCache"
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.DiffBlobStore"
     )
     async def test_get_pr_diff_cache_miss_raises_value_error(self, mock_cache: Mock) -> None:
         """Test get_pr_diff raises ValueError when cache miss occurs."""
@@ -93,7 +115,7 @@ class TestIdeReviewContextService:
 
     @pytest.mark.asyncio
     @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.IdeReviewCache"
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.DiffBlobStore"
     )
     async def test_get_pr_diff_default_append_line_no_info_false(self, mock_cache: Mock) -> None:
         """Test get_pr_diff defaults to append_line_no_info=False."""
@@ -113,7 +135,7 @@ class TestIdeReviewContextService:
 
     @pytest.mark.asyncio
     @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.IdeReviewCache"
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.DiffBlobStore"
     )
     async def test_get_pr_diff_cache_key_format(self, mock_cache: Mock) -> None:
         """Test get_pr_diff uses correct cache key format."""
@@ -131,31 +153,104 @@ class TestIdeReviewContextService:
         mock_cache.get.assert_called_once_with("999")
 
     @pytest.mark.asyncio
+    @patch("app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context.DiffIndex")
     @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.append_line_numbers"
-    )
-    @patch(
-        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.IdeReviewCache"
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.ide_review_context_service.DiffBlobStore"
     )
-    async def test_get_pr_diff_append_line_numbers_called_conditionally(
-        self, mock_cache: Mock, mock_append_line_numbers: Mock
-    ) -> None:
-        """Test append_line_numbers is called only when append_line_no_info=True."""
+    async def test_get_pr_diff_line_numbers_computed_once(self, mock_cache: Mock, mock_diff_index: Mock) -> None:
+        """Test the diff is parsed and line numbered once, whatever the calls made."""
         # Arrange
         review_id = 222
         original_diff = IdeReviewContextServiceFixtures.get_sample_pr_diff()
         mock_cache.get = AsyncMock(return_value=original_diff)
+        mock_diff_index.return_value.line_numbered_diff = (
+            IdeReviewContextServiceFixtures.get_sample_pr_diff_with_line_numbers()
+        )
+        mock_diff_index.return_value.files = []
 
         service = IdeReviewContextService(review_id=review_id)
 
-        # Act - Test with append_line_no_info=False
+        # Act - line numbers are computed once with the diff context, and reused afterwards
         await service.get_pr_diff(append_line_no_info=False)
+        await service.get_pr_diff(append_line_no_info=True)
+        await service.get_pr_diff(append_line_no_info=True)
 
         # Assert
-        mock_append_line_numbers.assert_not_called()
+        mock_diff_index.assert_called_once_with(original_diff)
+        mock_cache.get.assert_called_once_with("222")
 
-        # Act - Test with append_line_no_info=True
-        await service.get_pr_diff(append_line_no_info=True)
+    @pytest.mark.asyncio
+    @patch(f"{CONTEXT_SERVICE_PATH}.DiffBlobStore")
+    async def test_diff_context_is_shared_across_services(self, mock_cache: Mock, diff_context_caches: Mock) -> None:
+        """Test the diff context is built once per review, then served from the worker cache."""
+        # Arrange
+        review_id = 333
+        original_diff = IdeReviewContextServiceFixtures.get_sample_pr_diff()
+        mock_cache.get = AsyncMock(return_value=original_diff)
+
+        # Act
+        first_context = await IdeReviewContextService(review_id=review_id).get_diff_context()
+        second_context = await IdeReviewContextService(review_id=review_id).get_diff_context()
+
+        # Assert
+        assert second_context is first_context
+        mock_cache.get.assert_called_once_with("333")
+        diff_context_caches.set.assert_called_once_with("333", first_context.get_token_counts())
+
+    @pytest.mark.asyncio
+    @patch(f"{CONTEXT_SERVICE_PATH}.DiffBlobStore")
+    async def test_no_uncompressed_diff_is_written_to_redis(self, mock_cache: Mock, diff_context_caches: Mock) -> None:
+        """Test only the token counts of the diff context are cached, the diff itself lives in DiffBlobStore."""
+        # Arrange
+        original_diff = IdeReviewContextServiceFixtures.get_sample_pr_diff()
+        mock_cache.get = AsyncMock(return_value=original_diff)
+
+        # Act
+        diff_context = await IdeReviewContextService(review_id=555).get_diff_context()
+
+        # Assert
+        cached_value = diff_context_caches.set.call_args.args[1]
+        assert set(cached_value) == {"token_count", "line_numbered_token_count"}
+        assert all(isinstance(value, int) for value in cached_value.values())
+        assert original_diff not in str(cached_value) and diff_context.line_numbered_diff not in str(cached_value)
+
+    @pytest.mark.asyncio
+    @patch(f"{CONTEXT_SERVICE_PATH}.DiffBlobStore")
+    async def test_diff_context_is_read_from_redis(self, mock_cache: Mock, diff_context_caches: Mock) -> None:
+        """Test the token counts of another worker are reused, the diff context is rebuilt around them."""
+        # Arrange
+        review_id = 444
+        original_diff = IdeReviewContextServiceFixtures.get_sample_pr_diff()
+        cached_context = ReviewDiffContext.build(review_id, original_diff)
+        diff_context_caches.get = AsyncMock(return_value=cached_context.get_token_counts())
+        mock_cache.get = AsyncMock(return_value=original_diff)
+
+        # Act
+        with patch(
+            "app.main.blueprints.deputy_dev.services.code_review.ide_review.context.review_diff_context.get_token_count"
+        ) as mock_get_token_count:
+            result = await IdeReviewContextService(review_id=review_id).get_diff_context()
+
+        # Assert
+        assert result == cached_context
+        mock_get_token_count.assert_not_called()
+        diff_context_caches.set.assert_not_called()
+
+    def test_file_diffs_are_sliced_from_raw_diff(self) -> None:
+        """Test each file of the diff can be extracted from the diff context."""
+        # Arrange
+        raw_diff = (
+            "--- a/src/first.py\n+++ b/src/first.py\n@@ -1,1 +1,1 @@\n-old\n+new\n"
+            "--- a/src/second.py\n+++ /dev/null\n@@ -1,1 +0,0 @@\n-gone\n"
+        )
+
+        # Act
+        diff_context = ReviewDiffContext.build(1, raw_diff)
 
         # Assert
-        mock_append_line_numbers.assert_called_once_with(original_diff)
+        assert diff_context.file_paths == ["src/first.py", "src/second.py"]
+        assert diff_context.get_file_diff("src/first.py") == (
+            "--- a/src/first.py\n+++ b/src/first.py\n@@ -1,1 +1,1 @@\n-old\n+new\n"
+        )
+        assert diff_context.get_file_diff("src/second.py").endswith("-gone\n")
+        assert diff_context.get_file_diff("src/missing.py") is None
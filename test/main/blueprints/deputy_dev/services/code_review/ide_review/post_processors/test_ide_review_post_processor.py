@@ -20,6 +20,16 @@ from app.main.blueprints.deputy_dev.services.code_review.ide_review.post_process
 from test.fixtures.main.blueprints.deputy_dev.services.code_review.ide_review.post_processors.ide_review_post_processor_fixtures import *
 
 
+@pytest.fixture(autouse=True)
+def mock_transaction() -> Any:
+    """Run the writes of post processing without a database transaction."""
+    with patch(
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.post_processors.ide_review_post_processor.in_transaction",
+        MagicMock(),
+    ) as mock_in_transaction:
+        yield mock_in_transaction
+
+
 class TestIdeReviewPostProcessorPostProcessPr:
     """Test cases for IdeReviewPostProcessor.post_process_pr method."""
 
@@ -20,11 +20,24 @@ from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.ma
     GetRepoIdRequest,
     ReviewRequest,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.diff_blob_store import StoredDiff
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor import (
     IdeReviewPreProcessor,
 )
 from test.fixtures.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor_fixtures import *
 
+STORED_DIFF = StoredDiff(size=1024, data="H4sIAAAAAAAC/w==")
+
+
+@pytest.fixture(autouse=True)
+def disable_incremental_review() -> Any:
+    """Review the full diff in every test unless a test enables incremental review itself."""
+    with patch(
+        "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IncrementalReviewPlanner.is_enabled",
+        return_value=False,
+    ):
+        yield
+
 
 class TestIdeReviewPreProcessorInitialization:
     """Test cases for IdeReviewPreProcessor initialization."""
@@ -330,15 +343,16 @@ class TestIdeReviewPreProcessorPreProcessPr:
                 "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeDiffHandler"
             ) as mock_diff_handler,
             patch(
-                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeReviewCache"
-            ) as mock_cache,
+                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.DiffBlobStore"
+            ) as mock_diff_store,
         ):
             # Setup mocks
             mock_user_team_repo.db_get = AsyncMock(return_value=sample_user_team)
             mock_repo_repo.find_or_create_extension_repo = AsyncMock(return_value=sample_repo_dto)
             mock_session_repo.create_message_session = AsyncMock(return_value=sample_message_session)
             mock_ext_reviews_repo.db_insert = AsyncMock(return_value=sample_ide_review_dto)
-            mock_cache.set = AsyncMock()
+            mock_diff_store.compress = AsyncMock(return_value=STORED_DIFF)
+            mock_diff_store.set = AsyncMock()
 
             # Setup diff handler
             diff_handler_instance = MagicMock()
@@ -363,7 +377,9 @@ class TestIdeReviewPreProcessorPreProcessPr:
             mock_repo_repo.find_or_create_extension_repo.assert_called_once()
             mock_session_repo.create_message_session.assert_called_once()
             mock_ext_reviews_repo.db_insert.assert_called_once()
-            mock_cache.set.assert_called_once_with(key=str(sample_ide_review_dto.id), value=sample_combined_diff)
+            mock_diff_store.compress.assert_called_once_with(sample_combined_diff)
+            mock_diff_store.set.assert_called_once_with(key=str(sample_ide_review_dto.id), value=STORED_DIFF)
+            assert mock_ext_reviews_repo.db_insert.call_args[0][0].diff_s3_url is None
 
     @pytest.mark.asyncio
     async def test_pre_process_pr_with_empty_diff(
@@ -393,8 +409,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
                 "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeDiffHandler"
             ) as mock_diff_handler,
             patch(
-                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeReviewCache"
-            ) as mock_cache,
+                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.DiffBlobStore"
+            ) as mock_diff_store,
         ):
             # Setup mocks
             mock_user_team_repo.db_get = AsyncMock(return_value=sample_user_team)
@@ -419,7 +435,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
                 review_type=ReviewType.ALL.value,
             )
             mock_ext_reviews_repo.db_insert = AsyncMock(return_value=rejected_review_dto)
-            mock_cache.set = AsyncMock()
+            mock_diff_store.compress = AsyncMock(return_value=STORED_DIFF)
+            mock_diff_store.set = AsyncMock()
 
             # Setup diff handler
             diff_handler_instance = MagicMock()
@@ -439,7 +456,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
             assert processor.review_status == IdeReviewStatusTypes.REJECTED_NO_DIFF.value
 
             # Cache should not be set for invalid reviews
-            mock_cache.set.assert_not_called()
+            mock_diff_store.compress.assert_not_called()
+            mock_diff_store.set.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_pre_process_pr_with_large_diff(
@@ -469,8 +487,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
                 "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeDiffHandler"
             ) as mock_diff_handler,
             patch(
-                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeReviewCache"
-            ) as mock_cache,
+                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.DiffBlobStore"
+            ) as mock_diff_store,
         ):
             # Setup mocks
             mock_user_team_repo.db_get = AsyncMock(return_value=sample_user_team)
@@ -495,7 +513,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
                 review_type=ReviewType.ALL.value,
             )
             mock_ext_reviews_repo.db_insert = AsyncMock(return_value=large_rejected_review_dto)
-            mock_cache.set = AsyncMock()
+            mock_diff_store.compress = AsyncMock(return_value=STORED_DIFF)
+            mock_diff_store.set = AsyncMock()
 
             # Setup diff handler
             diff_handler_instance = MagicMock()
@@ -513,7 +532,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
             assert processor.review_status == IdeReviewStatusTypes.REJECTED_LARGE_SIZE.value
 
             # Cache should not be set for invalid reviews
-            mock_cache.set.assert_not_called()
+            mock_diff_store.compress.assert_not_called()
+            mock_diff_store.set.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_pre_process_pr_user_team_not_found(
@@ -581,8 +601,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
                     "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeDiffHandler"
                 ) as mock_diff_handler,
                 patch(
-                    "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeReviewCache"
-                ) as mock_cache,
+                    "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.DiffBlobStore"
+                ) as mock_diff_store,
             ):
                 # Setup mocks
                 mock_user_team_repo.db_get = AsyncMock(return_value=sample_user_team)
@@ -606,7 +626,8 @@ class TestIdeReviewPreProcessorPreProcessPr:
                     review_type=test_case["expected_type"],
                 )
                 mock_ext_reviews_repo.db_insert = AsyncMock(return_value=review_dto)
-                mock_cache.set = AsyncMock()
+                mock_diff_store.compress = AsyncMock(return_value=STORED_DIFF)
+                mock_diff_store.set = AsyncMock()
 
                 # Setup diff handler
                 diff_handler_instance = MagicMock()
@@ -762,15 +783,16 @@ class TestIdeReviewPreProcessorIntegration:
                 "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeDiffHandler"
             ) as mock_diff_handler,
             patch(
-                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.IdeReviewCache"
-            ) as mock_cache,
+                "app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.ide_review_pre_processor.DiffBlobStore"
+            ) as mock_diff_store,
         ):
             # Setup complete mock chain
             mock_user_team_repo.db_get = AsyncMock(return_value=sample_user_team)
             mock_repo_repo.find_or_create_extension_repo = AsyncMock(return_value=sample_repo_dto)
             mock_session_repo.create_message_session = AsyncMock(return_value=sample_message_session)
             mock_ext_reviews_repo.db_insert = AsyncMock(return_value=sample_ide_review_dto)
-            mock_cache.set = AsyncMock()
+            mock_diff_store.compress = AsyncMock(return_value=STORED_DIFF)
+            mock_diff_store.set = AsyncMock()
 
             # Setup diff handler
             diff_handler_instance = MagicMock()
@@ -812,7 +834,7 @@ class TestIdeReviewPreProcessorIntegration:
             mock_session_repo.create_message_session.assert_called_once()
             mock_diff_handler.assert_called_once()
             mock_ext_reviews_repo.db_insert.assert_called_once()
-            mock_cache.set.assert_called_once()
+            mock_diff_store.set.assert_called_once()
 
             # Verify message session data structure
             session_call_args = mock_session_repo.create_message_session.call_args[1]
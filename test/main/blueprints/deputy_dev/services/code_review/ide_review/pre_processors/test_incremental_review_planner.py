@@ -0,0 +1,119 @@
+"""
+Unit tests for IncrementalReviewPlanner.
+
+Covers the hunk level comparison of a diff against the snapshot of a previous review and the
+carry forward of comments from unchanged hunks.
+"""
+
+from app.backend_common.utils.diff_index import DiffIndex
+from app.main.blueprints.deputy_dev.models.dto.ide_reviews_comment_dto import IdeReviewsCommentDTO
+from app.main.blueprints.deputy_dev.models.dto.user_agent_dto import UserAgentDTO
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.pre_processors.incremental_review_planner import (
+    IncrementalReviewPlanner,
+    ReviewSnapshot,
+)
+
+PREVIOUS_DIFF = """--- a/app.py
++++ b/app.py
+@@ -10,2 +10,3 @@ def run():
+     start()
++    log()
+     stop()
+@@ -40,2 +41,2 @@ def close():
+-    flush()
++    flush(force=True)
+     return
+--- a/util.py
++++ b/util.py
+@@ -1 +1 @@
+-A = 1
++A = 2
+"""
+
+# the first hunk of app.py is edited and a line added above the second one shifts it by one line
+CURRENT_DIFF = """--- a/app.py
++++ b/app.py
+@@ -10,2 +10,4 @@ def run():
+     start()
++    log()
++    check()
+     stop()
+@@ -40,2 +42,2 @@ def close():
+-    flush()
++    flush(force=True)
+     return
+--- a/util.py
++++ b/util.py
+@@ -1 +1 @@
+-A = 1
++A = 2
+"""
+
+
+def build_comment(file_path: str, line_number: int, comment_status: str = "NOT_REVIEWED") -> IdeReviewsCommentDTO:
+    return IdeReviewsCommentDTO(
+        id=7,
+        review_id=1,
+        title="title",
+        comment="comment",
+        file_path=file_path,
+        line_hash="",
+        line_number=line_number,
+        tag="tag",
+        is_valid=True,
+        agents=[UserAgentDTO(id=3)],
+        comment_status=comment_status,
+    )
+
+
+class TestIncrementalReviewPlanner:
+    """Test class for IncrementalReviewPlanner."""
+
+    def test_plan_keeps_only_changed_hunks(self) -> None:
+        snapshot = ReviewSnapshot.from_diff_index(DiffIndex(PREVIOUS_DIFF))
+
+        plan = IncrementalReviewPlanner.build_plan(1, snapshot, DiffIndex(CURRENT_DIFF))
+
+        assert (plan.changed_hunks, plan.reused_hunks) == (1, 2)
+        assert plan.diff == (
+            "--- a/app.py\n+++ b/app.py\n@@ -10,2 +10,4 @@ def run():\n"
+            "     start()\n+    log()\n+    check()\n     stop()\n"
+        )
+
+    def test_new_files_are_reviewed_in_full(self) -> None:
+        snapshot = ReviewSnapshot.from_diff_index(DiffIndex(PREVIOUS_DIFF))
+        current_diff = CURRENT_DIFF + "--- /dev/null\n+++ b/new.py\n@@ -0,0 +1 @@\n+B = 1\n"
+
+        plan = IncrementalReviewPlanner.build_plan(1, snapshot, DiffIndex(current_diff))
+
+        assert plan.changed_hunks == 2
+        assert plan.diff.endswith("--- /dev/null\n+++ b/new.py\n@@ -0,0 +1 @@\n+B = 1\n")
+
+    def test_files_without_hunks_after_an_unchanged_file_are_reviewed(self) -> None:
+        previous_diff = "diff --git a/util.py b/util.py\n--- a/util.py\n+++ b/util.py\n@@ -1 +1 @@\n-A = 1\n+A = 2\n"
+        binary_section = "diff --git a/img.png b/img.png\nBinary files a/img.png and b/img.png differ\n"
+        snapshot = ReviewSnapshot.from_diff_index(DiffIndex(previous_diff))
+
+        plan = IncrementalReviewPlanner.build_plan(1, snapshot, DiffIndex(previous_diff + binary_section))
+
+        assert (plan.changed_hunks, plan.reused_hunks) == (1, 1)
+        assert plan.diff == binary_section
+
+    def test_comments_on_unchanged_hunks_are_carried_forward(self) -> None:
+        snapshot = ReviewSnapshot.from_diff_index(DiffIndex(PREVIOUS_DIFF))
+        plan = IncrementalReviewPlanner.build_plan(1, snapshot, DiffIndex(CURRENT_DIFF))
+        comments = [
+            build_comment("app.py", 11),  # changed hunk
+            build_comment("app.py", 41),  # unchanged hunk, one line down now
+            build_comment("util.py", 1),
+            build_comment("util.py", 1, comment_status="REJECTED"),
+        ]
+
+        carried_comments = plan.carry_forward_comments(comments, review_id=2)
+
+        assert [(comment.file_path, comment.line_number) for comment in carried_comments] == [
+            ("app.py", 42),
+            ("util.py", 1),
+        ]
+        assert all(comment.id is None and comment.review_id == 2 for comment in carried_comments)
+        assert carried_comments[0].agents == [UserAgentDTO(id=3)]
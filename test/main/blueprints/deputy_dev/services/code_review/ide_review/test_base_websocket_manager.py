@@ -19,10 +19,20 @@ from app.backend_common.service_clients.aws_api_gateway.aws_api_gateway_service_
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.base_websocket_manager import (
     BaseWebSocketManager,
 )
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.connection_send_queue import (
+    ConnectionSendQueue,
+)
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.main import WebSocketMessage
 from test.fixtures.main.blueprints.deputy_dev.services.code_review.ide_review.base_websocket_manager_fixtures import *
 
 
+@pytest.fixture(autouse=True)
+def reset_connection_send_queues() -> None:
+    """Connection ids are shared across tests, forget the queues and closed connections of previous ones."""
+    ConnectionSendQueue._queues.clear()
+    ConnectionSendQueue._gone_connections.clear()
+
+
 # Concrete implementation for testing abstract base class
 class TestWebSocketManager(BaseWebSocketManager):
     """Concrete implementation of BaseWebSocketManager for testing."""
@@ -141,6 +151,7 @@ class TestBaseWebSocketManagerPushToConnectionStream:
         await sample_aws_websocket_manager.push_to_connection_stream(
             sample_websocket_message, sample_local_stream_buffer
         )
+        await sample_aws_websocket_manager.cleanup()
 
         # Verify AWS client was called
         mock_aws_client.post_to_connection.assert_called_once()
@@ -181,6 +192,12 @@ class TestBaseWebSocketManagerPushToConnectionStream:
         mock_aws_client.post_to_connection.side_effect = SocketClosedError("Connection closed")
         sample_aws_websocket_manager.aws_client = mock_aws_client
 
+        # the message is posted in the background, the failure surfaces on the next push
+        await sample_aws_websocket_manager.push_to_connection_stream(
+            sample_websocket_message, sample_local_stream_buffer
+        )
+        await ConnectionSendQueue.flush_connection(sample_aws_websocket_manager.connection_id)
+
         with pytest.raises(SocketClosedError):
             await sample_aws_websocket_manager.push_to_connection_stream(
                 sample_websocket_message, sample_local_stream_buffer
@@ -188,6 +205,7 @@ class TestBaseWebSocketManagerPushToConnectionStream:
 
         # Connection should be marked as gone
         assert sample_aws_websocket_manager.connection_id_gone is True
+        mock_aws_client.post_to_connection.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_push_to_connection_stream_general_exception(
@@ -196,15 +214,21 @@ class TestBaseWebSocketManagerPushToConnectionStream:
         sample_websocket_message: WebSocketMessage,
         sample_local_stream_buffer: Dict[str, List[str]],
     ) -> None:
-        """Test push_to_connection_stream with general exception."""
+        """Test push_to_connection_stream with general exception, which only drops the failed message."""
         mock_aws_client = AsyncMock()
-        mock_aws_client.post_to_connection.side_effect = Exception("Network error")
+        mock_aws_client.post_to_connection.side_effect = [Exception("Network error"), None]
         sample_aws_websocket_manager.aws_client = mock_aws_client
 
-        with pytest.raises(Exception, match="Network error"):
-            await sample_aws_websocket_manager.push_to_connection_stream(
-                sample_websocket_message, sample_local_stream_buffer
-            )
+        await sample_aws_websocket_manager.push_to_connection_stream(
+            sample_websocket_message, sample_local_stream_buffer
+        )
+        await sample_aws_websocket_manager.push_to_connection_stream(
+            sample_websocket_message, sample_local_stream_buffer
+        )
+        await sample_aws_websocket_manager.cleanup()
+
+        assert mock_aws_client.post_to_connection.call_count == 2
+        assert sample_aws_websocket_manager.connection_id_gone is False
 
     @pytest.mark.asyncio
     async def test_push_to_connection_stream_no_aws_client(
@@ -532,11 +556,9 @@ class TestBaseWebSocketManagerIntegration:
                 sample_websocket_message, sample_local_stream_buffer
             )
 
-            # Verify AWS client was used
-            mock_client.post_to_connection.assert_called()
-
-            # Cleanup
+            # Cleanup waits for the queued message
             await sample_aws_websocket_manager.cleanup()
+            mock_client.post_to_connection.assert_called()
             mock_client.close.assert_called()
 
 
@@ -570,6 +592,34 @@ class TestBaseWebSocketManagerPerformance:
         sent_messages = sample_local_stream_buffer[sample_local_websocket_manager.connection_id]
         assert len(sent_messages) == 100
 
+    @pytest.mark.asyncio
+    async def test_burst_is_posted_in_order_and_heartbeats_coalesced(
+        self,
+        sample_aws_websocket_manager: TestWebSocketManager,
+        sample_local_stream_buffer: Dict[str, List[str]],
+    ) -> None:
+        """Test a burst of AWS messages is posted in push order, with back to back heartbeats collapsed."""
+        mock_aws_client = AsyncMock()
+        sample_aws_websocket_manager.aws_client = mock_aws_client
+
+        for i in range(3):
+            await sample_aws_websocket_manager.push_to_connection_stream(
+                WebSocketMessage(type="BULK_MESSAGE", agent_id=i), sample_local_stream_buffer
+            )
+        for _ in range(3):
+            await sample_aws_websocket_manager.push_to_connection_stream(
+                WebSocketMessage(type="IN_PROGRESS"), sample_local_stream_buffer
+            )
+        await sample_aws_websocket_manager.cleanup()
+
+        posted = [json.loads(call[1]["message"]) for call in mock_aws_client.post_to_connection.call_args_list]
+        assert [(message["type"], message["agent_id"]) for message in posted] == [
+            ("BULK_MESSAGE", 0),
+            ("BULK_MESSAGE", 1),
+            ("BULK_MESSAGE", 2),
+            ("IN_PROGRESS", None),
+        ]
+
     @pytest.mark.asyncio
     async def test_concurrent_progress_and_messages(
         self,
@@ -0,0 +1,84 @@
+"""
+Unit tests for DiffBlobStore.
+
+Covers the compression of diffs kept inline in the cache, the spill of large diffs to S3 and the
+read-through decompression of both, as well as of plain diffs cached before compression.
+"""
+
+from typing import Any, Dict, Iterator, Tuple
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from app.main.blueprints.deputy_dev.services.code_review.ide_review.diff_blob_store import DiffBlobStore
+
+DIFF_BLOB_STORE_PATH = "app.main.blueprints.deputy_dev.services.code_review.ide_review.diff_blob_store"
+
+SAMPLE_DIFF = "--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-A = 1\n+A = 2\n" * 200
+
+
+@pytest.fixture
+def diff_storage() -> Iterator[Tuple[Dict[str, Any], Mock]]:
+    """In memory stand-ins for the cache and the S3 bucket of the store."""
+    cached_values: Dict[str, Any] = {}
+    objects: Dict[str, bytes] = {}
+
+    async def cache_set(key: str, value: Any) -> None:
+        cached_values[key] = value
+
+    async def put_object(object_name: str, body: bytes, content_type: str) -> None:
+        objects[object_name] = body
+
+    async def get_object(object_name: str) -> bytes:
+        return objects[object_name]
+
+    with (
+        patch(f"{DIFF_BLOB_STORE_PATH}.IdeReviewCache") as mock_cache,
+        patch.object(DiffBlobStore, "s3_client") as mock_s3_client,
+        patch.object(DiffBlobStore, "_config", return_value={"MAX_INLINE_BYTES": 64, "S3_FOLDER_PATH": "diffs"}),
+    ):
+        mock_cache.set = AsyncMock(side_effect=cache_set)
+        mock_cache.get = AsyncMock(side_effect=cached_values.get)
+        mock_s3_client.put_object = AsyncMock(side_effect=put_object)
+        mock_s3_client.get_object = AsyncMock(side_effect=get_object)
+        yield cached_values, mock_s3_client
+
+
+class TestDiffBlobStore:
+    """Test class for DiffBlobStore."""
+
+    @pytest.mark.asyncio
+    async def test_small_diff_is_kept_compressed_in_cache(self, diff_storage: Tuple[Dict[str, Any], Mock]) -> None:
+        cached_values, mock_s3_client = diff_storage
+        diff = "--- a/app.py\n+++ b/app.py\n@@ -1 +1 @@\n-A = 1\n+A = 2\n"
+
+        stored_diff = await DiffBlobStore.compress(diff)
+        await DiffBlobStore.set(key="1", value=stored_diff)
+
+        assert stored_diff.s3_key is None and stored_diff.size == len(diff)
+        assert "s3_key" not in cached_values["1"]
+        mock_s3_client.put_object.assert_not_called()
+        assert await DiffBlobStore.get("1") == diff
+
+    @pytest.mark.asyncio
+    async def test_large_diff_is_spilled_to_s3(self, diff_storage: Tuple[Dict[str, Any], Mock]) -> None:
+        cached_values, mock_s3_client = diff_storage
+
+        stored_diff = await DiffBlobStore.compress(SAMPLE_DIFF)
+        await DiffBlobStore.set(key="2", value=stored_diff)
+
+        assert stored_diff.data is None
+        assert stored_diff.s3_key.startswith("diffs/") and stored_diff.s3_key.endswith(".diff.gz")
+        assert cached_values["2"] == {"encoding": "gzip", "size": len(SAMPLE_DIFF), "s3_key": stored_diff.s3_key}
+        # the same diff maps to the same object
+        assert (await DiffBlobStore.compress(SAMPLE_DIFF)).s3_key == stored_diff.s3_key
+        assert await DiffBlobStore.get("2") == SAMPLE_DIFF
+        mock_s3_client.get_object.assert_called_once_with(stored_diff.s3_key)
+
+    @pytest.mark.asyncio
+    async def test_plain_and_missing_diffs_are_read_as_is(self, diff_storage: Tuple[Dict[str, Any], Mock]) -> None:
+        cached_values, _ = diff_storage
+        cached_values["3"] = SAMPLE_DIFF
+
+        assert await DiffBlobStore.get("3") == SAMPLE_DIFF
+        assert await DiffBlobStore.get("4") is None
@@ -13,10 +13,12 @@ from typing import Any, Dict
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from deputydev_core.llm_handler.models.dto.message_thread_dto import LLModels
 
 from app.main.blueprints.deputy_dev.services.code_review.common.agents.dataclasses.main import (
     AgentAndInitParams,
     AgentRunResult,
+    AgentTypes,
 )
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.main import (
     AgentRequestItem,
@@ -24,6 +26,15 @@ from app.main.blueprints.deputy_dev.services.code_review.ide_review.dataclass.ma
 from app.main.blueprints.deputy_dev.services.code_review.ide_review.ide_review_manager import IdeReviewManager
 from test.fixtures.main.blueprints.deputy_dev.services.code_review.ide_review.ide_review_manager_fixtures import *
 
+MANAGER_MODULE = "app.main.blueprints.deputy_dev.services.code_review.ide_review.ide_review_manager"
+
+
+@pytest.fixture(autouse=True)
+def disable_review_result_cache() -> Any:
+    """Run the agents of every test unless a test enables the review result cache itself."""
+    with patch(f"{MANAGER_MODULE}.ReviewResultCacheService.is_enabled", return_value=False):
+        yield
+
 
 class TestIdeReviewManagerReviewDiff:
     """Test cases for IdeReviewManager.review_diff method."""
@@ -1302,7 +1313,9 @@ class TestIdeReviewManagerIntegration:
             assert result == expected_query_response
 
             # Verify all components were initialized and called
-            mock_context_service.assert_called_once_with(review_id=sample_agent_request_query.review_id)
+            mock_context_service.assert_called_once_with(
+                review_id=sample_agent_request_query.review_id, diff_context=None
+            )
             mock_llm_service_manager.assert_called_once()
             mock_agent_factory.get_code_review_agent.assert_called_once_with(
                 agent_and_init_params=sample_agent_and_init_params,
@@ -1499,3 +1512,145 @@ class TestIdeReviewManagerStressTests:
 
             # Verify performance
             assert execution_time < 2.0  # Should complete bulk processing quickly
+
+
+class TestIdeReviewManagerReviewResultCache:
+    """Test cases for the reuse of cached agent comments in IdeReviewManager.review_diff."""
+
+    @pytest.fixture
+    def mock_agent(self) -> MagicMock:
+        agent = MagicMock()
+        agent.agent_id = 1
+        agent.agent_name = "security"
+        agent.agent_type = AgentTypes.SECURITY
+        agent.model = LLModels.CLAUDE_3_POINT_7_SONNET
+        agent.get_display_name.return_value = "Security"
+        agent.saved_comments = None
+        return agent
+
+    async def _review_diff(
+        self,
+        agent_request: AgentRequestItem,
+        mock_agent: MagicMock,
+        result_cache: MagicMock,
+        extension_review_dto: MagicMock,
+        user_agent_dto: MagicMock,
+        agent_and_init_params: AgentAndInitParams,
+    ) -> Dict[str, Any]:
+        with (
+            patch(f"{MANAGER_MODULE}.ExtensionReviewsRepository") as mock_ext_repo,
+            patch(f"{MANAGER_MODULE}.UserAgentRepository") as mock_user_agent_repo,
+            patch(f"{MANAGER_MODULE}.IdeReviewContextService") as mock_context_service,
+            patch(f"{MANAGER_MODULE}.LLMServiceManager"),
+            patch(f"{MANAGER_MODULE}.AgentFactory") as mock_agent_factory,
+            patch(f"{MANAGER_MODULE}.ReviewAgentStatusRepository") as mock_status_repo,
+            patch(f"{MANAGER_MODULE}.ReviewResultCacheService", result_cache),
+            patch.object(IdeReviewManager, "get_agent_and_init_params_for_review", return_value=agent_and_init_params),
+        ):
+            mock_ext_repo.db_get = AsyncMock(return_value=extension_review_dto)
+            mock_user_agent_repo.db_get = AsyncMock(return_value=user_agent_dto)
+            mock_status_repo.db_insert = AsyncMock()
+            context_service = mock_context_service.return_value
+            context_service.review_id = agent_request.review_id
+            context_service.get_diff_context = AsyncMock(return_value=MagicMock(diff_hash="diff-hash"))
+            mock_agent_factory.get_code_review_agent.return_value = mock_agent
+            return await IdeReviewManager.review_diff(agent_request)
+
+    @pytest.fixture
+    def result_cache(self) -> MagicMock:
+        result_cache = MagicMock()
+        result_cache.is_enabled.return_value = True
+        result_cache.agent_fingerprint.return_value = "fingerprint"
+        result_cache.get_comments = AsyncMock(return_value=None)
+        result_cache.set_comments = AsyncMock()
+        return result_cache
+
+    @pytest.mark.asyncio
+    async def test_cached_comments_are_reused_without_running_the_agent(
+        self,
+        sample_agent_request_query: AgentRequestItem,
+        sample_extension_review_dto: MagicMock,
+        sample_user_agent_dto: MagicMock,
+        sample_agent_and_init_params: AgentAndInitParams,
+        mock_agent: MagicMock,
+        result_cache: MagicMock,
+    ) -> None:
+        cached_comments = [MagicMock()]
+        result_cache.get_comments.return_value = cached_comments
+        mock_agent.run_agent = AsyncMock()
+
+        with patch(f"{MANAGER_MODULE}.IdeCommentRepository") as mock_comment_repo:
+            mock_comment_repo.insert_comments = AsyncMock()
+            result = await self._review_diff(
+                sample_agent_request_query,
+                mock_agent,
+                result_cache,
+                sample_extension_review_dto,
+                sample_user_agent_dto,
+                sample_agent_and_init_params,
+            )
+
+        assert result == {"type": "AGENT_COMPLETE", "agent_id": sample_agent_request_query.agent_id}
+        mock_agent.run_agent.assert_not_called()
+        result_cache.get_comments.assert_awaited_once_with(
+            "diff-hash", "fingerprint", review_id=sample_agent_request_query.review_id
+        )
+        mock_comment_repo.insert_comments.assert_awaited_once_with(cached_comments)
+        result_cache.set_comments.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_comments_of_an_agent_run_are_cached_on_miss(
+        self,
+        sample_agent_request_query: AgentRequestItem,
+        sample_extension_review_dto: MagicMock,
+        sample_user_agent_dto: MagicMock,
+        sample_agent_and_init_params: AgentAndInitParams,
+        sample_agent_run_result_success: AgentRunResult,
+        mock_agent: MagicMock,
+        result_cache: MagicMock,
+    ) -> None:
+        saved_comments = [MagicMock()]
+
+        async def run_agent(**kwargs: Any) -> AgentRunResult:
+            mock_agent.saved_comments = saved_comments
+            return sample_agent_run_result_success
+
+        mock_agent.run_agent = AsyncMock(side_effect=run_agent)
+
+        await self._review_diff(
+            sample_agent_request_query,
+            mock_agent,
+            result_cache,
+            sample_extension_review_dto,
+            sample_user_agent_dto,
+            sample_agent_and_init_params,
+        )
+
+        mock_agent.run_agent.assert_awaited_once()
+        result_cache.set_comments.assert_awaited_once_with("diff-hash", "fingerprint", comments=saved_comments)
+
+    @pytest.mark.asyncio
+    async def test_tool_use_responses_skip_the_cache_lookup(
+        self,
+        sample_agent_request_tool_use_response: AgentRequestItem,
+        sample_extension_review_dto: MagicMock,
+        sample_user_agent_dto: MagicMock,
+        sample_agent_and_init_params: AgentAndInitParams,
+        sample_agent_run_result_tool_use: AgentRunResult,
+        mock_agent: MagicMock,
+        result_cache: MagicMock,
+    ) -> None:
+        mock_agent.run_agent = AsyncMock(return_value=sample_agent_run_result_tool_use)
+
+        await self._review_diff(
+            sample_agent_request_tool_use_response,
+            mock_agent,
+            result_cache,
+            sample_extension_review_dto,
+            sample_user_agent_dto,
+            sample_agent_and_init_params,
+        )
+
+        result_cache.get_comments.assert_not_called()
+        result_cache.set_comments.assert_not_called()
+        mock_agent.run_agent.assert_awaited_once()
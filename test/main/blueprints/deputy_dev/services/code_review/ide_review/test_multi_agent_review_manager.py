@@ -66,7 +66,7 @@ class TestMultiAgentWebSocketManagerExecuteAgentTask:
             assert isinstance(result, WebSocketMessage)
             assert result.type == "REVIEW_COMPLETE"
             assert result.agent_id == sample_agent_request_query.agent_id
-            mock_ide_manager.review_diff.assert_called_once_with(sample_agent_request_query)
+            mock_ide_manager.review_diff.assert_called_once_with(sample_agent_request_query, diff_context=None)
 
     @pytest.mark.asyncio
     async def test_execute_agent_task_exception(
@@ -0,0 +1,94 @@
+"""
+Unit tests for the bulk insert of review comments and their agent mappings by IdeCommentRepository.
+"""
+
+import re
+from typing import Any, Iterator, List, Tuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.main.blueprints.deputy_dev.models.dto.ide_reviews_comment_dto import IdeReviewsCommentDTO
+from app.main.blueprints.deputy_dev.models.dto.user_agent_dto import UserAgentDTO
+from app.main.blueprints.deputy_dev.services.repository.ide_reviews_comments.repository import IdeCommentRepository
+
+REPOSITORY_PATH = "app.main.blueprints.deputy_dev.services.repository.ide_reviews_comments.repository"
+
+FIRST_RESERVED_ID = 5000
+
+
+def build_comment(index: int, agent_ids: List[int]) -> IdeReviewsCommentDTO:
+    return IdeReviewsCommentDTO(
+        title=f"title {index}",
+        review_id=1,
+        comment=f"comment {index}",
+        file_path="src/main.py",
+        line_hash="hash",
+        line_number=index,
+        tag="bug",
+        is_valid=True,
+        agents=[UserAgentDTO(id=agent_id) for agent_id in agent_ids],
+    )
+
+
+@pytest.fixture
+def raw_sql() -> Iterator[AsyncMock]:
+    async def execute(query: str, values: List[Any]) -> List[dict]:
+        if "nextval" in query:
+            return [{"id": FIRST_RESERVED_ID + index} for index in range(values[0])]
+        return []
+
+    with (
+        patch(f"{REPOSITORY_PATH}.DB.raw_sql", new=AsyncMock(side_effect=execute)) as mock_raw_sql,
+        patch(f"{REPOSITORY_PATH}.in_transaction", MagicMock()),
+    ):
+        yield mock_raw_sql
+
+
+def inserted_rows(query: str, values: List[Any]) -> List[Tuple[Any, ...]]:
+    """Resolve the placeholders of each VALUES row of an insert query to the bound values."""
+    rows = re.findall(r"\(((?:\$\d+, )+)TRUE, \$1, \$1\)", query)
+    return [tuple(values[int(placeholder) - 1] for placeholder in re.findall(r"\$(\d+)", row)) for row in rows]
+
+
+class TestIdeCommentRepositoryInsertComments:
+    """Test class for IdeCommentRepository.insert_comments."""
+
+    @pytest.mark.asyncio
+    async def test_placeholders_are_numbered_per_batch_across_boundary(self, raw_sql: AsyncMock) -> None:
+        comments = [build_comment(index, []) for index in range(IdeCommentRepository.INSERT_BATCH_SIZE + 2)]
+
+        comment_ids = await IdeCommentRepository.insert_comments(comments)
+
+        insert_calls = [call for call in raw_sql.await_args_list if "INSERT" in call.args[0]]
+        assert len(insert_calls) == 2
+        for call, batch in zip(insert_calls, [comments[:1000], comments[1000:]]):
+            query, values = call.args[0], call.kwargs["values"]
+            placeholders = [int(placeholder) for placeholder in re.findall(r"\$(\d+)", query) if placeholder != "1"]
+            # every value but the shared creation time is bound once, numbered from $2 within each batch
+            assert placeholders == list(range(2, len(values) + 1))
+            assert len(values) == 1 + 12 * len(batch)
+            rows = inserted_rows(query, values)
+            assert [row[0] for row in rows] == [comment_ids[comments.index(comment)] for comment in batch]
+            assert [row[3] for row in rows] == [comment.comment for comment in batch]
+        assert comment_ids == [FIRST_RESERVED_ID + index for index in range(len(comments))]
+
+    @pytest.mark.asyncio
+    async def test_agent_mappings_follow_reserved_ids(self, raw_sql: AsyncMock) -> None:
+        comments = [build_comment(0, [7]), build_comment(1, []), build_comment(2, [8, 7, 8])]
+
+        with patch(f"{REPOSITORY_PATH}.UserAgentCommentMapping") as mock_mapping:
+            mock_mapping.bulk_create = AsyncMock()
+            comment_ids = await IdeCommentRepository.insert_comments(comments)
+
+        insert_query, insert_values = next(
+            (call.args[0], call.kwargs["values"]) for call in raw_sql.await_args_list if "INSERT" in call.args[0]
+        )
+        assert [(row[0], row[3]) for row in inserted_rows(insert_query, insert_values)] == list(
+            zip(comment_ids, ["comment 0", "comment 1", "comment 2"])
+        )
+        assert [call.kwargs for call in mock_mapping.call_args_list] == [
+            {"agent_id": 7, "comment_id": comment_ids[0]},
+            {"agent_id": 8, "comment_id": comment_ids[2]},
+            {"agent_id": 7, "comment_id": comment_ids[2]},
+        ]
@@ -0,0 +1,62 @@
+"""
+Unit tests for EmbeddingPacker and the packed response formats of OneDevEmbeddingManager.
+"""
+
+import base64
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from app.main.blueprints.one_dev.services.embedding.dataclasses.main import (
+    EmbeddingDtype,
+    EmbeddingResponseFormat,
+    OneDevEmbeddingPayload,
+)
+from app.main.blueprints.one_dev.services.embedding.embedding_packer import EmbeddingPacker
+from app.main.blueprints.one_dev.services.embedding.manager import OneDevEmbeddingManager
+
+EMBEDDINGS = [np.array([0.5, -1.25, 3.0]), np.array([0.0, 2.5, -0.75])]
+
+
+class TestEmbeddingPacker:
+    """Test class for EmbeddingPacker."""
+
+    @pytest.mark.parametrize("dtype, item_size", [(EmbeddingDtype.FLOAT32, 4), (EmbeddingDtype.FLOAT16, 2)])
+    def test_embeddings_round_trip_with_shape_header(self, dtype: EmbeddingDtype, item_size: int) -> None:
+        packed = EmbeddingPacker.pack(EMBEDDINGS, dtype)
+
+        assert packed[:12] == (item_size).to_bytes(4, "little") + (2).to_bytes(4, "little") + (3).to_bytes(4, "little")
+        assert len(packed) == 12 + 2 * 3 * item_size
+        assert EmbeddingPacker.unpack(packed).tolist() == [embedding.tolist() for embedding in EMBEDDINGS]
+
+    def test_no_embeddings_pack_to_header_only(self) -> None:
+        packed = EmbeddingPacker.pack([], EmbeddingDtype.FLOAT32)
+
+        assert len(packed) == 12
+        assert EmbeddingPacker.unpack(packed).shape == (0, 0)
+
+
+class TestOneDevEmbeddingManagerResponseFormats:
+    """Test class for the response formats of OneDevEmbeddingManager."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response_format", list(EmbeddingResponseFormat))
+    async def test_response_formats_carry_same_embeddings(self, response_format: EmbeddingResponseFormat) -> None:
+        payload = OneDevEmbeddingPayload(texts=["a", "b"], store_embeddings=True, response_format=response_format)
+
+        with patch(
+            "app.main.blueprints.one_dev.services.embedding.manager.OpenAIEmbeddingManager.embed_text_array",
+            new=AsyncMock(return_value=(EMBEDDINGS, 7)),
+        ):
+            response = await OneDevEmbeddingManager.create_embeddings(payload)
+
+        assert response["tokens_used"] == 7
+        if response_format == EmbeddingResponseFormat.JSON:
+            embeddings = response["embeddings"]
+        elif response_format == EmbeddingResponseFormat.BINARY:
+            embeddings = EmbeddingPacker.unpack(response["embeddings"]).tolist()
+        else:
+            assert response["dtype"] == "float32" and response["shape"] == [2, 3]
+            embeddings = EmbeddingPacker.unpack(base64.b64decode(response["embeddings"])).tolist()
+        assert embeddings == [embedding.tolist() for embedding in EMBEDDINGS]
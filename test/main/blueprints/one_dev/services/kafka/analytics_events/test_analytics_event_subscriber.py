@@ -0,0 +1,135 @@
+"""
+Unit tests for the batch consumption of AnalyticsEventSubscriber.
+
+Covers the batched dedupe, owner lookups and single insert of a batch of analytics events, and the
+fallback to one by one processing when a batch fails. Kafka and the database are never touched.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from deputydev_core.utils.constants.enums import Clients
+
+from app.main.blueprints.one_dev.services.kafka.analytics_events.analytics_event_subscriber import (
+    AnalyticsEventSubscriber,
+)
+
+SUBSCRIBER_PATH = "app.main.blueprints.one_dev.services.kafka.analytics_events.analytics_event_subscriber"
+
+DUPLICATE_EVENT_ID = "9f1c6f0e-4c1b-4b7e-8d55-2f3f8a7f0c11"
+
+
+def build_message(
+    event_type: str,
+    event_id: Optional[str] = None,
+    session_id: Optional[int] = None,
+    event_data: Optional[Dict[str, Any]] = None,
+    offset: int = 0,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        offset=offset,
+        value={
+            "event_id": event_id,
+            "session_id": session_id,
+            "event_type": event_type,
+            "client_version": "1.0.0",
+            "client": Clients.BACKEND.value,
+            "timestamp": "2025-01-01T00:00:00",
+            "event_data": event_data or {},
+        },
+    )
+
+
+@pytest.fixture
+def subscriber() -> Iterator[AnalyticsEventSubscriber]:
+    config = {"KAFKA": {"SESSION_QUEUE": {"NAME": "analytics", "BATCH": {"ENABLED": True}}}}
+    with patch("app.main.blueprints.one_dev.services.kafka.base_kafka_subscriber.AIOKafkaConsumer"):
+        yield AnalyticsEventSubscriber(config)
+
+
+@pytest.fixture
+def repositories() -> Iterator[SimpleNamespace]:
+    with (
+        patch(f"{SUBSCRIBER_PATH}.AnalyticsEventsRepository") as mock_events_repo,
+        patch(f"{SUBSCRIBER_PATH}.MessageSessionsRepository") as mock_sessions_repo,
+        patch(f"{SUBSCRIBER_PATH}.IdeCommentRepository") as mock_comment_repo,
+        patch(f"{SUBSCRIBER_PATH}.ExtensionReviewsRepository") as mock_reviews_repo,
+    ):
+        mock_events_repo.get_existing_event_ids = AsyncMock(return_value={DUPLICATE_EVENT_ID})
+        mock_events_repo.save_analytics_events = AsyncMock()
+        mock_sessions_repo.get_by_ids = AsyncMock(
+            return_value=[SimpleNamespace(id=1, user_team_id=10), SimpleNamespace(id=2, user_team_id=20)]
+        )
+        mock_comment_repo.db_get = AsyncMock(return_value=[SimpleNamespace(id=5, review_id=50)])
+        mock_reviews_repo.db_get = AsyncMock(return_value=[SimpleNamespace(id=50, user_team_id=30)])
+        yield SimpleNamespace(
+            events=mock_events_repo, sessions=mock_sessions_repo, comments=mock_comment_repo, reviews=mock_reviews_repo
+        )
+
+
+class TestAnalyticsEventSubscriberBatch:
+    """Test class for the batch processing of AnalyticsEventSubscriber."""
+
+    def test_batch_mode_disables_auto_commit(self) -> None:
+        config = {"KAFKA": {"SESSION_QUEUE": {"NAME": "analytics", "BATCH": {"ENABLED": True, "MAX_RECORDS": 50}}}}
+        with patch("app.main.blueprints.one_dev.services.kafka.base_kafka_subscriber.AIOKafkaConsumer") as consumer:
+            subscriber = AnalyticsEventSubscriber(config)
+
+        assert (subscriber.batch_max_records, subscriber.batch_linger_ms) == (50, 1000)
+        assert consumer.call_args[1]["enable_auto_commit"] is False
+
+    @pytest.mark.asyncio
+    async def test_batch_is_stored_with_one_insert(
+        self, subscriber: AnalyticsEventSubscriber, repositories: SimpleNamespace
+    ) -> None:
+        new_event_id = "3b241101-e2bb-4255-8caf-4136c566a962"
+        messages = [
+            build_message("GENERATED", event_id=new_event_id, session_id=1),
+            build_message("GENERATED", event_id=new_event_id, session_id=1),  # repeated within the batch
+            build_message("ACCEPTED", event_id=DUPLICATE_EVENT_ID, session_id=2),  # already stored
+            build_message("COPIED", session_id=2),
+            build_message("FIX_WITH_DD", event_data={"comment_id": "5"}),
+            build_message("APPLIED", session_id=404),  # unknown session
+            build_message("not an event type"),
+        ]
+
+        await subscriber._process_messages(messages)
+
+        repositories.events.get_existing_event_ids.assert_awaited_once_with([new_event_id, DUPLICATE_EVENT_ID])
+        repositories.sessions.get_by_ids.assert_awaited_once()
+        assert sorted(repositories.sessions.get_by_ids.call_args[0][0]) == [1, 2, 404]
+        repositories.comments.db_get.assert_awaited_once_with(filters={"id__in": [5], "is_deleted": False})
+        repositories.events.save_analytics_events.assert_awaited_once()
+        saved_events: List[Any] = repositories.events.save_analytics_events.call_args[0][0]
+        assert [(event.event_type, event.user_team_id) for event in saved_events] == [
+            ("GENERATED", 10),
+            ("COPIED", 20),
+            ("FIX_WITH_DD", 30),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_processed_one_by_one(self, subscriber: AnalyticsEventSubscriber) -> None:
+        messages = [build_message("GENERATED", session_id=1, offset=0), SimpleNamespace(offset=1, value=None)]
+        subscriber._process_messages = AsyncMock(side_effect=RuntimeError("database unavailable"))
+        subscriber._process_message = AsyncMock()
+
+        await subscriber._handle_batch(messages)
+
+        subscriber._process_messages.assert_awaited_once_with(messages[:1])
+        subscriber._process_message.assert_awaited_once_with(messages[0])
+
+    @pytest.mark.asyncio
+    async def test_offsets_are_committed_after_the_batch(self, subscriber: AnalyticsEventSubscriber) -> None:
+        message = build_message("GENERATED", session_id=1)
+        subscriber.consumer = MagicMock()
+        subscriber.consumer.getmany = AsyncMock(side_effect=[{"partition": [message]}, RuntimeError("stopped")])
+        calls: List[str] = []
+        subscriber.consumer.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+        subscriber._process_messages = AsyncMock(side_effect=lambda messages: calls.append("process"))
+
+        with pytest.raises(RuntimeError):
+            await subscriber._consume_batches()
+
+        assert calls == ["process", "commit"]
@@ -0,0 +1,62 @@
+"""
+Unit tests for the offset commits of BaseKafkaSubscriber in concurrent mode across a rebalance.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiokafka.structs import TopicPartition
+
+from app.main.blueprints.one_dev.services.kafka.base_kafka_subscriber import (
+    BaseKafkaSubscriber,
+    CommitOnRevokeListener,
+)
+from app.main.blueprints.one_dev.services.kafka.concurrent_message_processor import ConcurrentMessageProcessor
+
+REVOKED_PARTITION = TopicPartition("analytics", 0)
+KEPT_PARTITION = TopicPartition("analytics", 1)
+
+
+class Subscriber(BaseKafkaSubscriber):
+    async def _process_message(self, message: Any) -> None:
+        return None
+
+
+def build_message(partition: int, offset: int) -> SimpleNamespace:
+    return SimpleNamespace(topic="analytics", partition=partition, offset=offset, value={})
+
+
+class TestBaseKafkaSubscriberRebalance:
+    """Test class for the commits of BaseKafkaSubscriber around a partition revocation."""
+
+    @pytest.mark.asyncio
+    async def test_commits_continue_for_kept_partitions_after_revocation(self) -> None:
+        subscriber = Subscriber({}, "analytics", {"CONCURRENCY": {"ENABLED": True}})
+        subscriber.consumer = MagicMock(commit=AsyncMock())
+        subscriber.consumer.assignment.return_value = {REVOKED_PARTITION, KEPT_PARTITION}
+        release = asyncio.Event()
+
+        async def handler(message: SimpleNamespace) -> None:
+            if message.offset == 1:
+                await release.wait()
+
+        processor = ConcurrentMessageProcessor(handler, max_in_flight=4)
+        for partition, offset in [(0, 0), (0, 1), (1, 0)]:
+            await processor.submit(build_message(partition, offset))
+        await asyncio.sleep(0.01)
+
+        await CommitOnRevokeListener(subscriber, processor).on_partitions_revoked({REVOKED_PARTITION})
+        subscriber.consumer.commit.assert_awaited_once_with({REVOKED_PARTITION: 1})
+        subscriber.consumer.assignment.return_value = {KEPT_PARTITION}
+
+        # the message in flight on the revoked partition completes after its state is dropped
+        release.set()
+        await processor.submit(build_message(1, 1))
+        await processor.drain()
+        await subscriber._commit_processed(processor)
+
+        subscriber.consumer.commit.assert_awaited_with({KEPT_PARTITION: 2})
+        assert processor.committable_offsets() == {}
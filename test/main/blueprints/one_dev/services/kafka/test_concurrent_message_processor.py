@@ -0,0 +1,87 @@
+"""
+Unit tests for ConcurrentMessageProcessor.
+
+Covers the bound on messages in flight, the ordering of messages sharing a key and the committable
+offsets, which never move past a message still in flight or a failed one.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from aiokafka.structs import TopicPartition
+
+from app.main.blueprints.one_dev.services.kafka.concurrent_message_processor import ConcurrentMessageProcessor
+
+PARTITION = TopicPartition("analytics", 0)
+
+
+def build_message(offset: int, key: Any = None) -> SimpleNamespace:
+    return SimpleNamespace(topic="analytics", partition=0, offset=offset, value={"key": key})
+
+
+class TestConcurrentMessageProcessor:
+    """Test class for ConcurrentMessageProcessor."""
+
+    @pytest.mark.asyncio
+    async def test_committable_offset_waits_for_oldest_message_in_flight(self) -> None:
+        releases: Dict[int, asyncio.Event] = {offset: asyncio.Event() for offset in range(3)}
+
+        async def handler(message: SimpleNamespace) -> None:
+            await releases[message.offset].wait()
+
+        processor = ConcurrentMessageProcessor(handler, max_in_flight=3)
+        for offset in range(3):
+            await processor.submit(build_message(offset))
+
+        releases[1].set()
+        releases[2].set()
+        await asyncio.sleep(0)
+        assert processor.committable_offsets() == {PARTITION: 0}
+
+        releases[0].set()
+        await processor.drain()
+        assert processor.committable_offsets() == {PARTITION: 3}
+        processor.mark_committed({PARTITION: 3})
+        assert processor.committable_offsets() == {}
+
+    @pytest.mark.asyncio
+    async def test_in_flight_messages_are_bounded_and_keys_ordered(self) -> None:
+        in_flight: List[int] = []
+        max_in_flight_seen = 0
+        processed: List[int] = []
+
+        async def handler(message: SimpleNamespace) -> None:
+            nonlocal max_in_flight_seen
+            in_flight.append(message.offset)
+            max_in_flight_seen = max(max_in_flight_seen, len(in_flight))
+            # later messages of a key finish first unless they wait for the earlier ones
+            await asyncio.sleep(0.01 * (10 - message.offset))
+            in_flight.remove(message.offset)
+            processed.append(message.offset)
+
+        processor = ConcurrentMessageProcessor(handler, max_in_flight=2, key_func=lambda message: message.value["key"])
+        for offset, key in enumerate(["a", "b", "a", "b", "a"]):
+            await processor.submit(build_message(offset, key))
+        await processor.drain()
+
+        assert max_in_flight_seen <= 2
+        assert [offset for offset in processed if offset % 2 == 0] == [0, 2, 4]
+        assert [offset for offset in processed if offset % 2 == 1] == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_failed_message_is_never_committed(self) -> None:
+        async def handler(message: SimpleNamespace) -> None:
+            if message.offset == 1:
+                raise RuntimeError("DLQ unavailable")
+
+        processor = ConcurrentMessageProcessor(handler, max_in_flight=4)
+        for offset in range(3):
+            await processor.submit(build_message(offset))
+
+        with pytest.raises(RuntimeError):
+            await processor.drain()
+        assert processor.committable_offsets() == {PARTITION: 1}
+        with pytest.raises(RuntimeError):
+            await processor.submit(build_message(3))
@@ -0,0 +1,54 @@
+"""
+Unit tests for Preflight.
+
+Covers concurrent execution of independent steps, per-step timings and the
+remaining budget handed to optional steps.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.main.blueprints.one_dev.services.query_solver.core.preflight import Preflight
+
+
+async def _step(result: str, delay: float) -> str:
+    await asyncio.sleep(delay)
+    return result
+
+
+class TestPreflight:
+    """Test class for Preflight."""
+
+    @pytest.mark.asyncio
+    async def test_gather_runs_steps_concurrently_and_keeps_order(self) -> None:
+        preflight = Preflight(query_id="query-1")
+
+        started_at = time.monotonic()
+        results = await preflight.gather(slow=_step("slow", 0.05), fast=_step("fast", 0.01))
+
+        assert results == ("slow", "fast")
+        assert time.monotonic() - started_at < 0.09
+        assert set(preflight.timings) == {"slow", "fast"}
+        assert preflight.timings["slow"] >= preflight.timings["fast"]
+
+    @pytest.mark.asyncio
+    async def test_run_records_timing_of_failed_step(self) -> None:
+        async def _failing_step() -> None:
+            raise ValueError("boom")
+
+        preflight = Preflight(query_id="query-1")
+        with pytest.raises(ValueError, match="boom"):
+            await preflight.run("failing", _failing_step())
+
+        assert "failing" in preflight.timings
+
+    @pytest.mark.asyncio
+    async def test_remaining_budget_shrinks_and_never_goes_negative(self) -> None:
+        preflight = Preflight(query_id="query-1", budget=0.02)
+        assert 0 < preflight.remaining() <= 0.02
+
+        await preflight.run("step", _step("done", 0.03))
+
+        assert preflight.remaining() == 0.0
@@ -0,0 +1,135 @@
+"""
+Unit tests for StreamMultiplexer and StreamSubscription.
+
+The shared XREAD is patched to return canned entries so that dispatching,
+offset filtering and subscription lifecycle can be tested without Redis.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Iterator, List
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_multiplexer import (
+    StreamMultiplexer,
+    StreamSubscription,
+)
+
+STREAM_HANDLER_PATH = (
+    "app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_multiplexer.StreamHandler"
+)
+
+
+async def _collect(subscription: StreamSubscription) -> List[str]:
+    return [message_id async for message_id, _fields in subscription]
+
+
+@pytest.fixture(autouse=True)
+def reset_multiplexer() -> Iterator[None]:
+    StreamMultiplexer._subscriptions = {}
+    StreamMultiplexer._reader_task = None
+    yield
+    if StreamMultiplexer._reader_task:
+        StreamMultiplexer._reader_task.cancel()
+    StreamMultiplexer._subscriptions = {}
+
+
+class TestStreamSubscription:
+    """Test class for StreamSubscription."""
+
+    @pytest.mark.asyncio
+    async def test_entries_at_or_before_offset_are_skipped(self) -> None:
+        subscription = StreamSubscription("stream-key", offset_id="5-1")
+        for message_id in ["5-0", "5-1", "5-2", "12-0"]:
+            subscription.deliver(message_id, {"data": "{}"})
+        subscription.close()
+
+        assert await _collect(subscription) == ["5-2", "12-0"]
+        assert subscription.offset_id == "12-0"
+
+
+class TestStreamMultiplexer:
+    """Test class for StreamMultiplexer."""
+
+    @pytest.mark.asyncio
+    async def test_single_read_is_dispatched_to_all_subscriptions(self) -> None:
+        reads: List[Dict[str, str]] = []
+        responses: List[Any] = [
+            [
+                ("key-a", [("1-0", {"data": "a1"}), ("2-0", {"data": "a2"})]),
+                ("key-b", [("3-0", {"data": "b1"})]),
+            ]
+        ]
+
+        async def fake_xread(streams: Dict[str, str], count: int, block: int) -> List[Any]:
+            reads.append(dict(streams))
+            if responses:
+                return responses.pop(0)
+            await asyncio.sleep(0.01)
+            return []
+
+        with (
+            patch(f"{STREAM_HANDLER_PATH}._redis_xread", side_effect=fake_xread),
+            patch(f"{STREAM_HANDLER_PATH}._redis_xadd_many", new_callable=AsyncMock),
+            patch.object(StreamMultiplexer, "_close_missing_streams", new_callable=AsyncMock),
+        ):
+            first_a = await StreamMultiplexer.subscribe("key-a", "0")
+            second_a = await StreamMultiplexer.subscribe("key-a", "1-0")
+            only_b = await StreamMultiplexer.subscribe("key-b", "0")
+            await asyncio.sleep(0.05)
+
+            for subscription in [first_a, second_a, only_b]:
+                StreamMultiplexer.unsubscribe(subscription)
+
+            assert await _collect(first_a) == ["1-0", "2-0"]
+            assert await _collect(second_a) == ["2-0"]
+            assert await _collect(only_b) == ["3-0"]
+
+        # both streams are read by one XREAD, from the lowest offset among their subscribers
+        assert reads[0]["key-a"] == "0"
+        assert reads[0]["key-b"] == "0"
+        assert StreamMultiplexer._subscriptions == {}
+
+    @pytest.mark.asyncio
+    async def test_expired_stream_closes_its_subscriptions(self) -> None:
+        subscription = StreamSubscription("key-a")
+        subscription.received_entries = True
+        StreamMultiplexer._subscriptions = {"key-a": {subscription}}
+        StreamMultiplexer._last_existence_check = 0.0
+
+        pipeline = AsyncMock()
+        pipeline.exists = lambda key: None
+        pipeline.execute = AsyncMock(return_value=[0])
+        with patch(f"{STREAM_HANDLER_PATH}._get_redis_client") as mock_client:
+            mock_client.return_value.pipeline.return_value = pipeline
+            await StreamMultiplexer._close_missing_streams()
+
+        assert StreamMultiplexer._subscriptions == {}
+        assert await _collect(subscription) == []
+
+    @pytest.mark.asyncio
+    async def test_resume_of_missing_stream_closes_without_waiting(self) -> None:
+        async def fake_xread(streams: Dict[str, str], count: int, block: int) -> List[Any]:
+            await asyncio.sleep(0.01)
+            return []
+
+        pipeline = AsyncMock()
+        pipeline.exists = lambda key: None
+        pipeline.execute = AsyncMock(side_effect=lambda: [0] * len(StreamMultiplexer._subscriptions))
+        # a check just ran, so only the resume itself can trigger the next one
+        StreamMultiplexer._last_existence_check = time.monotonic()
+
+        with (
+            patch(f"{STREAM_HANDLER_PATH}._redis_xread", side_effect=fake_xread),
+            patch(f"{STREAM_HANDLER_PATH}._redis_xadd_many", new_callable=AsyncMock),
+            patch(f"{STREAM_HANDLER_PATH}._get_redis_client") as mock_client,
+        ):
+            mock_client.return_value.pipeline.return_value = pipeline
+            new_stream = await StreamMultiplexer.subscribe("key-new", "0")
+            resumed = await StreamMultiplexer.subscribe("key-expired", "5-0")
+
+            assert await asyncio.wait_for(_collect(resumed), timeout=1) == []
+            # a subscription from the start keeps waiting for its stream to be created
+            assert StreamMultiplexer._subscriptions == {"key-new": {new_stream}}
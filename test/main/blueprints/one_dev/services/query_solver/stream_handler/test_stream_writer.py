@@ -0,0 +1,146 @@
+"""
+Unit tests for StreamWriter.
+
+Covers delta coalescing, flush triggers and TTL handling of the buffered
+query-solver stream writer. Redis is never touched: StreamHandler's
+pipelined write methods are patched.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from deputydev_core.llm_handler.dataclasses.main import (
+    StreamingEventType,
+    TextBlockDelta,
+    TextBlockDeltaContent,
+    TextBlockStart,
+)
+
+from app.main.blueprints.one_dev.services.query_solver.prompts.feature_prompts.code_query_solver.dataclasses.main import (
+    CodeBlockDelta,
+    CodeBlockDeltaContent,
+    ThinkingBlockDelta,
+    ThinkingBlockDeltaContent,
+)
+from app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_writer import StreamWriter
+
+STREAM_HANDLER_PATH = "app.main.blueprints.one_dev.services.query_solver.stream_handler.stream_writer.StreamHandler"
+
+
+def _text_delta(text: str) -> TextBlockDelta:
+    return TextBlockDelta(type=StreamingEventType.TEXT_BLOCK_DELTA, content=TextBlockDeltaContent(text=text))
+
+
+def _written_events(mock_push_many: AsyncMock) -> List[Dict[str, Any]]:
+    events: List[Dict[str, Any]] = []
+    for call in mock_push_many.call_args_list:
+        events.extend(json.loads(message) for message in call.args[1])
+    return events
+
+
+class TestStreamWriter:
+    """Test class for StreamWriter."""
+
+    @pytest.mark.asyncio
+    async def test_adjacent_deltas_are_coalesced_into_one_entry(self) -> None:
+        with patch(f"{STREAM_HANDLER_PATH}.push_many_to_stream", new_callable=AsyncMock) as mock_push_many:
+            writer = StreamWriter(stream_id="query-1", flush_interval=60)
+            for text in ["Hel", "lo ", "World"]:
+                await writer.push(_text_delta(text))
+
+            mock_push_many.assert_not_called()
+            await writer.close()
+
+        events = _written_events(mock_push_many)
+        assert len(events) == 1
+        assert events[0]["type"] == "TEXT_BLOCK_DELTA"
+        assert events[0]["content"]["text"] == "Hello World"
+
+    @pytest.mark.asyncio
+    async def test_deltas_of_different_blocks_are_not_merged(self) -> None:
+        with patch(f"{STREAM_HANDLER_PATH}.push_many_to_stream", new_callable=AsyncMock) as mock_push_many:
+            writer = StreamWriter(stream_id="query-1", flush_interval=60)
+            await writer.push(ThinkingBlockDelta(content=ThinkingBlockDeltaContent(thinking_delta="a")))
+            await writer.push(ThinkingBlockDelta(content=ThinkingBlockDeltaContent(thinking_delta="b")))
+            await writer.push(CodeBlockDelta(content=CodeBlockDeltaContent(code_delta="x = 1")))
+            await writer.push(
+                ThinkingBlockDelta(content=ThinkingBlockDeltaContent(thinking_delta="c"), ignore_in_chat=True)
+            )
+            await writer.close()
+
+        events = _written_events(mock_push_many)
+        assert [event["type"] for event in events] == [
+            "THINKING_BLOCK_DELTA",
+            "CODE_BLOCK_DELTA",
+            "THINKING_BLOCK_DELTA",
+        ]
+        assert events[0]["content"]["thinking_delta"] == "ab"
+        assert events[2]["ignore_in_chat"] is True
+
+    @pytest.mark.asyncio
+    async def test_non_delta_event_flushes_buffer_in_order(self) -> None:
+        with patch(f"{STREAM_HANDLER_PATH}.push_many_to_stream", new_callable=AsyncMock) as mock_push_many:
+            writer = StreamWriter(stream_id="query-1", flush_interval=60)
+            await writer.push(_text_delta("partial"))
+            await writer.push(TextBlockStart(type=StreamingEventType.TEXT_BLOCK_START))
+
+            assert mock_push_many.call_count == 1
+            events = _written_events(mock_push_many)
+            assert [event["type"] for event in events] == ["TEXT_BLOCK_DELTA", "TEXT_BLOCK_START"]
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_triggers_flush(self) -> None:
+        with patch(f"{STREAM_HANDLER_PATH}.push_many_to_stream", new_callable=AsyncMock) as mock_push_many:
+            writer = StreamWriter(stream_id="query-1", flush_interval=60, max_buffered_chars=10)
+            await writer.push(_text_delta("12345"))
+            mock_push_many.assert_not_called()
+            await writer.push(_text_delta("67890"))
+            mock_push_many.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_buffered_deltas_are_flushed_after_interval(self) -> None:
+        with patch(f"{STREAM_HANDLER_PATH}.push_many_to_stream", new_callable=AsyncMock) as mock_push_many:
+            writer = StreamWriter(stream_id="query-1", flush_interval=0.01)
+            await writer.push(_text_delta("tick"))
+            await asyncio.sleep(0.05)
+
+            mock_push_many.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expiration_is_set_once_until_close(self) -> None:
+        with (
+            patch(f"{STREAM_HANDLER_PATH}.push_many_to_stream", new_callable=AsyncMock) as mock_push_many,
+            patch(f"{STREAM_HANDLER_PATH}.set_stream_expiration", new_callable=AsyncMock) as mock_set_expiration,
+        ):
+            writer = StreamWriter(stream_id="query-1", flush_interval=60)
+            for _ in range(3):
+                await writer.push(TextBlockStart(type=StreamingEventType.TEXT_BLOCK_START))
+
+            set_expiration_flags = [call.kwargs["set_expiration"] for call in mock_push_many.call_args_list]
+            assert set_expiration_flags == [True, False, False]
+
+            await writer.close()
+            mock_set_expiration.assert_awaited_once_with("query-1")
+
+    @pytest.mark.asyncio
+    async def test_events_of_failed_flush_are_retried_in_order(self) -> None:
+        with patch(
+            f"{STREAM_HANDLER_PATH}.push_many_to_stream",
+            new_callable=AsyncMock,
+            side_effect=[ConnectionError("redis unavailable"), None],
+        ) as mock_push_many:
+            writer = StreamWriter(stream_id="query-1", flush_interval=0.01)
+            await writer.push(_text_delta("Hel"))
+            # the timed flush fails, its events stay buffered
+            await asyncio.sleep(0.05)
+            await writer.push(_text_delta("lo"))
+            await writer.push(TextBlockStart(type=StreamingEventType.TEXT_BLOCK_START))
+
+        assert mock_push_many.call_count == 2
+        delivered_events = [json.loads(message) for message in mock_push_many.call_args_list[1].args[1]]
+        assert [event["type"] for event in delivered_events] == ["TEXT_BLOCK_DELTA", "TEXT_BLOCK_START"]
+        assert delivered_events[0]["content"]["text"] == "Hello"
+        assert mock_push_many.call_args_list[1].kwargs["set_expiration"] is True
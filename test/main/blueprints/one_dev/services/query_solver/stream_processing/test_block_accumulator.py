@@ -0,0 +1,36 @@
+"""
+Unit tests for BlockAccumulator.
+"""
+
+from app.main.blueprints.one_dev.models.dto.agent_chats import MessageType as ChatMessageType
+from app.main.blueprints.one_dev.services.query_solver.stream_processing.block_accumulator import BlockAccumulator
+
+
+class TestBlockAccumulator:
+    """Test class for BlockAccumulator."""
+
+    def test_materialize_joins_all_deltas_in_order(self) -> None:
+        block = BlockAccumulator(ChatMessageType.CODE_BLOCK, language="python", file_path="main.py")
+        for chunk in ["def ", "main", "():\n", "", "    pass\n"]:
+            block.append(chunk)
+
+        assert block.materialize() == "def main():\n    pass\n"
+        assert block.attributes == {"language": "python", "file_path": "main.py"}
+
+    def test_materialize_is_repeatable_and_allows_further_appends(self) -> None:
+        block = BlockAccumulator(ChatMessageType.TEXT)
+        block.append("Hello ")
+        block.append("World")
+
+        assert block.materialize() == "Hello World"
+        assert block.materialize() == "Hello World"
+
+        block.append("!")
+        assert block.materialize() == "Hello World!"
+
+    def test_empty_block_materializes_to_empty_string(self) -> None:
+        block = BlockAccumulator(ChatMessageType.THINKING, ignore_in_chat=False)
+
+        assert block.materialize() == ""
+        assert block.is_of_type(ChatMessageType.THINKING)
+        assert not block.is_of_type(ChatMessageType.TEXT)
@@ -0,0 +1,70 @@
+"""
+Unit tests for the single statement storage of tool use responses by AgentChatsRepository.
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.main.blueprints.one_dev.constants.tools import ToolStatus
+from app.main.blueprints.one_dev.models.dto.agent_chats import ToolUseMessageData, ToolUseResponseUpdate
+from app.main.blueprints.one_dev.services.repository.agent_chats.repository import AgentChatsRepository
+
+REPOSITORY_PATH = "app.main.blueprints.one_dev.services.repository.agent_chats.repository"
+
+
+class TestAgentChatsRepositoryToolUseResponses:
+    """Test class for AgentChatsRepository.update_tool_use_responses."""
+
+    @pytest.mark.asyncio
+    async def test_updated_chats_are_built_from_returned_rows(self) -> None:
+        message_data = {
+            "message_type": "TOOL_USE",
+            "tool_use_id": "tool-1",
+            "tool_name": "grep",
+            "tool_input": {"query": "foo"},
+            "tool_response": {"matches": 2},
+            "tool_status": ToolStatus.COMPLETED.value,
+        }
+        returned_row = {
+            "id": 10,
+            "session_id": 1,
+            "query_id": "query-1",
+            "previous_queries": "[]",
+            "actor": "ASSISTANT",
+            "message_type": "TOOL_USE",
+            "message_data": json.dumps(message_data),
+            "metadata": "{}",
+            "tool_use_id": "tool-1",
+            "created_at": datetime(2025, 1, 1),
+            "updated_at": datetime(2025, 1, 2),
+        }
+
+        with (
+            patch(f"{REPOSITORY_PATH}.DB") as mock_db,
+            patch(f"{REPOSITORY_PATH}.SessionChatsSnapshot") as mock_snapshot,
+        ):
+            mock_db.raw_sql = AsyncMock(return_value=[returned_row])
+            mock_db.by_filters = AsyncMock()
+            mock_snapshot.record_write = AsyncMock()
+
+            updated_chats = await AgentChatsRepository.update_tool_use_responses(
+                1,
+                [
+                    ToolUseResponseUpdate(
+                        tool_use_id="tool-1", tool_response={"matches": 2}, tool_status=ToolStatus.COMPLETED
+                    ),
+                    ToolUseResponseUpdate(tool_use_id="missing", tool_response={}, tool_status=ToolStatus.FAILED),
+                ],
+            )
+
+        assert list(updated_chats) == ["tool-1"]
+        chat = updated_chats["tool-1"]
+        assert chat.id == 10
+        assert chat.message_data == ToolUseMessageData(**message_data)
+        assert "RETURNING chats.*" in mock_db.raw_sql.await_args.args[0]
+        mock_db.raw_sql.assert_awaited_once()
+        mock_db.by_filters.assert_not_called()
+        mock_snapshot.record_write.assert_awaited_once_with(chat)
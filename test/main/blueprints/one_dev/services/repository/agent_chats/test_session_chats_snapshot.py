@@ -0,0 +1,125 @@
+"""
+Unit tests for SessionChatsSnapshot.
+
+Redis is never touched: AgentChatsSnapshotCache is replaced by an in memory stand-in holding the
+serialized snapshot and version of a single session.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.main.blueprints.one_dev.models.dto.agent_chats import (
+    ActorType,
+    AgentChatDTO,
+    MessageType,
+    TextMessageData,
+)
+from app.main.blueprints.one_dev.services.repository.agent_chats.session_chats_snapshot import (
+    SessionChatsSnapshot,
+)
+
+SNAPSHOT_PATH = "app.main.blueprints.one_dev.services.repository.agent_chats.session_chats_snapshot"
+SESSION_ID = 1
+
+
+def make_chat(chat_id: int, text: str) -> AgentChatDTO:
+    return AgentChatDTO(
+        id=chat_id,
+        session_id=SESSION_ID,
+        query_id="query-1",
+        actor=ActorType.USER,
+        message_type=MessageType.TEXT,
+        message_data=TextMessageData(text=text),
+        metadata={},
+        previous_queries=[],
+        created_at=datetime(2025, 1, 1, 0, 0, chat_id),
+        updated_at=datetime(2025, 1, 1, 0, 0, chat_id),
+    )
+
+
+@pytest.fixture
+def snapshot_cache() -> Iterator[Tuple[Dict[str, Optional[Dict[str, str]]], MagicMock]]:
+    state: Dict[str, Optional[Dict[str, str]]] = {"snapshot": None}
+    version = [0]
+
+    async def get_version(session_id: int) -> int:
+        return version[0]
+
+    async def get_snapshot(session_id: int) -> Tuple[int, Optional[Dict[str, str]]]:
+        return version[0], state["snapshot"]
+
+    async def populate(session_id: int, expected_version: int, chats: Dict[int, str]) -> bool:
+        state["snapshot"] = {str(chat_id): chat for chat_id, chat in chats.items()}
+        return True
+
+    async def invalidate(session_id: int) -> None:
+        state["snapshot"] = None
+        version[0] += 1
+
+    with (
+        patch(f"{SNAPSHOT_PATH}.AgentChatsSnapshotCache") as mock_cache,
+        patch.object(SessionChatsSnapshot, "_local", LocalLRUCache(max_size=10)),
+    ):
+        mock_cache.get_version = AsyncMock(side_effect=get_version)
+        mock_cache.get_snapshot = AsyncMock(side_effect=get_snapshot)
+        mock_cache.populate = AsyncMock(side_effect=populate)
+        mock_cache.invalidate = AsyncMock(side_effect=invalidate)
+        mock_cache.record_write = AsyncMock()
+        yield state, mock_cache
+
+
+class TestSessionChatsSnapshot:
+    """Test class for SessionChatsSnapshot."""
+
+    @pytest.mark.asyncio
+    async def test_mutating_returned_chats_does_not_change_next_read(
+        self, snapshot_cache: Tuple[Dict[str, Optional[Dict[str, str]]], MagicMock]
+    ) -> None:
+        loader = AsyncMock(return_value=[make_chat(1, "first"), make_chat(2, "second")])
+
+        chats = await SessionChatsSnapshot.get_chats(SESSION_ID, loader)
+        chats[0].message_data.text = "stripped"
+        chats[1].metadata["mutated"] = True
+
+        chats_read_again: List[AgentChatDTO] = await SessionChatsSnapshot.get_chats(SESSION_ID, loader)
+
+        loader.assert_awaited_once()
+        assert [chat.message_data.text for chat in chats_read_again] == ["first", "second"]
+        assert chats_read_again[1].metadata == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_write_invalidates_shared_snapshot(
+        self, snapshot_cache: Tuple[Dict[str, Optional[Dict[str, str]]], MagicMock]
+    ) -> None:
+        state, mock_cache = snapshot_cache
+        loader = AsyncMock(return_value=[make_chat(1, "first")])
+        await SessionChatsSnapshot.get_chats(SESSION_ID, loader)
+        mock_cache.record_write.side_effect = ConnectionError("redis unavailable")
+
+        await SessionChatsSnapshot.record_write(make_chat(2, "second"))
+
+        mock_cache.invalidate.assert_awaited_once_with(SESSION_ID)
+        assert state["snapshot"] is None
+        assert len(SessionChatsSnapshot._local) == 0
+
+        loader.return_value = [make_chat(1, "first"), make_chat(2, "second")]
+        chats = await SessionChatsSnapshot.get_chats(SESSION_ID, loader)
+
+        assert [chat.id for chat in chats] == [1, 2]
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_invalidation_is_not_raised(
+        self, snapshot_cache: Tuple[Dict[str, Optional[Dict[str, str]]], MagicMock]
+    ) -> None:
+        _, mock_cache = snapshot_cache
+        mock_cache.record_write.side_effect = ConnectionError("redis unavailable")
+        mock_cache.invalidate.side_effect = ConnectionError("redis unavailable")
+
+        await SessionChatsSnapshot.record_delete(SESSION_ID, 1)
+
+        mock_cache.invalidate.assert_awaited_once_with(SESSION_ID)
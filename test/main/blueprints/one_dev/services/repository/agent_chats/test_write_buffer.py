@@ -0,0 +1,102 @@
+"""
+Unit tests for AgentChatsWriteBuffer.
+
+Covers ordering, flush triggers and retry of failed flushes of the write-behind
+agent chats buffer. The database is never touched: the repository bulk insert is patched.
+"""
+
+import asyncio
+from typing import List
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.main.blueprints.one_dev.models.dto.agent_chats import (
+    ActorType,
+    AgentChatCreateRequest,
+    TextMessageData,
+)
+from app.main.blueprints.one_dev.models.dto.agent_chats import MessageType as ChatMessageType
+from app.main.blueprints.one_dev.services.repository.agent_chats.write_buffer import AgentChatsWriteBuffer
+
+REPOSITORY_PATH = "app.main.blueprints.one_dev.services.repository.agent_chats.write_buffer.AgentChatsRepository"
+
+
+def _text_chat(text: str) -> AgentChatCreateRequest:
+    return AgentChatCreateRequest(
+        session_id=1,
+        query_id="query-1",
+        actor=ActorType.ASSISTANT,
+        message_type=ChatMessageType.TEXT,
+        message_data=TextMessageData(text=text),
+        metadata={},
+        previous_queries=[],
+    )
+
+
+def _written_texts(mock_bulk_create: AsyncMock) -> List[str]:
+    return [chat.message_data.text for call in mock_bulk_create.call_args_list for chat in call.args[0]]
+
+
+class TestAgentChatsWriteBuffer:
+    """Test class for AgentChatsWriteBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_chats_are_written_in_one_ordered_bulk_insert(self) -> None:
+        with patch(f"{REPOSITORY_PATH}.bulk_create_chats", new_callable=AsyncMock) as mock_bulk_create:
+            buffer = AgentChatsWriteBuffer(session_id=1, flush_interval=60)
+            for text in ["first", "second", "third"]:
+                buffer.add(_text_chat(text))
+
+            mock_bulk_create.assert_not_called()
+            await buffer.flush()
+
+        mock_bulk_create.assert_called_once()
+        assert _written_texts(mock_bulk_create) == ["first", "second", "third"]
+        created_at = mock_bulk_create.call_args.kwargs["custom_created_at"]
+        assert created_at == sorted(created_at)
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_flushes_in_background(self) -> None:
+        with patch(f"{REPOSITORY_PATH}.bulk_create_chats", new_callable=AsyncMock) as mock_bulk_create:
+            buffer = AgentChatsWriteBuffer(session_id=1, flush_interval=60, max_buffered_chats=2)
+            buffer.add(_text_chat("first"))
+            buffer.add(_text_chat("second"))
+            await asyncio.sleep(0)
+
+            mock_bulk_create.assert_called_once()
+            await buffer.flush()
+
+        assert _written_texts(mock_bulk_create) == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_interval_flush(self) -> None:
+        with patch(f"{REPOSITORY_PATH}.bulk_create_chats", new_callable=AsyncMock) as mock_bulk_create:
+            buffer = AgentChatsWriteBuffer(session_id=1, flush_interval=0.01)
+            buffer.add(_text_chat("first"))
+            await asyncio.sleep(0.05)
+
+        mock_bulk_create.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_chats_for_retry(self) -> None:
+        with patch(f"{REPOSITORY_PATH}.bulk_create_chats", new_callable=AsyncMock) as mock_bulk_create:
+            mock_bulk_create.side_effect = [Exception("db down"), []]
+            buffer = AgentChatsWriteBuffer(session_id=1, flush_interval=60)
+            buffer.add(_text_chat("first"))
+
+            with pytest.raises(Exception, match="db down"):
+                await buffer.flush()
+
+            buffer.add(_text_chat("second"))
+            await buffer.flush()
+
+        assert _written_texts(mock_bulk_create) == ["first", "first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_flush_without_pending_chats_does_not_write(self) -> None:
+        with patch(f"{REPOSITORY_PATH}.bulk_create_chats", new_callable=AsyncMock) as mock_bulk_create:
+            buffer = AgentChatsWriteBuffer(session_id=1)
+            assert await buffer.flush() == []
+
+        mock_bulk_create.assert_not_called()
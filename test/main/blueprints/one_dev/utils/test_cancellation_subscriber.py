@@ -0,0 +1,199 @@
+"""
+Unit tests for CancellationSubscriber and CancellationChecker.
+
+Redis is never touched: CodeGenTasksCache is patched with a fake pub/sub connection fed from a
+queue, and an in memory set of cancelled sessions.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.backend_common.utils.sanic_wrapper.constants import ListenerEventTypes
+from app.listeners import listeners, stop_cancellation_subscriber
+from app.main.blueprints.one_dev.utils.cancellation_checker import CancellationChecker
+from app.main.blueprints.one_dev.utils.cancellation_subscriber import CancellationSubscriber
+
+SUBSCRIBER_CACHE_PATH = "app.main.blueprints.one_dev.utils.cancellation_subscriber.CodeGenTasksCache"
+CHECKER_CACHE_PATH = "app.main.blueprints.one_dev.utils.cancellation_checker.CodeGenTasksCache"
+
+
+class FakePubSub:
+    def __init__(self) -> None:
+        self.messages: asyncio.Queue[Union[Dict[str, Any], Exception]] = asyncio.Queue()
+        self.channels: List[str] = []
+        self.closed = False
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.append(channel)
+
+    async def get_message(self, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        try:
+            message = await asyncio.wait_for(self.messages.get(), timeout=kwargs["timeout"])
+        except asyncio.TimeoutError:
+            return None
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    def publish(self, session_id: int) -> None:
+        self.messages.put_nowait({"type": "message", "data": json.dumps(session_id)})
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture
+def cancelled_sessions() -> Set[int]:
+    return set()
+
+
+@pytest.fixture
+def pubsubs(cancelled_sessions: Set[int]) -> Iterator[List[FakePubSub]]:
+    """Pub/sub connections handed to the subscriber, in the order they are opened."""
+    connections: List[FakePubSub] = []
+
+    async def is_session_cancelled(session_id: int) -> bool:
+        return session_id in cancelled_sessions
+
+    def get_pubsub() -> FakePubSub:
+        connections.append(FakePubSub())
+        return connections[-1]
+
+    CancellationSubscriber._session_events = {}
+    with (
+        patch(SUBSCRIBER_CACHE_PATH) as subscriber_cache,
+        patch(CHECKER_CACHE_PATH) as checker_cache,
+        patch.object(CancellationSubscriber, "POLL_TIMEOUT", 0.01),
+        patch.object(CancellationSubscriber, "RECONNECT_BACKOFF", 0.01),
+    ):
+        for cache in (subscriber_cache, checker_cache):
+            cache.is_session_cancelled = AsyncMock(side_effect=is_session_cancelled)
+        subscriber_cache.cancellation_channel = MagicMock(return_value="cancellations")
+        subscriber_cache.get_pubsub = MagicMock(side_effect=get_pubsub)
+        yield connections
+    # tests stop the listener themselves, this only keeps a failed test from leaking it into the next one
+    if CancellationSubscriber._listener_task is not None and not CancellationSubscriber._listener_task.done():
+        CancellationSubscriber._listener_task.cancel()
+    CancellationSubscriber._listener_task = None
+    CancellationSubscriber._listening = False
+    CancellationSubscriber._session_events = {}
+
+
+class TestCancellationSubscriber:
+    """Test class for CancellationSubscriber."""
+
+    @pytest.mark.asyncio
+    async def test_published_cancellation_sets_only_that_sessions_events(self, pubsubs: List[FakePubSub]) -> None:
+        cancelled, other = asyncio.Event(), asyncio.Event()
+        CancellationSubscriber.register(1, cancelled)
+        CancellationSubscriber.register(2, other)
+        await wait_until(CancellationSubscriber.is_listening)
+
+        pubsubs[0].publish(1)
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await CancellationSubscriber.stop()
+
+        assert pubsubs[0].channels == ["cancellations"]
+        assert not other.is_set()
+
+    @pytest.mark.asyncio
+    async def test_unregistered_event_is_not_set(self, pubsubs: List[FakePubSub]) -> None:
+        event = asyncio.Event()
+        CancellationSubscriber.register(1, event)
+        CancellationSubscriber.unregister(1, event)
+        await wait_until(CancellationSubscriber.is_listening)
+
+        pubsubs[0].publish(1)
+        await asyncio.sleep(0.05)
+        await CancellationSubscriber.stop()
+
+        assert not event.is_set()
+        assert CancellationSubscriber._session_events == {}
+
+    @pytest.mark.asyncio
+    async def test_reconnect_resyncs_cancellations_missed_while_down(
+        self, pubsubs: List[FakePubSub], cancelled_sessions: Set[int]
+    ) -> None:
+        event = asyncio.Event()
+        CancellationSubscriber.register(1, event)
+        await wait_until(CancellationSubscriber.is_listening)
+
+        # the connection drops, and the session is cancelled before the subscriber is back
+        cancelled_sessions.add(1)
+        pubsubs[0].messages.put_nowait(ConnectionError("connection lost"))
+        await asyncio.wait_for(event.wait(), timeout=1)
+        await CancellationSubscriber.stop()
+
+        assert len(pubsubs) == 2
+        assert pubsubs[0].closed
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_listener(self, pubsubs: List[FakePubSub]) -> None:
+        CancellationSubscriber.register(1, asyncio.Event())
+        await wait_until(CancellationSubscriber.is_listening)
+        listener_task = CancellationSubscriber._listener_task
+
+        await CancellationSubscriber.stop()
+
+        assert listener_task.cancelled()
+        assert CancellationSubscriber._listener_task is None
+        assert not CancellationSubscriber.is_listening()
+        assert pubsubs[0].closed
+
+    @pytest.mark.asyncio
+    async def test_listener_is_stopped_before_server_stop(self, pubsubs: List[FakePubSub]) -> None:
+        CancellationSubscriber.register(1, asyncio.Event())
+        await wait_until(CancellationSubscriber.is_listening)
+
+        await stop_cancellation_subscriber(MagicMock(), None)
+
+        assert (stop_cancellation_subscriber, ListenerEventTypes.BEFORE_SERVER_STOP.value) in listeners
+        assert CancellationSubscriber._listener_task is None
+        assert pubsubs[0].closed
+
+
+class TestCancellationChecker:
+    """Test class for CancellationChecker."""
+
+    @pytest.mark.asyncio
+    async def test_cancellation_is_pushed_without_polling(
+        self, pubsubs: List[FakePubSub], cancelled_sessions: Set[int]
+    ) -> None:
+        with patch(f"{CHECKER_CACHE_PATH}.is_session_cancelled", new_callable=AsyncMock) as is_session_cancelled:
+            is_session_cancelled.return_value = False
+            async with CancellationChecker(session_id=1, check_interval=0.01) as checker:
+                await wait_until(CancellationSubscriber.is_listening)
+                await asyncio.sleep(0.05)
+                pubsubs[0].publish(1)
+                await wait_until(checker.is_cancelled)
+
+        await CancellationSubscriber.stop()
+        # Redis is only read once when monitoring starts, the cancellation itself is pushed
+        is_session_cancelled.assert_awaited_once_with(1)
+        assert CancellationSubscriber._session_events == {}
+
+    @pytest.mark.asyncio
+    async def test_polls_redis_while_subscriber_is_down(
+        self, pubsubs: List[FakePubSub], cancelled_sessions: Set[int]
+    ) -> None:
+        with patch.object(CancellationSubscriber, "_ensure_listener"):
+            async with CancellationChecker(session_id=1, check_interval=0.01) as checker:
+                await asyncio.sleep(0.03)
+                assert not checker.is_cancelled()
+
+                cancelled_sessions.add(1)
+                await wait_until(checker.is_cancelled)
+
+        assert pubsubs == []
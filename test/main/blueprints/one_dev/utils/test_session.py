@@ -0,0 +1,104 @@
+"""
+Unit tests for the memoized session validation of ensure_session_id.
+
+MessageSessionsRepository is patched, so the tests count the database reads a session validation
+costs while its entry in SessionValidationCache is fresh, expired or invalidated.
+"""
+
+import inspect
+from datetime import datetime
+from typing import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from deputydev_core.utils.constants.enums import Clients
+
+from app.backend_common.caches.local_lru_cache import LocalLRUCache
+from app.backend_common.models.dto.message_sessions_dto import MessageSessionDTO
+from app.main.blueprints.one_dev.routes.end_user.v1.history.history_blueprint import delete_session
+from app.main.blueprints.one_dev.utils.session import get_stored_session
+from app.main.blueprints.one_dev.utils.session_validation_cache import SessionValidationCache
+
+SESSION_PATH = "app.main.blueprints.one_dev.utils.session"
+HISTORY_PATH = "app.main.blueprints.one_dev.routes.end_user.v1.history.history_blueprint"
+MONOTONIC_PATH = "app.backend_common.caches.local_lru_cache.time.monotonic"
+
+
+def make_session(session_id: int) -> MessageSessionDTO:
+    return MessageSessionDTO(
+        id=session_id,
+        user_team_id=1,
+        client=Clients.BACKEND,
+        session_type="CODE_GENERATION_V2",
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1),
+    )
+
+
+@pytest.fixture
+def get_by_id() -> Iterator[AsyncMock]:
+    with (
+        patch.object(
+            SessionValidationCache,
+            "_sessions",
+            LocalLRUCache(max_size=SessionValidationCache.MAX_SESSIONS, ttl=SessionValidationCache.TTL),
+        ),
+        patch(f"{SESSION_PATH}.MessageSessionsRepository.get_by_id", new_callable=AsyncMock) as mock_get_by_id,
+    ):
+        mock_get_by_id.side_effect = lambda session_id: make_session(int(session_id))
+        yield mock_get_by_id
+
+
+class TestStoredSessionValidation:
+    """Test class for the SessionValidationCache backed get_stored_session."""
+
+    @pytest.mark.asyncio
+    async def test_validated_session_is_served_from_cache(self, get_by_id: AsyncMock) -> None:
+        first = await get_stored_session("7")
+        second = await get_stored_session(7)
+
+        assert first.id == second.id == 7
+        get_by_id.assert_awaited_once_with(session_id="7")
+
+    @pytest.mark.asyncio
+    async def test_unknown_session_is_not_cached(self, get_by_id: AsyncMock) -> None:
+        get_by_id.side_effect = None
+        get_by_id.return_value = None
+
+        assert await get_stored_session(7) is None
+        assert await get_stored_session(7) is None
+        assert get_by_id.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_session_is_read_again_after_ttl(self, get_by_id: AsyncMock) -> None:
+        with patch(MONOTONIC_PATH, return_value=100.0):
+            await get_stored_session(7)
+        with patch(MONOTONIC_PATH, return_value=100.0 + SessionValidationCache.TTL - 1):
+            await get_stored_session(7)
+        assert get_by_id.await_count == 1
+
+        with patch(MONOTONIC_PATH, return_value=100.0 + SessionValidationCache.TTL):
+            await get_stored_session(7)
+        assert get_by_id.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deleted_session_is_no_longer_valid(self, get_by_id: AsyncMock) -> None:
+        assert await get_stored_session(7) is not None
+
+        with (
+            patch(
+                f"{HISTORY_PATH}.MessageSessionsRepository.soft_delete_message_session_by_id", new_callable=AsyncMock
+            ),
+            patch(
+                f"{HISTORY_PATH}.ExtensionSessionsRepository.soft_delete_extension_session_by_id",
+                new_callable=AsyncMock,
+            ),
+            patch(f"{HISTORY_PATH}.send_response"),
+        ):
+            await inspect.unwrap(delete_session)(MagicMock(), MagicMock(), MagicMock(user_team_id=1), session_id=7)
+        # the repository no longer returns soft deleted sessions
+        get_by_id.side_effect = None
+        get_by_id.return_value = None
+
+        assert await get_stored_session(7) is None
+        assert get_by_id.await_count == 2